@@ -0,0 +1,66 @@
+"""Run the whole benchmark suite and write one JSON report.
+
+Exits non-zero when any suite's self-check failed; the report is written
+either way.
+
+    python -m benchmarks -o results.json
+    python -m benchmarks --quick              # small sizes, for a smoke run
+    python benchmarks/compare.py old.json new.json
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import (common, bench_columns, bench_data_layer, bench_form_input, bench_memory,
+                        bench_scheduler, bench_screens, bench_serialization, bench_sync, bench_time_grid)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="run with small datasets only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", "-o", help="write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    data_sizes = [100, 1000] if args.quick else list(common.DATA_SIZES)
+    screen_sizes = [100] if args.quick else list(common.SCREEN_SIZES)
+    column_sizes = [1000] if args.quick else list(bench_columns.COLUMN_SIZES)
+    sync_sizes = [1000] if args.quick else list(bench_sync.SYNC_SIZES)
+    grid_sizes = [100] if args.quick else list(bench_time_grid.GRID_SIZES)
+    scheduler_sizes = [100] if args.quick else list(bench_scheduler.SCHEDULER_SIZES)
+    serialization_sizes = [1000] if args.quick else list(bench_serialization.SERIALIZATION_SIZES)
+    memory_sizes = list(bench_memory.QUICK_SIZES if args.quick else bench_memory.MEMORY_SIZES)
+    memory_cycles = 6 if args.quick else bench_memory.CYCLES
+    suites = [
+        bench_data_layer.run(argparse.Namespace(sizes=data_sizes, repeat=args.repeat)),
+        bench_screens.run(argparse.Namespace(sizes=screen_sizes, repeat=args.repeat)),
+        bench_columns.run(argparse.Namespace(sizes=column_sizes, repeat=args.repeat)),
+        bench_sync.run(argparse.Namespace(sizes=sync_sizes, repeat=args.repeat, changes=100)),
+        bench_time_grid.run(argparse.Namespace(sizes=grid_sizes, repeat=args.repeat)),
+        bench_scheduler.run(argparse.Namespace(sizes=scheduler_sizes, repeat=args.repeat)),
+        bench_serialization.run(argparse.Namespace(sizes=serialization_sizes, repeat=args.repeat)),
+        bench_form_input.run(argparse.Namespace(sizes=list(bench_form_input.INPUT_SIZES), repeat=args.repeat)),
+        bench_memory.run_isolated(argparse.Namespace(sizes=memory_sizes, cycles=memory_cycles)),
+    ]
+
+    report = {
+        "meta": common.metadata(),
+        "results": [dict(row, suite=suite.suite) for suite in suites for row in suite.rows],
+    }
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(data)
+    else:
+        print(data)
+    failures = [failure for suite in suites for failure in getattr(suite, "failures", [])]
+    if failures:
+        print(f"{len(failures)} self-check failures", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
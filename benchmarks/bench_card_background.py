@@ -0,0 +1,110 @@
+"""Check proando's card backgrounds and count their canvas cost.
+
+Lays out a list of HomeActivityCard widgets headless, moves and resizes it,
+and checks after every layout pass that each card's rounded background
+matches the card. Alongside, it prints per card the canvas instructions the
+card created (the shared Color counts once for all cards) and the pos/size
+callbacks it added, compared with the two
+older ways of drawing the same background: instructions built once from
+the card's initial pos/size (never updated) and a kv-style background bound
+to pos and size. Exits non-zero if any background is out of place.
+
+    python benchmarks/bench_card_background.py --cards 200
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+
+def observers(widget):
+    return len(widget.get_property_observers("pos")) + len(widget.get_property_observers("size"))
+
+
+def legacy_card(proando):
+    # Color + Rectangle captured from the initial geometry
+    from kivy.graphics import Color, Rectangle
+    card = proando.BoxLayout(size_hint_y=None, height=proando.dp(100))
+    card.canvas.before.add(Color(*proando.SECONDARY_COLOR))
+    card.background = Rectangle(pos=card.pos, size=card.size)
+    card.canvas.before.add(card.background)
+    return card
+
+
+def bound_card(proando):
+    # What a kv canvas rule compiles to: one callback per bound property
+    from kivy.graphics import Color, RoundedRectangle
+    card = proando.BoxLayout(size_hint_y=None, height=proando.dp(100))
+    card.canvas.before.add(Color(*proando.SECONDARY_COLOR))
+    card.background = RoundedRectangle(pos=card.pos, size=card.size, radius=[proando.dp(10)])
+    card.canvas.before.add(card.background)
+    card.bind(pos=lambda w, pos: setattr(w.background, "pos", pos),
+              size=lambda w, size: setattr(w.background, "size", size))
+    return card
+
+
+def layout(cards, container, window_width, pump):
+    container.clear_widgets()
+    for card in cards:
+        container.add_widget(card)
+    container.width = window_width
+    pump()
+    return sum(
+        1 for card in cards
+        if tuple(card.background.pos) != tuple(card.pos) or tuple(card.background.size) != tuple(card.size)
+    )
+
+
+def measure(name, make_card, count, proando, pump):
+    from kivy.uix.gridlayout import GridLayout
+    baseline = observers(proando.BoxLayout())
+    container = GridLayout(cols=1, spacing=proando.dp(10), size_hint=(None, None))
+    container.bind(minimum_height=container.setter("height"))
+    cards = [make_card() for _ in range(count)]
+    # Before layout: the container adds its own callbacks to its children
+    callbacks = observers(cards[0]) - baseline
+    created = set()
+    for card in cards:
+        created.update(id(instruction) for instruction in card.canvas.before.children)
+    stale = [layout(cards, container, width, pump) for width in (400, 320, 480)]
+    container.pos = (0, 50)
+    pump()
+    stale.append(sum(1 for c in cards if tuple(c.background.pos) != tuple(c.pos)))
+    return {
+        "mode": name,
+        "canvas_entries_per_card": len(cards[0].canvas.before.children),
+        "instructions_created_per_card": len(created) / count,
+        "callbacks_per_card": callbacks,
+        "stale_backgrounds_per_pass": stale,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = common.make_workdir()
+    proando = common.load_proando(os.path.join(workdir, "activities.json"))
+    from kivy.clock import Clock
+
+    def pump():
+        for _ in range(3):
+            Clock.tick()
+
+    results = [
+        measure("legacy", lambda: legacy_card(proando), args.cards, proando, pump),
+        measure("kv-bound", lambda: bound_card(proando), args.cards, proando, pump),
+        measure("CardLayout", proando.HomeActivityCard, args.cards, proando, pump),
+    ]
+    print(json.dumps({"cards": args.cards, "results": results}, indent=2))
+    if any(results[-1]["stale_backgrounds_per_pass"]):
+        sys.exit("CardLayout backgrounds out of place after layout")
+
+
+if __name__ == "__main__":
+    main()
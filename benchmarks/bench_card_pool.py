@@ -0,0 +1,85 @@
+"""Compare list refreshes with and without the card WidgetPool.
+
+Runs headless (SDL offscreen window) against a throwaway database and prints
+one JSON object with, per mode, the mean refresh time, the number of
+generation-0 collections (a proxy for allocation churn), the time spent in
+the garbage collector and the transient memory allocated per refresh.
+
+    python benchmarks/bench_card_pool.py --activities 200 --refreshes 20
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+
+class GCTimer:
+    def __init__(self):
+        self.pause = 0.0
+        self.collections = 0
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pause += time.perf_counter() - self._start
+            self.collections += info["generation"] == 0
+            self._start = None
+
+
+def measure(zenith, screen, refreshes):
+    def refresh():
+        screen.load_activities()
+        zenith.load_scheduler.flush()
+
+    refresh()  # warm up: first pass fills the pool
+
+    timer = GCTimer()
+    gc.callbacks.append(timer)
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        refresh()
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(timer)
+
+    tracemalloc.start()
+    refresh()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "refresh_ms": elapsed / refreshes * 1000,
+        "gen0_collections_per_refresh": timer.collections / refreshes,
+        "gc_pause_ms_per_refresh": timer.pause / refreshes * 1000,
+        "peak_alloc_kb_per_refresh": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--activities", type=int, default=200)
+    parser.add_argument("--refreshes", type=int, default=20)
+    args = parser.parse_args()
+
+    common.make_workdir()
+    zenith = common.load_zenith()
+    screen = zenith.ActivitiesScreen()
+    common.seed_database(screen.db.db_path, common.generate_activities(args.activities))
+
+    results = {"activities": args.activities, "refreshes": args.refreshes}
+    results["pooled"] = measure(zenith, screen, args.refreshes)
+    screen.card_pool = zenith.WidgetPool(max_free=0)  # every refresh builds new cards
+    results["unpooled"] = measure(zenith, screen, args.refreshes)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Compare the columnar activity snapshot with the tuple and dict paths.
+
+Runs the same filter ("today's incomplete Alta activities" plus a start-time
+range) four ways: SELECT * tuples from DatabaseManager, an in-memory list of
+those tuples, a list of dicts shaped like proando's records, and
+ActivityColumns with and without NumPy.
+
+Before timing, check() drives a small database through delete, restore,
+un-archive, reschedule and add, and compares the event-patched snapshot with
+a fresh load after each step; the script exits non-zero if they differ.
+
+    python benchmarks/bench_columns.py --sizes 100000 1000000 -o columns.json
+"""
+import os
+import sqlite3
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+COLUMN_SIZES = (100000, 1000000)
+
+
+def snapshot(columns):
+    return {columns.columns["ids"][i]: tuple(column[i] for column in columns.columns.values())
+            for i in range(len(columns))}
+
+
+def add_with_high_priority(db, day):
+    # Priorities interned by hand or by sync get ids after every existing one
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("INSERT INTO priorities (id, name) VALUES (300, 'Reservada')")
+    conn.commit()
+    conn.close()
+    db.add_activity("Otra", "", "Trabajo", "Urgentísima", "12:00", "13:00", day)
+
+
+def check(zenith):
+    # Rows archived before the snapshot was loaded are missing from it and
+    # come back when they are changed; deleted rows come back when restored
+    common.make_workdir()
+    db = zenith.DatabaseManager()
+    common.seed_database(db.db_path, common.generate_activities(300, days=365))
+    db.archive_activities(batch_size=1000)
+    columns = zenith.ActivityColumns(use_numpy=False)
+    columns.load(db)
+    conn = db.connect()
+    archived = [row[0] for row in conn.execute("SELECT id FROM activities_archive LIMIT 2")]
+    conn.close()
+    live = db.get_activities()[0][0]
+    today = date.today().isoformat()
+    steps = (
+        ("delete", lambda: db.delete_activity(live)),
+        ("restore", lambda: db.restore_activity(live)),
+        ("un-archive by status", lambda: db.update_activity_status(archived[0], False)),
+        ("un-archive by reschedule", lambda: db.reschedule_activities([(archived[1], today, "08:00", "09:00")])),
+        ("add", lambda: db.add_activity("Nueva", "", "Trabajo", "Alta", "10:00", "11:00", today)),
+        ("add with a priority id past 127", lambda: add_with_high_priority(db, today)),
+    )
+    failures = []
+    for name, step in steps:
+        step()
+        fresh = zenith.ActivityColumns(use_numpy=False)
+        fresh.load(db)
+        if snapshot(columns) != snapshot(fresh):
+            failures.append(f"ActivityColumns out of date after {name}")
+    return failures
+
+
+def bench_columns(results, size, repeat):
+    common.make_workdir()
+    zenith = common.load_zenith()
+    db = zenith.DatabaseManager()
+    activities = list(common.generate_activities(size, days=90))
+    common.seed_database(db.db_path, activities)
+    today = date.today().isoformat()
+    alta = zenith.priorities.id_of("Alta")
+
+    def from_tuples(rows):
+        return [row[0] for row in rows if row[7] == today and not row[8] and row[4] == alta]
+
+    def morning_tuples(rows):
+        return [row[0] for row in rows if row[5] and "09:00" <= row[5] < "12:00"]
+
+    rows = db.get_activities()
+    results.add("filter today/incomplete/Alta: SELECT * tuples", size,
+                common.timeit(lambda: from_tuples(db.get_activities()), repeat,
+                              setup=zenith.query_cache.clear))
+    results.add("filter today/incomplete/Alta: cached tuples", size,
+                common.timeit(lambda: from_tuples(rows), repeat))
+    results.add("filter start 09-12: cached tuples", size,
+                common.timeit(lambda: morning_tuples(rows), repeat))
+    del rows
+
+    records = activities
+    results.add("filter today/incomplete/Alta: dicts", size,
+                common.timeit(lambda: [a["id"] for a in records
+                                       if a["date"] == today and not a["completed"] and a["priority"] == "Alta"],
+                              repeat))
+    del records, activities
+
+    for use_numpy in (True, False):
+        label = "numpy" if use_numpy else "array"
+        columns = zenith.ActivityColumns(use_numpy=use_numpy)
+        results.add(f"ActivityColumns.load ({label})", size,
+                    common.timeit(lambda: columns.load(db), repeat))
+        if use_numpy and columns.numpy is None:
+            continue
+        results.add(f"filter today/incomplete/Alta: columns ({label})", size,
+                    common.timeit(lambda: columns.select(day=date.today(), completed=False, priority=alta),
+                                  repeat))
+        results.add(f"filter start 09-12: columns ({label})", size,
+                    common.timeit(lambda: columns.select(start=(9 * 60, 12 * 60)), repeat))
+
+
+def run(args):
+    results = common.Results("columns")
+    results.failures = check(common.load_zenith())
+    for failure in results.failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    for size in args.sizes:
+        bench_columns(results, size, args.repeat)
+    return results
+
+
+def main(argv=None):
+    args = common.parse_args(__doc__.splitlines()[0], COLUMN_SIZES, argv)
+    results = run(args)
+    results.write(args.output)
+    if results.failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Time the data layer of both apps against synthetic datasets.
+
+Covers DatabaseManager CRUD, archiving, the query cache and ActivityAnalytics in
+the KivyMD app and ActivityManager migration/load_day/CRUD/get_recommendations in
+proando.
+Read timings clear the query cache first unless the name says "cached".
+
+    python benchmarks/bench_data_layer.py --sizes 100 1000 10000 100000 -o data.json
+"""
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+
+def bench_database_manager(results, size, repeat):
+    common.make_workdir()
+    zenith = common.load_zenith()
+    db = zenith.DatabaseManager()
+    common.seed_database(db.db_path, common.generate_activities(size))
+    today = date.today().isoformat()
+    new_ids = []
+
+    def add():
+        new_ids.append(db.add_activity("Nueva", "", "Trabajo", "Media", "09:00", "10:00", today)[0])
+
+    cache = zenith.query_cache
+    results.add("DatabaseManager.add_activity", size, common.timeit(add, repeat))
+    results.add("DatabaseManager.get_activities(today)", size,
+                common.timeit(lambda: db.get_activities(today), repeat, setup=cache.clear))
+    results.add("DatabaseManager.get_activities(today) cached", size,
+                common.timeit(lambda: db.get_activities(today), repeat))
+    results.add("DatabaseManager.get_activities()", size,
+                common.timeit(db.get_activities, repeat, setup=cache.clear))
+    results.add("DatabaseManager.get_activity_counts", size,
+                common.timeit(lambda: db.get_activity_counts(today), repeat, setup=cache.clear))
+    bench_week_navigation(results, zenith, db, size, repeat)
+    results.add("DatabaseManager.update_activity_status", size,
+                common.timeit(lambda: db.update_activity_status(size // 2, 1), repeat))
+    results.add("DatabaseManager.delete_activity", size,
+                common.timeit(lambda: db.delete_activity(new_ids.pop()), repeat,
+                              setup=lambda: new_ids or add()))
+    analytics = zenith.ActivityAnalytics()
+    results.add("ActivityAnalytics.load", size,
+                common.timeit(lambda: analytics.load(db), repeat))
+    results.add("ActivityAnalytics.summary", size,
+                common.timeit(lambda: (analytics.streaks(), analytics.trend("week"),
+                                       analytics.breakdown("category")), repeat,
+                              setup=lambda: setattr(analytics, "_streaks", None)))
+    while db.archive_activities(10000):
+        pass
+    results.add("DatabaseManager.get_activities() archived", size,
+                common.timeit(db.get_activities, repeat, setup=zenith.query_cache.clear))
+    results.add("DatabaseManager.search_activities", size,
+                common.timeit(lambda: db.search_activities("Gimnasio"), repeat))
+
+
+def bench_week_navigation(results, zenith, db, size, repeat):
+    # prev/next back and forth over four weeks with a status toggle on
+    # today every few steps, as the screens query it; reports the cache's
+    # hit rate alongside the time
+    cache = zenith.query_cache
+    today = date.today()
+    week = today - timedelta(days=today.weekday())
+    steps = [week - timedelta(days=7 * offset) for offset in (0, 1, 2, 3, 2, 1, 0, 1, 2, 1, 0)]
+    toggled = db.add_activity("Nueva", "", "Trabajo", "Media", "09:00", "10:00", today.isoformat())[0]
+
+    def navigate():
+        for i, start in enumerate(steps):
+            db.get_activities_between(start.isoformat(), (start + timedelta(days=6)).isoformat())
+            db.get_activities(today.isoformat())
+            if i % 4 == 3:
+                db.update_activity_status(toggled, i % 8 == 3)
+
+    def reset():
+        cache.clear()
+        cache.hits = cache.misses = 0
+
+    stats = common.timeit(navigate, repeat, setup=reset)
+    results.add("DatabaseManager week navigation cached", size, stats, **cache.stats())
+    cache.max_entries, saved = 0, cache.max_entries
+    results.add("DatabaseManager week navigation uncached", size, common.timeit(navigate, repeat, setup=reset))
+    cache.max_entries = saved
+    cache.clear()
+
+
+def bench_activity_manager(results, size, repeat):
+    workdir = common.make_workdir()
+    proando = common.load_proando(os.path.join(workdir, "activities.json"))
+    manager = proando.ActivityManager
+    common.seed_json(proando.ACTIVITIES_FILE, common.generate_activities(size))
+    results.add("ActivityManager.migrate", size, common.timeit(manager.migrate, 1))
+
+    # Screens read one day's partition; this should not grow with size
+    results.add("ActivityManager.load_day(today)", size, common.timeit(manager.load_day, repeat))
+    results.add("ActivityManager.load_activities (all days)", size, common.timeit(manager.load_activities, repeat))
+    results.add("ActivityManager.get_recommendations", size,
+                common.timeit(manager.get_recommendations, repeat))
+    results.add("ActivityManager.add_activity", size,
+                common.timeit(lambda: manager.add_activity("Nueva", "", "09:00", "10:00", "Media"), repeat))
+    results.add("ActivityManager.update_activity", size,
+                common.timeit(lambda: manager.update_activity(size // 2, completed=True), repeat))
+    results.add("ActivityManager.delete_activity", size,
+                common.timeit(lambda: manager.delete_activity(size // 2), repeat))
+
+
+def run(args):
+    results = common.Results("data_layer")
+    for size in args.sizes:
+        bench_database_manager(results, size, args.repeat)
+        bench_activity_manager(results, size, args.repeat)
+    return results
+
+
+def main(argv=None):
+    args = common.parse_args(__doc__.splitlines()[0], common.DATA_SIZES, argv)
+    run(args).write(args.output)
+
+
+if __name__ == "__main__":
+    main()
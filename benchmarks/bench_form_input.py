@@ -0,0 +1,116 @@
+"""Check the activity form's input parsing in both apps and time a keystroke.
+
+Every case in CASES goes through parse_time (or parse_date) as main.py and
+proando import them from zenith_core and must give the expected canonical
+value (None for input that must be rejected), so this doubles as the
+parsers' self-check; main.py's
+form also checks the priority against the priorities table. Timings cover
+one validation pass as typing triggers it: the cached pass that follows a
+single changed keystroke, and a cold pass with the parse caches cleared.
+
+    python benchmarks/bench_form_input.py --sizes 1000 -o form_input.json
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+INPUT_SIZES = (1000,)
+
+TIME_CASES = {
+    "9": "09:00", "9h": "09:00", "9:5": "09:05", "09:30": "09:30", "0930": "09:30", "930": "09:30",
+    "9.30": "09:30", "9am": "09:00", "9 AM": "09:00", "9:30pm": "21:30", "9:30 p.m.": "21:30",
+    "12am": "00:00", "12pm": "12:00", " 7 ": "07:00", "23:59": "23:59",
+    "24:00": None, "13pm": None, "0am": None, "9:60": None, "99": None, "abc": None, "": None,
+}
+DATE_CASES = {
+    "2024-01-05": "2024-01-05", "2024-1-5": "2024-01-05", "5/1/2024": "2024-01-05",
+    "2024-02-29": "2024-02-29", "2023-02-29": None, "2024-13-01": None, "mañana": None, "": None,
+}
+RANGE_CASES = (
+    ("09:00", "10:00", True),
+    ("9", "9:5", True),
+    ("10", "9", False),
+    ("9pm", "21:00", False),
+)
+# main.py only: proando picks the priority from a spinner
+PRIORITY_CASES = {
+    "Alta": "Alta", " media ": "Media", "BAJA": "Baja", "": "Media", "Alto": None, "Urgente": None,
+}
+
+
+def check(module, name):
+    failures = []
+    core = module.zenith_core
+    for text, expected in TIME_CASES.items():
+        if core.parse_time(text) != expected:
+            failures.append(f"{name}.parse_time({text!r}) = {core.parse_time(text)!r}, expected {expected!r}")
+    for text, expected in DATE_CASES.items():
+        if core.parse_date(text) != expected:
+            failures.append(f"{name}.parse_date({text!r}) = {core.parse_date(text)!r}, expected {expected!r}")
+    for start, end, valid in RANGE_CASES:
+        _, errors = module.validate_activity_input("Título", "2024-01-05", start, end)
+        if (not errors) != valid:
+            failures.append(f"{name}: {start!r}-{end!r} should be {'accepted' if valid else 'rejected'}")
+    return failures
+
+
+def check_priorities(module, name):
+    failures = []
+    for text, expected in PRIORITY_CASES.items():
+        values, errors = module.validate_activity_input("Título", "2024-01-05", "09:00", "10:00", text)
+        if values["priority"] != expected or ("priority" in errors) != (expected is None):
+            failures.append(f"{name}: priority {text!r} gave {values['priority']!r}, expected {expected!r}")
+    return failures
+
+
+def keystrokes(size):
+    # What a user typing times produces: every prefix of a few entries
+    entries = ("9", "9:30", "10am", "21:45", "7.15pm")
+    texts = [entry[:i] for entry in entries for i in range(1, len(entry) + 1)]
+    return [texts[i % len(texts)] for i in range(size)]
+
+
+def bench_module(results, module, name, size, repeat):
+    texts = keystrokes(size)
+
+    def typing():
+        for text in texts:
+            module.validate_activity_input("Título", "2024-01-05", "09:00", text)
+
+    def clear():
+        module.zenith_core.parse_time.cache_clear()
+        module.zenith_core.parse_date.cache_clear()
+
+    results.add(f"{name} validate per keystroke x{size} (cached)", size, common.timeit(typing, repeat))
+    results.add(f"{name} validate per keystroke x{size} (cold)", size,
+                common.timeit(lambda: [clear() or module.validate_activity_input("Título", "2024-01-05", "09:00", text)
+                                       for text in texts], repeat))
+
+
+def run(args):
+    results = common.Results("form_input")
+    workdir = common.make_workdir()
+    zenith = common.load_zenith()
+    proando = common.load_proando(os.path.join(workdir, "activities.json"))
+    results.failures = check(zenith, "main") + check_priorities(zenith, "main") + check(proando, "proando")
+    for size in args.sizes:
+        bench_module(results, zenith, "main", size, args.repeat)
+        bench_module(results, proando, "proando", size, args.repeat)
+    for failure in results.failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    args = common.parse_args(__doc__.splitlines()[0], INPUT_SIZES, argv)
+    results = run(args)
+    results.write(args.output)
+    if results.failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
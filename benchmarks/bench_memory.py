@@ -0,0 +1,188 @@
+"""Check that refreshing the screens over and over does not grow memory.
+
+Each cycle refreshes every screen list of both apps, walks the schedule
+through its view modes and deletes and restores an activity (which shows
+the undo bar). After a warm-up, MemoryDiagnostics.measure reports:
+
+- traced bytes per cycle over the second half of the run;
+- growth in widgets in the screen trees;
+- growth in live Widget objects, which also catches widgets that left the
+  tree but are still referenced.
+
+The script exits non-zero if any widget count grows or a cycle keeps more
+than MAX_BYTES_PER_CYCLE.
+
+    python benchmarks/bench_memory.py --sizes 100 --cycles 20 -o memory.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+MEMORY_SIZES = (100,)
+QUICK_SIZES = (20,)
+CYCLES = 10
+MAX_BYTES_PER_CYCLE = 4096
+
+
+def zenith_cycle(zenith, size):
+    common.make_workdir()
+    db = zenith.DatabaseManager()
+    common.seed_database(db.db_path, common.generate_activities(size, days=7))
+    zenith.activity_stats.loaded = False
+    flush = zenith.load_scheduler.flush
+    dashboard = zenith.DashboardScreen()
+    activities = zenith.ActivitiesScreen()
+    schedule = zenith.ScheduleScreen()
+    profile = zenith.ProfileScreen()
+    flush()
+    day = db.get_activities_between("0000-01-01", "9999-12-31")[0][7]
+
+    def cycle():
+        dashboard.load_data()
+        activities.load_activities()
+        schedule.reload_schedule()
+        for mode in ("week", "month", "agenda", "day", "grid", "week"):
+            schedule.set_view_mode(mode)
+            flush()
+        activity_id = db.get_activities(day)[0][0]
+        dashboard.delete_activity(activity_id)
+        dashboard.undo_delete()
+        flush()
+
+    return cycle, [dashboard, activities, schedule, profile]
+
+
+def proando_cycle(proando, size):
+    common.seed_json(proando.ACTIVITIES_FILE, common.generate_activities(size, days=1))
+    home = proando.HomeScreen(name="home")
+    schedule = proando.ScheduleScreen(name="schedule")
+    add = proando.AddActivityScreen(name="add_activity")
+    profile = proando.ProfileScreen(name="profile")
+    day = proando.ActivityManager.load_activities()[0]["date"]
+
+    def cycle():
+        home.update_activities()
+        home.renderer.flush()
+        schedule.current_day = day
+        schedule.update_schedule()
+        schedule.toggle_view()
+        schedule.toggle_view()
+        home.delete_activity(proando.ActivityManager.load_day(day)[0]["id"])
+        home.undo_delete()
+        home.renderer.flush()
+
+    return cycle, [home, schedule, add, profile]
+
+
+class Roots:
+    # walk() over several screens that share no parent
+    def __init__(self, screens):
+        self.screens = screens
+
+    def walk(self, restrict=True):
+        for screen in self.screens:
+            yield from screen.walk(restrict=restrict)
+
+
+def bench_memory(results, name, diagnostics, size, cycle, screens, cycles):
+    from kivy.clock import Clock
+    timings = []
+
+    def refresh():
+        # Removed canvas instructions are only released on the next frame
+        start = time.perf_counter()
+        cycle()
+        Clock.tick()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    report = diagnostics.measure(refresh, cycles, root=Roots(screens))
+    # Measured cycles only, without the sampling: the warm-up pays for
+    # building the cards and for KivyMD unbinding each one from the theme
+    # the first time it is removed
+    timings = timings[-cycles:]
+    stats = {"min_ms": min(timings), "mean_ms": statistics.fmean(timings),
+             "median_ms": statistics.median(timings), "max_ms": max(timings), "repeat": cycles}
+    results.add(f"{name} refresh cycle", size, stats,
+                cycles=cycles, bytes_per_cycle=report["bytes_per_cycle"],
+                live_widget_growth=report["live_widget_growth"],
+                tree_widget_growth=report["tree_widget_growth"],
+                live_widgets=report["samples"][-1]["live_widgets"])
+    failures = []
+    if report["live_widget_growth"] > 0 or report["tree_widget_growth"] > 0:
+        failures.append(f"{name} n={size}: widgets grew by {report['tree_widget_growth']} in the tree, "
+                        f"{report['live_widget_growth']} alive over {cycles} cycles")
+    if report["bytes_per_cycle"] > MAX_BYTES_PER_CYCLE:
+        failures.append(f"{name} n={size}: {report['bytes_per_cycle']:.0f} bytes kept per cycle")
+    return failures
+
+
+def run(args):
+    results = common.Results("memory")
+    results.failures = []
+    for size in args.sizes:
+        zenith = common.load_zenith()
+        cycle, screens = zenith_cycle(zenith, size)
+        results.failures += bench_memory(results, "zenith", zenith.memory_diagnostics, size,
+                                         cycle, screens, args.cycles)
+        proando = common.load_proando(os.path.join(common.make_workdir(), "activities.json"))
+        cycle, screens = proando_cycle(proando, size)
+        results.failures += bench_memory(results, "proando", proando.memory_diagnostics, size,
+                                         cycle, screens, args.cycles)
+    for failure in results.failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return results
+
+
+def run_isolated(args):
+    """run() in a fresh interpreter, for the combined suite.
+
+    Earlier suites leave thousands of objects behind, which every sample's
+    gc.collect() would walk, and may leave proando's App as the running one.
+    """
+    fd, output = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    failures = []
+    try:
+        process = subprocess.run([sys.executable, os.path.abspath(__file__), "--sizes", *map(str, args.sizes),
+                                  "--cycles", str(args.cycles), "-o", output], cwd=common.ROOT)
+        if process.returncode:
+            # The child printed its own FAIL lines
+            failures.append(f"memory suite exited with status {process.returncode}")
+        with open(output) as f:
+            rows = json.load(f)["results"]
+    except (OSError, ValueError) as error:
+        print(f"FAIL memory suite did not run: {error}", file=sys.stderr)
+        failures.append(f"memory suite did not run: {error}")
+        rows = []
+    finally:
+        os.remove(output)
+    results = common.Results("memory")
+    results.rows = rows
+    results.failures = failures
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(MEMORY_SIZES),
+                        help="dataset sizes (number of activities)")
+    parser.add_argument("--cycles", type=int, default=CYCLES, help="measured refresh cycles")
+    parser.add_argument("--output", "-o", help="write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+    results = run(args)
+    results.write(args.output)
+    if results.failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
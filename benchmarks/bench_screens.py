@@ -0,0 +1,160 @@
+"""Time screen construction and list refresh for every screen class.
+
+Screens of the KivyMD app load through the LoadScheduler and proando's home
+list through a ProgressiveRenderer; the benchmark flushes them so the
+refresh timings cover the whole population of the list. Separate rows time
+what the user waits for (the first screenful, added synchronously) and the
+longest frame slice while the rest is added.
+
+    python benchmarks/bench_screens.py --sizes 100 1000 -o screens.json
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+
+def bench_zenith_screens(results, size, repeat):
+    common.make_workdir()
+    zenith = common.load_zenith()
+    db = zenith.DatabaseManager()
+    common.seed_database(db.db_path, common.generate_activities(size, days=7))
+    zenith.activity_stats.loaded = False
+    flush = zenith.load_scheduler.flush
+
+    screens = {}
+    for screen_class in (zenith.DashboardScreen, zenith.ActivitiesScreen,
+                         zenith.ScheduleScreen, zenith.ProfileScreen):
+        def construct(screen_class=screen_class):
+            screens[screen_class] = screen_class()
+            flush()
+        results.add(f"{screen_class.__name__}.__init__", size, common.timeit(construct, repeat))
+
+    refreshes = (
+        (zenith.DashboardScreen, "load_data"),
+        (zenith.ActivitiesScreen, "load_activities"),
+        (zenith.ScheduleScreen, "load_week_data"),
+        (zenith.ScheduleScreen, "load_month_data"),
+        (zenith.ScheduleScreen, "load_agenda_data"),
+    )
+    for screen_class, method in refreshes:
+        refresh = getattr(screens[screen_class], method)
+
+        def run(refresh=refresh):
+            refresh()
+            flush()
+        results.add(f"{screen_class.__name__}.{method}", size, common.timeit(run, repeat))
+
+    screen = screens[zenith.ActivitiesScreen]
+    results.add("ActivitiesScreen.load_activities (first screenful)", size,
+                common.timeit(screen.load_activities, repeat, setup=flush))
+    results.add("ActivitiesScreen.load_activities (longest slice)", size,
+                longest_slice(screen.load_activities, lambda: zenith.load_scheduler._run(0),
+                              lambda: zenith.load_scheduler.tasks, repeat, flush))
+
+    bench_add_dialog(results, zenith, screens[zenith.ActivitiesScreen], size, repeat)
+
+
+def longest_slice(start, frame, busy, repeat, finish):
+    """Start a progressive render, then run frames until it is done; returns
+    timing stats for the longest single frame of each run."""
+    samples = []
+    for _ in range(repeat):
+        finish()
+        start()
+        longest = 0.0
+        while busy():
+            begin = time.perf_counter()
+            frame()
+            longest = max(longest, time.perf_counter() - begin)
+        samples.append(longest * 1000)
+    finish()
+    return {
+        "min_ms": min(samples),
+        "mean_ms": statistics.fmean(samples),
+        "median_ms": statistics.median(samples),
+        "max_ms": max(samples),
+        "repeat": repeat,
+    }
+
+
+def bench_add_dialog(results, zenith, screen, size, repeat):
+    """Open the Nueva Actividad dialog, built on demand (cold) or pre-warmed."""
+    def close():
+        if screen.form is not None:
+            screen.form.dialog.dismiss(force=True)
+
+    def cold_setup():
+        close()
+        screen.form_factory = zenith.FormFactory(zenith.ActivityFormDialog, screen.save_activity)
+
+    def warm_setup():
+        close()
+        screen.form_factory.get()
+
+    open_dialog = lambda: screen.show_add_dialog(None)
+    results.add("ActivitiesScreen.show_add_dialog (cold)", size,
+                common.timeit(open_dialog, repeat, setup=cold_setup))
+    results.add("ActivitiesScreen.show_add_dialog (warm)", size,
+                common.timeit(open_dialog, repeat, setup=warm_setup))
+    close()
+
+
+def bench_proando_screens(results, size, repeat):
+    workdir = common.make_workdir()
+    proando = common.load_proando(os.path.join(workdir, "activities.json"))
+    # All on one day: the home and schedule screens show a single day
+    common.seed_json(proando.ACTIVITIES_FILE, common.generate_activities(size, days=1))
+
+    screens = {}
+    for screen_class in (proando.HomeScreen, proando.AddActivityScreen,
+                         proando.ScheduleScreen, proando.ProfileScreen):
+        def construct(screen_class=screen_class):
+            screens[screen_class] = screen_class(name=screen_class.__name__)
+        results.add(f"proando.{screen_class.__name__}.__init__", size, common.timeit(construct, repeat))
+
+    def build_app():
+        # What App.run does before the first frame: kv rules, then build(),
+        # which also fills the home list
+        app = proando.ZenithApp()
+        app.load_kv()
+        app.build()
+    results.add("proando.ZenithApp.build", size, common.timeit(build_app, repeat))
+    for card_class in (proando.HomeActivityCard, proando.ScheduleSlot):
+        results.add(f"proando.{card_class.__name__}.__init__", size, common.timeit(card_class, repeat))
+
+    home = screens[proando.HomeScreen]
+    renderer = home.renderer
+
+    def refresh_home():
+        home.update_activities()
+        renderer.flush()
+    results.add("proando.HomeScreen.update_activities", size, common.timeit(refresh_home, repeat))
+    results.add("proando.HomeScreen.update_activities (first screenful)", size,
+                common.timeit(home.update_activities, repeat, setup=renderer.flush))
+    results.add("proando.HomeScreen.update_activities (longest slice)", size,
+                longest_slice(home.update_activities, lambda: renderer._step(0),
+                              lambda: renderer.items is not None, repeat, renderer.flush))
+    results.add("proando.ScheduleScreen.update_schedule", size,
+                common.timeit(screens[proando.ScheduleScreen].update_schedule, repeat))
+
+
+def run(args):
+    results = common.Results("screens")
+    for size in args.sizes:
+        bench_zenith_screens(results, size, args.repeat)
+        bench_proando_screens(results, size, args.repeat)
+    return results
+
+
+def main(argv=None):
+    args = common.parse_args(__doc__.splitlines()[0], common.SCREEN_SIZES, argv)
+    run(args).write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Time proando's activity serialization and compare file sizes.
+
+For each size, ``size`` synthetic records go through every codec proando
+knows (json, orjson, msgpack; optional ones are skipped when missing):
+encode is encode_records plus the codec's dumps, decode is loads plus the
+schema validation in decode_records. The legacy format (a list of dicts
+written by json.dumps with ASCII escapes, read without validation) is the
+baseline. Each row reports records per second and the encoded size.
+
+Every decode must give back exactly the records that went in; the script
+exits non-zero otherwise.
+
+    python benchmarks/bench_serialization.py --sizes 10000 100000 -o serialization.json
+"""
+import json
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+SERIALIZATION_SIZES = (10000, 100000)
+
+
+def make_records(proando, size):
+    records = []
+    for i, a in enumerate(common.generate_activities(size)):
+        record = {key: a[key] for key in ("id", "title", "description", "date", "start_time", "end_time",
+                                          "completed")}
+        record.update(uid=uuid.UUID(int=i).hex, priority=proando.priority_code(a["priority"]),
+                      updated_at=1700000000000 + i, change_seq=i + 1)
+        if i % 50 == 0:
+            record["deleted_at"] = record["updated_at"]
+        records.append(record)
+    return records
+
+
+def codecs(proando):
+    # get_codec falls back to json for missing packages; keep only real ones
+    for name in proando.CODECS:
+        codec = proando.get_codec(name)
+        if codec.name == name:
+            yield codec
+
+
+def add_row(results, name, size, stats, encoded_bytes):
+    results.add(name, size, stats, records_per_s=round(size / (stats["median_ms"] / 1000)), bytes=encoded_bytes)
+
+
+def bench_serialization(results, size, repeat):
+    workdir = common.make_workdir()
+    proando = common.load_proando(os.path.join(workdir, "activities.json"))
+    records = make_records(proando, size)
+    failures = []
+
+    legacy = json.dumps(records).encode("utf-8")
+    add_row(results, "legacy json.dumps encode", size,
+            common.timeit(lambda: json.dumps(records).encode("utf-8"), repeat), len(legacy))
+    add_row(results, "legacy json.loads decode", size, common.timeit(lambda: json.loads(legacy), repeat), len(legacy))
+
+    for codec in codecs(proando):
+        encoded = codec.dumps(proando.encode_records(records))
+        add_row(results, f"{codec.name} encode", size,
+                common.timeit(lambda: codec.dumps(proando.encode_records(records)), repeat), len(encoded))
+        add_row(results, f"{codec.name} decode + validate", size,
+                common.timeit(lambda: proando.decode_records(codec.loads(encoded)), repeat), len(encoded))
+        if proando.decode_records(codec.loads(encoded)) != records:
+            failures.append(f"{codec.name} n={size}: decoded records differ from the originals")
+    return failures
+
+
+def run(args):
+    results = common.Results("serialization")
+    results.failures = []
+    for size in args.sizes:
+        results.failures += bench_serialization(results, size, args.repeat)
+    for failure in results.failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    args = common.parse_args(__doc__.splitlines()[0], SERIALIZATION_SIZES, argv)
+    results = run(args)
+    results.write(args.output)
+    if results.failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Cold-start benchmark built on ``python -X importtime``.
+
+Each run starts a fresh interpreter, imports ``main`` and builds the app's
+root widget. Reports the median import and build time, the modules with the
+largest self import time, and fails (exit status 1) if any module that
+should load on demand was imported at startup.
+
+    python benchmarks/bench_startup.py --runs 5 -o startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+# Only needed once a dialog is opened. kivymd.uix.textfield is not listed:
+# MDBottomNavigation's own rules pull it in, and kivymd.uix.menu comes with
+# MDTopAppBar.
+LAZY_MODULES = (
+    "kivymd.uix.dialog",
+    "kivymd.uix.snackbar",
+)
+
+STARTUP_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.ZenithMobileApp()
+app.root = app.build()
+built = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "build_ms": (built - imported) * 1000,
+    "screens_built": sorted(app.screens),
+    "lazy_loaded": [name for name in {lazy!r} if name in sys.modules],
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Map module name to (self, cumulative) import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules[name] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_once():
+    script = STARTUP_SCRIPT.format(root=common.ROOT, lazy=LAZY_MODULES)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=common.make_workdir(), capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["modules"] = parse_importtime(proc.stderr)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", "-o")
+    args = parser.parse_args(argv)
+
+    runs = [run_once() for _ in range(args.runs)]
+    last = runs[-1]
+    top = sorted(last["modules"].items(), key=lambda item: -item[1][0])[:args.top]
+    report = {
+        "meta": common.metadata(),
+        "runs": args.runs,
+        "import_ms": statistics.median(run["import_ms"] for run in runs),
+        "build_ms": statistics.median(run["build_ms"] for run in runs),
+        "main_cumulative_import_ms": last["modules"].get("main", (0, 0))[1] / 1000,
+        "screens_built": last["screens_built"],
+        "lazy_loaded": last["lazy_loaded"],
+        "top_self_import_ms": {name: self_us / 1000 for name, (self_us, _) in top},
+    }
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(data)
+    else:
+        print(data)
+
+    if last["lazy_loaded"]:
+        print(f"Loaded at startup but should be lazy: {', '.join(last['lazy_loaded'])}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Time SyncEngine against the local stand-in server.
+
+For each dataset size one client pushes everything and a second client
+pulls it. Then the first client makes a fixed number of changes and both
+sync again. The initial sync grows with the dataset, the incremental one
+should stay flat and grow only with --changes.
+
+    python benchmarks/bench_sync.py --sizes 1000 10000 100000 --changes 100 -o sync.json
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+SYNC_SIZES = (1000, 10000, 100000)
+
+
+def bench_sync(results, size, repeat, changes):
+    import sync_server
+
+    workdir = common.make_workdir()
+    zenith = common.load_zenith()
+    server, url = sync_server.start_in_thread()
+    source = zenith.DatabaseManager(os.path.join(workdir, "source.db"))
+    target = zenith.DatabaseManager(os.path.join(workdir, "target.db"))
+    common.seed_database(source.db_path, common.generate_activities(size))
+    source_engine = zenith.SyncEngine(source, url, notify=False)
+    target_engine = zenith.SyncEngine(target, url, notify=False)
+
+    results.add("SyncEngine.push (initial)", size, common.timeit(source_engine.push, 1))
+    results.add("SyncEngine.pull (initial)", size, common.timeit(target_engine.pull, 1))
+
+    today = date.today().isoformat()
+    counter = iter(range(1, 10 ** 9))
+
+    def make_changes():
+        # Thirds: new activities, status toggles, deletes
+        for _ in range(changes // 3):
+            source.add_activity("Nueva", "", "Trabajo", "Media", "09:00", "10:00", today)
+        conn = source.connect()
+        for _ in range(changes // 3):
+            activity_id = next(counter)
+            completed, = conn.execute("SELECT completed FROM activities WHERE id = ?", (activity_id,)).fetchone()
+            source.update_activity_status(activity_id, 1 - completed)
+        conn.close()
+        for _ in range(changes - 2 * (changes // 3)):
+            source.delete_activity(size + 1 - next(counter))
+
+    results.add("SyncEngine.push (incremental)", size,
+                common.timeit(source_engine.push, repeat, setup=make_changes), changes=changes)
+    results.add("SyncEngine.pull (incremental)", size,
+                common.timeit(target_engine.pull, repeat, setup=lambda: source_engine.push()), changes=changes)
+    server.shutdown()
+    server.server_close()
+
+
+def run(args):
+    results = common.Results("sync")
+    for size in args.sizes:
+        bench_sync(results, size, args.repeat, args.changes)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SYNC_SIZES),
+                        help="dataset sizes (number of activities)")
+    parser.add_argument("--changes", type=int, default=100, help="changes per incremental sync")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", "-o", help="write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+    run(args).write(args.output)
+
+
+if __name__ == "__main__":
+    main()
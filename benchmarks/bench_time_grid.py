@@ -0,0 +1,132 @@
+"""Time the drag-to-reschedule TimeGrid with a busy week.
+
+Loads ``size`` activities spread over one week into the main app's weekly
+TimeGrid and reports: set_days (column packing plus canvas instructions),
+a full redraw, one drag step followed by a rendered frame, hit-testing
+through the (day, hour) buckets against a linear scan of every block, and
+the batched database write a drop makes.
+
+    python benchmarks/bench_time_grid.py --sizes 100 500 2000 -o time_grid.json
+"""
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common
+
+GRID_SIZES = (100, 500, 2000)
+HIT_TESTS = 1000
+
+
+class FakeTouch:
+    # The bits of a MotionEvent the grid's touch handlers use
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+        self.pos = (x, y)
+        self.ud = {}
+        self.grab_current = None
+
+    def grab(self, widget):
+        self.grab_current = widget
+
+    def ungrab(self, widget):
+        self.grab_current = None
+
+
+def linear_block_at(grid, x, y):
+    x, y = x - grid.x, y - grid.y
+    for block in reversed(grid.blocks):
+        bx, by, width, height = grid.block_rect(block)
+        if bx <= x <= bx + width and by <= y <= by + height:
+            return block
+    return None
+
+
+def bench_time_grid(results, size, repeat):
+    common.make_workdir()
+    zenith = common.load_zenith()
+    from kivy.core.window import Window
+    db = zenith.DatabaseManager()
+    common.seed_database(db.db_path, common.generate_activities(size, days=7))
+    week_start = date.today() - timedelta(days=6)
+    days = [week_start + timedelta(days=i) for i in range(7)]
+    rows = db.get_activities_between(days[0].isoformat(), days[-1].isoformat())
+    by_day = [[row for row in rows if row[7] == day.isoformat()] for day in days]
+
+    grid = zenith.TimeGrid(size_hint=(None, None))
+    grid.width = 1080
+    Window.add_widget(grid)
+    results.add("TimeGrid.set_days (week)", size, common.timeit(lambda: grid.set_days(days, by_day), repeat))
+    results.add("TimeGrid.redraw", size, common.timeit(grid.redraw, repeat))
+
+    def render():
+        Window.dispatch("on_draw")
+
+    results.add("Window frame with TimeGrid", size, common.timeit(render, repeat))
+
+    # Drag the first block down an hour, one step per frame
+    block = grid.blocks[0]
+    x, y, width, height = grid.block_rect(block)
+    touch = FakeTouch(grid.x + x + width / 2, grid.y + y + height / 2)
+    grid.on_touch_down(touch)
+    touch.grab_current = grid
+    step = grid.hour_height / 10
+
+    def drag_frame():
+        touch.y -= step
+        touch.pos = (touch.x, touch.y)
+        grid.on_touch_move(touch)
+        render()
+
+    results.add("TimeGrid drag step + frame", size, common.timeit(drag_frame, repeat * 4))
+    grid.on_touch_up(touch)
+    grid.pending = {}
+
+    rng = random.Random(size)
+    points = [(rng.uniform(grid.x + grid.gutter, grid.right), rng.uniform(grid.y, grid.top))
+              for _ in range(HIT_TESTS)]
+    mismatches = sum(grid.block_at(px, py) is not linear_block_at(grid, px, py) for px, py in points)
+    results.add(f"TimeGrid.block_at x{HIT_TESTS} (buckets)", size,
+                common.timeit(lambda: [grid.block_at(px, py) for px, py in points], repeat),
+                mismatches=mismatches)
+    results.add(f"TimeGrid.block_at x{HIT_TESTS} (linear scan)", size,
+                common.timeit(lambda: [linear_block_at(grid, px, py) for px, py in points], repeat))
+
+    moves = [row[0] for row in rows[:50]]
+    shift = iter(range(repeat * 1000))
+
+    def drop():
+        minute = 6 * 60 + next(shift) % 8 * 15
+        start, end = f"{minute // 60:02d}:{minute % 60:02d}", f"{minute // 60 + 1:02d}:{minute % 60:02d}"
+        db.reschedule_activities([(activity_id, days[0].isoformat(), start, end) for activity_id in moves])
+
+    results.add("DatabaseManager.reschedule_activities x50", size, common.timeit(drop, repeat))
+    Window.remove_widget(grid)
+    if mismatches:
+        return [f"n={size}: TimeGrid.block_at disagreed with the linear scan {mismatches} times"]
+    return []
+
+
+def run(args):
+    results = common.Results("time_grid")
+    results.failures = []
+    for size in args.sizes:
+        results.failures += bench_time_grid(results, size, args.repeat)
+    for failure in results.failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    args = common.parse_args(__doc__.splitlines()[0], GRID_SIZES, argv)
+    results = run(args)
+    results.write(args.output)
+    if results.failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Shared helpers for the headless benchmark suite.
+
+Importing this module configures Kivy for a headless run (SDL offscreen
+window, no command line parsing) so it must be imported before either app.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+os.environ.setdefault("KCFG_KIVY_LOG_LEVEL", "error")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DATA_SIZES = (100, 1000, 10000, 100000)
+SCREEN_SIZES = (100, 1000)
+
+TITLES = ("Matemáticas", "Reunión de equipo", "Gimnasio", "Lectura", "Correo", "Proyecto")
+CATEGORIES = ("Trabajo", "Estudio", "Personal", "Salud", "General")
+PRIORITIES = ("Alta", "Media", "Baja")
+
+
+def make_workdir(prefix="zenith-bench-"):
+    """Create a fresh temporary directory and make it the working directory.
+
+    The main app opens ``zenith_mobile.db`` relative to the working directory,
+    so each dataset gets its own directory.
+    """
+    path = tempfile.mkdtemp(prefix=prefix)
+    os.chdir(path)
+    return path
+
+
+def load_zenith():
+    """Import the KivyMD app (``main.py``) and create its App instance.
+
+    A suite that built proando's plain Kivy App leaves it as the running
+    app, and KivyMD widgets refuse to build under it, so anything but an
+    MDApp is replaced.
+    """
+    import main as zenith
+    if not isinstance(zenith.MDApp.get_running_app(), zenith.MDApp):
+        zenith.ZenithMobileApp()
+    return zenith
+
+
+def load_proando(activities_file):
+    """Import the proando app under its own module name, storing data in ``activities_file``."""
+    module = sys.modules.get("proando_main")
+    if module is None:
+        path = os.path.join(ROOT, "proando", "main.py")
+        spec = importlib.util.spec_from_file_location("proando_main", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["proando_main"] = module
+        spec.loader.exec_module(module)
+    module.ACTIVITIES_FILE = activities_file
+    module.activity_stats.loaded = False
+    return module
+
+
+def generate_activities(count, seed=0, days=365):
+    """Yield ``count`` synthetic activities spread over the last ``days`` days.
+
+    Each item is a dict with the fields shared by both apps plus ``date`` and
+    ``category``; roughly a third are completed.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    for i in range(count):
+        start = rng.randrange(6 * 60, 21 * 60, 15)
+        end = start + rng.choice((30, 45, 60, 90, 120))
+        yield {
+            "id": i + 1,
+            "title": f"{rng.choice(TITLES)} {i}",
+            "description": "Descripción de prueba" if rng.random() < 0.5 else "",
+            "category": rng.choice(CATEGORIES),
+            "priority": rng.choice(PRIORITIES),
+            "start_time": f"{start // 60:02d}:{start % 60:02d}",
+            "end_time": f"{min(end, 23 * 60 + 59) // 60:02d}:{min(end, 23 * 60 + 59) % 60:02d}",
+            "date": (today - timedelta(days=rng.randrange(days))).isoformat(),
+            "completed": rng.random() < 0.33,
+        }
+
+
+def seed_database(db_path, activities):
+    """Bulk insert synthetic activities straight into the SQLite file.
+
+    Category and priority names are resolved to their lookup table ids, and
+    each row gets the sync columns as an unsynced local change.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT OR IGNORE INTO categories (name) VALUES (?)", [(c,) for c in CATEGORIES])
+    category_ids = dict(conn.execute("SELECT name, id FROM categories"))
+    priority_ids = dict(conn.execute("SELECT name, id FROM priorities"))
+    seq = conn.execute("SELECT value FROM sync_state WHERE key = 'local_seq'").fetchone()[0]
+    updated_at = int(time.time() * 1000)
+    rows = []
+    for a in activities:
+        seq += 1
+        rows.append((a["title"], a["description"], category_ids[a["category"]], priority_ids[a["priority"]],
+                     a["start_time"], a["end_time"], a["date"], int(a["completed"]),
+                     uuid.uuid4().hex, updated_at, seq))
+    conn.executemany(
+        "INSERT INTO activities (title, description, category_id, priority_id, start_time, end_time, date, completed, "
+        "uid, updated_at, change_seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.execute("UPDATE sync_state SET value = ? WHERE key = 'local_seq'", (seq,))
+    conn.commit()
+    conn.close()
+
+
+def seed_json(activities_file, activities):
+    """Write synthetic activities in proando's legacy single-file JSON format.
+
+    proando splits the file into per-day partitions the first time it is read.
+    """
+    records = [
+        {key: a[key] for key in ("id", "title", "description", "date", "start_time", "end_time", "priority",
+                                 "completed")}
+        for a in activities
+    ]
+    with open(activities_file, "w") as f:
+        json.dump(records, f)
+
+
+def timeit(func, repeat=5, setup=None):
+    """Run ``func`` ``repeat`` times and return timing stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": min(samples),
+        "mean_ms": statistics.fmean(samples),
+        "median_ms": statistics.median(samples),
+        "max_ms": max(samples),
+        "repeat": repeat,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    import kivy
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "kivy": kivy.__version__,
+    }
+
+
+class Results:
+    """Collects benchmark rows and writes them as one JSON document."""
+
+    def __init__(self, suite):
+        self.suite = suite
+        self.rows = []
+
+    def add(self, name, size, stats, **extra):
+        row = {"benchmark": name, "size": size}
+        row.update(stats)
+        row.update(extra)
+        self.rows.append(row)
+        print(f"{name:<45} n={size:<7} {stats.get('mean_ms', 0):10.2f} ms", file=sys.stderr)
+
+    def to_dict(self):
+        return {"suite": self.suite, "meta": metadata(), "results": self.rows}
+
+    def write(self, output=None):
+        data = json.dumps(self.to_dict(), indent=2)
+        if output:
+            with open(output, "w") as f:
+                f.write(data)
+        else:
+            print(data)
+
+
+def parse_args(description, default_sizes, argv=None):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(default_sizes),
+                        help="dataset sizes (number of activities)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", "-o", help="write JSON results here instead of stdout")
+    return parser.parse_args(argv)
@@ -0,0 +1,49 @@
+"""Compare two benchmark reports and flag regressions.
+
+    python benchmarks/compare.py baseline.json current.json --threshold 1.2
+
+Rows are matched on (benchmark, size). Exits with status 1 when any
+benchmark's median got slower than ``threshold`` times the baseline.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return {(row["benchmark"], row["size"]): row for row in report["results"]}, report.get("meta", {})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="slowdown ratio that counts as a regression")
+    parser.add_argument("--metric", default="median_ms")
+    args = parser.parse_args(argv)
+
+    baseline, base_meta = load(args.baseline)
+    current, current_meta = load(args.current)
+    print(f"baseline {base_meta.get('commit')}  ->  current {current_meta.get('commit')}")
+
+    regressions = 0
+    for key in sorted(current):
+        if key not in baseline:
+            continue
+        before = baseline[key][args.metric]
+        after = current[key][args.metric]
+        ratio = after / before if before else float("inf")
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        name, size = key
+        print(f"{name:<45} n={size:<7} {before:10.2f} -> {after:10.2f} ms  x{ratio:5.2f}{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,52 +8,428 @@ if sys.platform == 'win32':
 else:
     os.environ['KIVY_GL_BACKEND'] = 'gl'
 
+# Only what the first visible tab needs is imported here. Widgets used by
+# dialogs are imported where the dialog is built, so they stay off the
+# startup path (benchmarks/bench_startup.py checks this).
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
-from kivymd.uix.screenmanager import MDScreenManager
 from kivymd.uix.bottomnavigation import MDBottomNavigation, MDBottomNavigationItem
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
-from kivymd.uix.button import MDRaisedButton, MDIconButton, MDFlatButton
-from kivymd.uix.textfield import MDTextField
+from kivymd.uix.button import MDRaisedButton, MDIconButton
 from kivymd.uix.toolbar import MDTopAppBar
-from kivymd.uix.dialog import MDDialog
-from kivymd.uix.menu import MDDropdownMenu
-from kivymd.uix.list import MDList, OneLineListItem, TwoLineListItem, ThreeLineListItem
+from kivymd.uix.list import MDList
 from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.gridlayout import MDGridLayout
 from kivymd.uix.selectioncontrol import MDCheckbox
-from kivy.uix.widget import Widget
+from kivy.core.window import Window
+from kivy.event import EventDispatcher
+from kivy.properties import NumericProperty, StringProperty
 from kivy.metrics import dp
 from kivy.clock import Clock
-from datetime import datetime, timedelta
+from kivy.logger import Logger
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.graphics import Color
+from datetime import date, datetime, timedelta
+import array
+import bisect
+import calendar
+import collections
+import functools
+import itertools
+import random
 import sqlite3
-import json
+import threading
+import time
+import uuid
+
+import zenith_core
+from zenith_core import (MemoryDiagnostics, Profiler, SyncEngine, WidgetPool, check_activity_input, local_wins,
+                         screenful)
+
+profiler = Profiler(
+    os.environ.get("ZENITH_PROFILE"),
+    os.environ.get("ZENITH_PROFILE_OUTPUT"),
+    os.environ.get("ZENITH_PROFILE_FORMAT")
+)
+
+memory_diagnostics = MemoryDiagnostics(
+    os.environ.get("ZENITH_MEMORY"),
+    os.environ.get("ZENITH_MEMORY_OUTPUT")
+)
+
+class ActivityEvents(EventDispatcher):
+    # Change feed for the activities table. DatabaseManager dispatches after
+    # every write so widgets can react without re-querying.
+    __events__ = ('on_activity_added', 'on_activity_updated', 'on_activity_deleted')
+
+    def on_activity_added(self, activity):
+        pass
+
+    def on_activity_updated(self, old, new):
+        pass
+
+    def on_activity_deleted(self, activity):
+        pass
+
+activity_events = ActivityEvents()
+
+class LookupTable:
+    # Interning cache for a small lookup table (categories, priorities).
+    # Activities store the integer id; names and colours for widgets come
+    # from this cache, loaded once per database file, so neither reads nor
+    # rendering join or compare strings. Ids follow insertion order, so
+    # ordering uses the explicit rank column: seeds set it, and names
+    # interned later (typed by hand or pulled by sync) get 0, below every
+    # seed. The sync thread interns too, so changes to the cache go through
+    # a lock; queries run outside it, so a writer waiting on the database
+    # never holds up the other thread.
+    def __init__(self, table, seeds):
+        self.table = table
+        self.seeds = seeds
+        self.db_path = None
+        self.rows = {}
+        self.ids = {}
+        self.lock = threading.Lock()
+    
+    def create(self, cursor):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                color TEXT,
+                rank INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute(f'PRAGMA table_info({self.table})')
+        if "rank" not in [column[1] for column in cursor.fetchall()]:
+            # Tables from before the rank column: rank the seeded rows
+            cursor.execute(f'ALTER TABLE {self.table} ADD COLUMN rank INTEGER NOT NULL DEFAULT 0')
+            cursor.executemany(f'UPDATE {self.table} SET rank = ? WHERE id = ?',
+                               [(rank, lookup_id) for lookup_id, _, _, rank in self.seeds])
+        cursor.executemany(f'INSERT OR IGNORE INTO {self.table} (id, name, color, rank) VALUES (?, ?, ?, ?)',
+                           self.seeds)
+    
+    def load(self, cursor, db_path, force=False):
+        if db_path == self.db_path and not force:
+            return
+        cursor.execute(f'SELECT id, name, color, rank FROM {self.table}')
+        rows = {row[0]: row for row in cursor.fetchall()}
+        with self.lock:
+            self.rows = rows
+            self.ids = {row[1]: row[0] for row in rows.values()}
+            self.db_path = db_path
+    
+    def intern(self, cursor, name):
+        lookup_id = self.ids.get(name)
+        if lookup_id is None:
+            cursor.execute(f'INSERT OR IGNORE INTO {self.table} (name) VALUES (?)', (name,))
+            cursor.execute(f'SELECT id, name, color, rank FROM {self.table} WHERE name = ?', (name,))
+            row = cursor.fetchone()
+            with self.lock:
+                # Copy on write: readers on the other thread keep a whole dict
+                self.rows = {**self.rows, row[0]: row}
+                self.ids = {**self.ids, name: row[0]}
+            lookup_id = row[0]
+        return lookup_id
+    
+    def id_of(self, name):
+        return self.ids.get(name)
+    
+    def name(self, lookup_id):
+        row = self.rows.get(lookup_id)
+        return row[1] if row else ""
+    
+    def color(self, lookup_id, default=(0, 0, 0, 0)):
+        row = self.rows.get(lookup_id)
+        return row[2] if row and row[2] else default
+    
+    def rank(self, lookup_id):
+        row = self.rows.get(lookup_id)
+        return row[3] if row else 0
+
+# Seeded with fixed ids and ranks; a higher priority rank is more urgent
+categories = LookupTable("categories", [
+    (1, "Trabajo", "#2196F3", 0),
+    (2, "Estudio", "#9C27B0", 0),
+    (3, "Personal", "#FF9800", 0),
+    (4, "Salud", "#4CAF50", 0),
+    (5, "General", "#607D8B", 0),
+])
+priorities = LookupTable("priorities", [
+    (1, "Baja", "#4CAF50", 1),
+    (2, "Media", "#FF9800", 2),
+    (3, "Alta", "#F44336", 3),
+])
+
+# Database file, relative to the working directory unless ZENITH_DB_PATH
+# points elsewhere (e.g. a path shared with a sync helper)
+DB_PATH = os.environ.get("ZENITH_DB_PATH", "zenith_mobile.db")
+BUSY_TIMEOUT = 5.0
+WRITE_RETRIES = 5
+WRITE_RETRY_DELAY = 0.05
+# Soft-deleted activities stay restorable this long (seconds) before MaintenanceJob
+# removes them; the undo snackbar only offers the first few seconds
+PURGE_AFTER = 60 * 60
+PURGE_INTERVAL = 5 * 60
+PURGE_BATCH = 100
+# Maintenance waits until there has been no touch or key for IDLE_AFTER
+# seconds, so it never competes with the user for frames
+IDLE_AFTER = 10
+UNDO_DURATION = 5
+# Completed activities dated more than this many days ago move to
+# activities_archive, out of the working set the screens query
+ARCHIVE_AFTER_DAYS = 90
+# Read-through cache for DatabaseManager queries; results longer than
+# QUERY_CACHE_MAX_ROWS rows are not kept
+QUERY_CACHE_SIZE = 64
+QUERY_CACHE_MAX_ROWS = 20000
+# AutoScheduler places activities within these hours (minutes since
+# midnight) over this many days
+SCHEDULE_DAY_START = 8 * 60
+SCHEDULE_DAY_END = 21 * 60
+SCHEDULE_HORIZON_DAYS = 30
+
+def retry_on_busy(func):
+    # Retry a write that still found the database locked after the busy
+    # timeout (or hit SQLITE_BUSY upgrading a read transaction, which the
+    # busy handler cannot wait out), backing off exponentially with jitter
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        delay = WRITE_RETRY_DELAY
+        for attempt in range(WRITE_RETRIES):
+            try:
+                return func(self, *args, **kwargs)
+            except sqlite3.OperationalError as error:
+                message = str(error)
+                if "locked" not in message and "busy" not in message:
+                    raise
+                self.writer().rollback()
+                # Names interned by the rolled back transaction are gone too
+                self.reload_lookups(force=True)
+                if attempt == WRITE_RETRIES - 1:
+                    raise
+                Logger.warning(f"DatabaseManager: {func.__name__} hit a locked database, retrying")
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay *= 2
+    return wrapper
+
+# Row layout shared by every activities query:
+# (id, title, description, category_id, priority_id, start_time, end_time,
+#  date, completed, created_at, uid, updated_at, change_seq, deleted_at)
+# uid identifies the activity across devices, updated_at (epoch ms) decides
+# sync conflicts and change_seq orders local changes for SyncEngine.push.
+# Deletes only set deleted_at (epoch ms); MaintenanceJob removes the rows
+# later. activities_archive has the same layout and holds old completed rows.
+ACTIVITIES_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        description TEXT,
+        category_id INTEGER REFERENCES categories(id),
+        priority_id INTEGER REFERENCES priorities(id),
+        start_time TEXT,
+        end_time TEXT,
+        date TEXT,
+        completed INTEGER DEFAULT 0,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        uid TEXT,
+        updated_at INTEGER,
+        change_seq INTEGER DEFAULT 0,
+        deleted_at INTEGER
+    )
+'''
+SYNC_COLUMNS = (
+    ("uid", "TEXT"),
+    ("updated_at", "INTEGER"),
+    ("change_seq", "INTEGER DEFAULT 0"),
+    ("deleted_at", "INTEGER"),
+)
+
+def now_ms():
+    return int(time.time() * 1000)
+
+class QueryCache:
+    # LRU of DatabaseManager read results keyed by (database, query,
+    # arguments). Each entry is filed under the months its date range
+    # covers, so a write invalidates only the entries whose range contains
+    # the dates it touched; entries without a range (the whole working set,
+    # totals) go under None and are dropped by every write. A generation
+    # per database keeps a result read while another thread wrote from
+    # being stored after its invalidation.
+    def __init__(self, max_entries=QUERY_CACHE_SIZE, max_rows=QUERY_CACHE_MAX_ROWS):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.entries = collections.OrderedDict()
+        self.buckets = {}
+        self.generations = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.evicted = 0
+    
+    @staticmethod
+    def months(start, end):
+        # "YYYY-MM" keys from start to end (ISO dates), or [None] when the
+        # range is open or too wide to be worth bucketing
+        try:
+            year, month = int(start[:4]), int(start[5:7])
+            last = (int(end[:4]), int(end[5:7]))
+        except (TypeError, ValueError):
+            return [None]
+        keys = []
+        while (year, month) <= last:
+            if len(keys) == 24:
+                return [None]
+            keys.append(f"{year:04d}-{month:02d}")
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return keys or [None]
+    
+    def get(self, db_path, query, load, date_range=None):
+        db_path = os.path.abspath(db_path)
+        key = (db_path,) + query
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                result = entry[0]
+                return result[:] if isinstance(result, list) else result
+            self.misses += 1
+            generation = self.generations.get(db_path, 0)
+        result = load()
+        if isinstance(result, list) and len(result) > self.max_rows:
+            return result
+        with self.lock:
+            if self.generations.get(db_path, 0) != generation:
+                return result
+            start, end = date_range or (None, None)
+            months = self.months(start, end)
+            self.entries[key] = (result, start, end, months)
+            for month in months:
+                self.buckets.setdefault((db_path, month), set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self._drop(next(iter(self.entries)))
+                self.evicted += 1
+        return result[:] if isinstance(result, list) else result
+    
+    def invalidate(self, db_path, *dates):
+        # Drop what a write to activities on these dates (ISO) may have
+        # changed; with no dates only the open-range entries go
+        db_path = os.path.abspath(db_path)
+        with self.lock:
+            self.generations[db_path] = self.generations.get(db_path, 0) + 1
+            stale = set(self.buckets.get((db_path, None), ()))
+            for day in dates:
+                if not day:
+                    continue
+                for key in self.buckets.get((db_path, day[:7]), ()):
+                    _, start, end, _ = self.entries[key]
+                    if start <= day <= end:
+                        stale.add(key)
+            for key in stale:
+                self._drop(key)
+            self.invalidated += len(stale)
+    
+    def clear(self, db_path=None):
+        if db_path is not None:
+            db_path = os.path.abspath(db_path)
+        with self.lock:
+            for key in [key for key in self.entries if db_path is None or key[0] == db_path]:
+                self._drop(key)
+            for path in list(self.generations) if db_path is None else [db_path]:
+                self.generations[path] = self.generations.get(path, 0) + 1
+    
+    def _drop(self, key):
+        _, _, _, months = self.entries.pop(key)
+        for month in months:
+            bucket = self.buckets.get((key[0], month))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[(key[0], month)]
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidated": self.invalidated,
+            "evicted": self.evicted,
+            "entries": len(self.entries),
+        }
+
+query_cache = QueryCache()
+profiler.extras["query_cache"] = query_cache.stats
+
+def cached_query(date_range):
+    # Serve a DatabaseManager read through query_cache. date_range maps the
+    # call's arguments to the (start, end) ISO dates its rows come from, or
+    # returns None when a write on any date may change the result.
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            return query_cache.get(
+                self.db_path, (func.__name__,) + args, lambda: func(self, *args), date_range(*args)
+            )
+        return wrapper
+    return decorate
 
 class DatabaseManager:
-    def __init__(self):
-        self.db_path = "zenith_mobile.db"
+    # One long-lived write connection per database file and thread, shared
+    # by every DatabaseManager on that thread. The UI thread's own commits
+    # then never change its PRAGMA data_version, so a change there means
+    # another process, or the background sync thread, wrote.
+    _writers = {}
+    
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DB_PATH
         self.init_database()
     
+    def connect(self):
+        # Short-lived read connection; waits up to BUSY_TIMEOUT on a lock
+        return sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT)
+    
+    def writer(self):
+        key = (os.path.abspath(self.db_path), threading.get_ident())
+        conn = self._writers.get(key)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT)
+            conn.execute(f'PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}')
+            # Readers and the writer no longer block each other
+            conn.execute('PRAGMA journal_mode = WAL')
+            self._writers[key] = conn
+        return conn
+    
+    @classmethod
+    def close_writer(cls, db_path=None):
+        # Close the calling thread's write connection; threads that end
+        # must call this, or their connection stays in _writers for good
+        key = (os.path.abspath(db_path or DB_PATH), threading.get_ident())
+        conn = cls._writers.pop(key, None)
+        if conn is not None:
+            conn.close()
+    
+    def data_version(self):
+        return self.writer().execute('PRAGMA data_version').fetchone()[0]
+    
+    @retry_on_busy
     def init_database(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = self.writer()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS activities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                category TEXT,
-                priority TEXT,
-                start_time TEXT,
-                end_time TEXT,
-                date TEXT,
-                completed INTEGER DEFAULT 0,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        categories.create(cursor)
+        priorities.create(cursor)
+        cursor.execute(ACTIVITIES_SCHEMA.format(table="activities"))
+        migrated = self._migrate_lookup_columns(cursor)
+        self._migrate_sync_columns(cursor)
+        cursor.execute(ACTIVITIES_SCHEMA.format(table="activities_archive"))
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_archive_uid ON activities_archive (uid)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_archive_date ON activities_archive (date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_archive_change_seq ON activities_archive (change_seq)')
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS user_profile (
@@ -66,48 +442,1813 @@ class DatabaseManager:
         ''')
         
         conn.commit()
-        conn.close()
+        if migrated:
+            # Reclaim the space the text columns used
+            conn.execute('VACUUM')
+        self.reload_lookups(cursor)
     
+    def reload_lookups(self, cursor=None, force=False):
+        cursor = cursor or self.writer().cursor()
+        db_path = os.path.abspath(self.db_path)
+        for lookup in (categories, priorities):
+            lookup.load(cursor, db_path, force)
+    
+    def _migrate_lookup_columns(self, cursor):
+        # Databases created before the lookup tables stored category and
+        # priority as free text; move them to integer ids
+        cursor.execute('PRAGMA table_info(activities)')
+        if "category" not in [column[1] for column in cursor.fetchall()]:
+            return False
+        for lookup, column in ((categories, "category"), (priorities, "priority")):
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO {lookup.table} (name)
+                SELECT DISTINCT {column} FROM activities WHERE {column} IS NOT NULL
+            ''')
+        cursor.execute(ACTIVITIES_SCHEMA.format(table="activities_migrated"))
+        cursor.execute('''
+            INSERT INTO activities_migrated (id, title, description, category_id, priority_id,
+                                             start_time, end_time, date, completed, created_at)
+            SELECT a.id, a.title, a.description, c.id, p.id,
+                   a.start_time, a.end_time, a.date, a.completed, a.created_at
+            FROM activities a
+            LEFT JOIN categories c ON c.name = a.category
+            LEFT JOIN priorities p ON p.name = a.priority
+        ''')
+        cursor.execute('DROP TABLE activities')
+        cursor.execute('ALTER TABLE activities_migrated RENAME TO activities')
+        return True
+    
+    def _migrate_sync_columns(self, cursor):
+        # Change tracking for SyncEngine; rows from before it (or inserted
+        # by hand) get a uid and count as local changes still to push
+        cursor.execute('PRAGMA table_info(activities)')
+        existing = [column[1] for column in cursor.fetchall()]
+        for name, definition in SYNC_COLUMNS:
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE activities ADD COLUMN {name} {definition}')
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_activities_uid ON activities (uid)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_activities_change_seq ON activities (change_seq)')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_activities_deleted_at ON activities (deleted_at)
+            WHERE deleted_at IS NOT NULL
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tombstones (
+                uid TEXT PRIMARY KEY,
+                updated_at INTEGER,
+                change_seq INTEGER DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tombstones_change_seq ON tombstones (change_seq)')
+        cursor.execute('CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value)')
+        cursor.executemany('INSERT OR IGNORE INTO sync_state (key, value) VALUES (?, ?)', [
+            ("client_id", uuid.uuid4().hex),
+            ("local_seq", 0),
+            ("pushed_seq", 0),
+            ("pull_cursor", 0),
+        ])
+        cursor.execute('''
+            UPDATE activities
+            SET uid = lower(hex(randomblob(16))),
+                updated_at = COALESCE(updated_at, CAST(strftime('%s', COALESCE(created_at, 'now')) AS INTEGER) * 1000),
+                change_seq = (SELECT value FROM sync_state WHERE key = 'local_seq') + id
+            WHERE uid IS NULL
+        ''')
+        cursor.execute('''
+            UPDATE sync_state
+            SET value = MAX(value, (SELECT COALESCE(MAX(change_seq), 0) FROM activities))
+            WHERE key = 'local_seq'
+        ''')
+    
+    def _next_seq(self, cursor):
+        cursor.execute("UPDATE sync_state SET value = value + 1 WHERE key = 'local_seq'")
+        cursor.execute("SELECT value FROM sync_state WHERE key = 'local_seq'")
+        return cursor.fetchone()[0]
+    
+    @retry_on_busy
     def add_activity(self, title, description, category, priority, start_time, end_time, date):
-        conn = sqlite3.connect(self.db_path)
+        conn = self.writer()
         cursor = conn.cursor()
+        category_id = categories.intern(cursor, category)
+        priority_id = priorities.intern(cursor, priority)
         cursor.execute('''
-            INSERT INTO activities (title, description, category, priority, start_time, end_time, date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (title, description, category, priority, start_time, end_time, date))
+            INSERT INTO activities (title, description, category_id, priority_id, start_time, end_time, date,
+                                    uid, updated_at, change_seq)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (title, description, category_id, priority_id, start_time, end_time, date,
+              uuid.uuid4().hex, now_ms(), self._next_seq(cursor)))
         conn.commit()
-        conn.close()
+        query_cache.invalidate(self.db_path, date)
+        activity = self._get_activity(cursor, cursor.lastrowid)
+        activity_events.dispatch('on_activity_added', activity)
+        return activity
+    
+    def _source(self, cursor, start_date):
+        # Table expression for a query starting at start_date: the archive
+        # only holds dates up to its newest archived day, so later ranges
+        # skip it entirely
+        cursor.execute('SELECT MAX(date) FROM activities_archive')
+        newest = cursor.fetchone()[0]
+        if newest is not None and (start_date is None or start_date <= newest):
+            return "(SELECT * FROM activities UNION ALL SELECT * FROM activities_archive)"
+        return "activities"
     
+    @cached_query(lambda date=None: (date, date) if date else None)
     def get_activities(self, date=None):
-        conn = sqlite3.connect(self.db_path)
+        # Without a date this is the working set; archived days are included
+        # when asked for by date
+        conn = self.connect()
         cursor = conn.cursor()
         if date:
-            cursor.execute('SELECT * FROM activities WHERE date = ? ORDER BY start_time', (date,))
+            cursor.execute(
+                f'SELECT * FROM {self._source(cursor, date)} WHERE date = ? AND deleted_at IS NULL ORDER BY start_time',
+                (date,)
+            )
         else:
-            cursor.execute('SELECT * FROM activities ORDER BY date, start_time')
+            cursor.execute('SELECT * FROM activities WHERE deleted_at IS NULL ORDER BY date, start_time')
+        activities = cursor.fetchall()
+        conn.close()
+        return activities
+    
+    @cached_query(lambda start_date, end_date: (start_date, end_date))
+    def get_activities_between(self, start_date, end_date):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT * FROM {self._source(cursor, start_date)}
+            WHERE date BETWEEN ? AND ? AND deleted_at IS NULL
+            ORDER BY date, start_time
+        ''', (start_date, end_date))
+        activities = cursor.fetchall()
+        conn.close()
+        return activities
+    
+    def get_pending_activities(self, before):
+        # Unfinished activities dated before `before` (ISO date); archived
+        # rows are all completed, so only the working set is read
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM activities
+            WHERE date < ? AND completed = 0 AND deleted_at IS NULL
+            ORDER BY date, start_time
+        ''', (before,))
         activities = cursor.fetchall()
         conn.close()
         return activities
     
+    def search_activities(self, text, include_archive=True, limit=100):
+        # Case-insensitive substring match on title and description, newest
+        # first
+        conn = self.connect()
+        cursor = conn.cursor()
+        source = self._source(cursor, None) if include_archive else "activities"
+        pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        cursor.execute(f'''
+            SELECT * FROM {source}
+            WHERE (title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\') AND deleted_at IS NULL
+            ORDER BY date DESC, start_time DESC
+            LIMIT ?
+        ''', (pattern, pattern, limit))
+        activities = cursor.fetchall()
+        conn.close()
+        return activities
+    
+    def get_activity_breakdowns(self):
+        # Grouped (bucket, total, completed) rows for ActivityAnalytics,
+        # archive included
+        buckets = {
+            "week": "strftime('%Y-%W', date)",
+            "month": "strftime('%Y-%m', date)",
+            "hour": "CASE WHEN start_time GLOB '[0-9]*' THEN CAST(substr(start_time, 1, 2) AS INTEGER) END",
+            "category": "category_id",
+            "priority": "priority_id",
+        }
+        conn = self.connect()
+        cursor = conn.cursor()
+        source = self._source(cursor, None)
+        breakdowns = {}
+        for name, bucket in buckets.items():
+            cursor.execute(f'''
+                SELECT {bucket} AS bucket, COUNT(*), COALESCE(SUM(completed = 1), 0)
+                FROM {source}
+                WHERE deleted_at IS NULL
+                GROUP BY bucket
+            ''')
+            breakdowns[name] = cursor.fetchall()
+        cursor.execute(f'''
+            SELECT date, COUNT(*) FROM {source}
+            WHERE completed = 1 AND deleted_at IS NULL
+            GROUP BY date
+        ''')
+        breakdowns["completed_days"] = cursor.fetchall()
+        conn.close()
+        return breakdowns
+    
+    def get_activity_columns(self):
+        # (id, date ordinal, start minutes, end minutes, priority id, completed)
+        # rows for ActivityColumns, decoded by SQLite rather than in Python
+        minutes = (
+            "CASE WHEN {0} GLOB '[0-9][0-9]:[0-9][0-9]*' "
+            "THEN CAST(substr({0}, 1, 2) AS INTEGER) * 60 + CAST(substr({0}, 4, 2) AS INTEGER) "
+            "ELSE -1 END"
+        )
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT id,
+                   COALESCE(CAST(julianday(date) - 1721424.5 AS INTEGER), 0),
+                   {minutes.format("start_time")},
+                   {minutes.format("end_time")},
+                   COALESCE(priority_id, -1),
+                   completed = 1
+            FROM activities
+            WHERE deleted_at IS NULL
+        ''')
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+    
+    @cached_query(lambda date: None)
+    def get_activity_counts(self, date):
+        # Totals for the stats widgets: (total, completed, on date, completed on date).
+        # Archived rows are all completed and never dated today.
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*),
+                   COALESCE(SUM(completed = 1), 0),
+                   COALESCE(SUM(date = ?), 0),
+                   COALESCE(SUM(date = ? AND completed = 1), 0)
+            FROM activities
+            WHERE deleted_at IS NULL
+        ''', (date, date))
+        total, completed, today_total, today_completed = cursor.fetchone()
+        cursor.execute('SELECT COUNT(*) FROM activities_archive')
+        archived = cursor.fetchone()[0]
+        conn.close()
+        return total + archived, completed + archived, today_total, today_completed
+    
+    def _get_activity(self, cursor, activity_id):
+        cursor.execute('SELECT * FROM activities WHERE id = ?', (activity_id,))
+        return cursor.fetchone()
+    
+    def _unarchive(self, cursor, column, value):
+        # Move an archived row back into activities before it is changed
+        cursor.execute(
+            f'INSERT INTO activities SELECT * FROM activities_archive WHERE {column} = ?', (value,)
+        )
+        if cursor.rowcount > 0:
+            cursor.execute(f'DELETE FROM activities_archive WHERE {column} = ?', (value,))
+    
+    @retry_on_busy
+    def archive_activities(self, batch_size=200, before=None):
+        # Move up to batch_size completed activities dated before `before`
+        # (ISO date, default ARCHIVE_AFTER_DAYS ago) to activities_archive.
+        # They are still activities, just outside the working set, so no
+        # activity_events fire. Returns the rows moved.
+        if before is None:
+            before = (datetime.now() - timedelta(days=ARCHIVE_AFTER_DAYS)).strftime("%Y-%m-%d")
+        conn = self.writer()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id FROM activities
+            WHERE date < ? AND completed = 1 AND deleted_at IS NULL
+            LIMIT ?
+        ''', (before, batch_size))
+        ids = [(row[0],) for row in cursor.fetchall()]
+        cursor.executemany('INSERT INTO activities_archive SELECT * FROM activities WHERE id = ?', ids)
+        cursor.executemany('DELETE FROM activities WHERE id = ?', ids)
+        conn.commit()
+        if ids:
+            # Dated queries still see archived rows; the working set does not
+            query_cache.invalidate(self.db_path)
+        return len(ids)
+    
+    @retry_on_busy
     def update_activity_status(self, activity_id, completed):
-        conn = sqlite3.connect(self.db_path)
+        # A no-op (same status, deleted or unknown row) writes nothing: no
+        # change_seq is taken, so sync has nothing new to push
+        conn = self.writer()
         cursor = conn.cursor()
-        cursor.execute('UPDATE activities SET completed = ? WHERE id = ?', (completed, activity_id))
+        old = self._get_activity(cursor, activity_id)
+        if old is None and not completed:
+            # Archived rows are all completed; only un-completing brings one back
+            self._unarchive(cursor, "id", activity_id)
+            old = self._get_activity(cursor, activity_id)
+        if old is None or old[13] is not None or bool(old[8]) == bool(completed):
+            conn.commit()
+            return
+        cursor.execute(
+            'UPDATE activities SET completed = ?, updated_at = ?, change_seq = ? WHERE id = ?',
+            (completed, now_ms(), self._next_seq(cursor), activity_id)
+        )
         conn.commit()
-        conn.close()
+        new = self._get_activity(cursor, activity_id)
+        query_cache.invalidate(self.db_path, old[7])
+        activity_events.dispatch('on_activity_updated', old, new)
     
+    @retry_on_busy
     def delete_activity(self, activity_id):
-        conn = sqlite3.connect(self.db_path)
+        # Soft delete: one flag write, undone by restore_activity
+        conn = self.writer()
+        cursor = conn.cursor()
+        self._unarchive(cursor, "id", activity_id)
+        old = self._get_activity(cursor, activity_id)
+        if old is None or old[13] is not None:
+            conn.commit()
+            return
+        now = now_ms()
+        cursor.execute(
+            'UPDATE activities SET deleted_at = ?, updated_at = ?, change_seq = ? WHERE id = ?',
+            (now, now, self._next_seq(cursor), activity_id)
+        )
+        conn.commit()
+        query_cache.invalidate(self.db_path, old[7])
+        activity_events.dispatch('on_activity_deleted', old)
+    
+    @retry_on_busy
+    def restore_activity(self, activity_id):
+        conn = self.writer()
         cursor = conn.cursor()
-        cursor.execute('DELETE FROM activities WHERE id = ?', (activity_id,))
+        cursor.execute(
+            'UPDATE activities SET deleted_at = NULL, updated_at = ?, change_seq = ? WHERE id = ? AND deleted_at IS NOT NULL',
+            (now_ms(), self._next_seq(cursor), activity_id)
+        )
         conn.commit()
+        if cursor.rowcount:
+            activity = self._get_activity(cursor, activity_id)
+            query_cache.invalidate(self.db_path, activity[7])
+            activity_events.dispatch('on_activity_added', activity)
+    
+    @retry_on_busy
+    def reschedule_activities(self, changes):
+        # changes: (activity_id, date, start_time, end_time) tuples, written
+        # in one transaction so a drag in the time grid costs one commit
+        # however many blocks it moved. Returns the updated rows.
+        conn = self.writer()
+        cursor = conn.cursor()
+        updated = []
+        for activity_id, day, start_time, end_time in changes:
+            self._unarchive(cursor, "id", activity_id)
+            old = self._get_activity(cursor, activity_id)
+            if old is None or old[13] is not None or (old[7], old[5], old[6]) == (day, start_time, end_time):
+                continue
+            cursor.execute(
+                '''UPDATE activities SET date = ?, start_time = ?, end_time = ?, updated_at = ?, change_seq = ?
+                   WHERE id = ?''',
+                (day, start_time, end_time, now_ms(), self._next_seq(cursor), activity_id)
+            )
+            updated.append((old, self._get_activity(cursor, activity_id)))
+        conn.commit()
+        query_cache.invalidate(self.db_path, *{row[7] for pair in updated for row in pair})
+        for old, new in updated:
+            activity_events.dispatch('on_activity_updated', old, new)
+        return [new for old, new in updated]
+    
+    @retry_on_busy
+    def purge_deleted(self, batch_size=200, older_than=None):
+        # Remove up to batch_size soft-deleted rows deleted before older_than
+        # (epoch ms). Rows whose delete is not on the sync server yet leave a
+        # compact tombstone; tombstones already pushed (or never needed,
+        # when sync was never used) are dropped. Returns the rows removed.
+        conn = self.writer()
+        cursor = conn.cursor()
+        cursor.execute("SELECT key, value FROM sync_state WHERE key IN ('pushed_seq', 'pull_cursor')")
+        state = dict(cursor.fetchall())
+        synced = state["pushed_seq"] or state["pull_cursor"]
+        cursor.execute(
+            'SELECT id, uid, updated_at, change_seq FROM activities WHERE deleted_at < ? LIMIT ?',
+            (older_than if older_than is not None else now_ms() - PURGE_AFTER * 1000, batch_size)
+        )
+        rows = cursor.fetchall()
+        if synced:
+            cursor.executemany(
+                'INSERT OR REPLACE INTO tombstones (uid, updated_at, change_seq) VALUES (?, ?, ?)',
+                [(uid, updated, seq) for _, uid, updated, seq in rows if seq > state["pushed_seq"]]
+            )
+        cursor.executemany('DELETE FROM activities WHERE id = ?', [(row[0],) for row in rows])
+        cursor.execute(
+            'DELETE FROM tombstones WHERE rowid IN (SELECT rowid FROM tombstones WHERE change_seq <= ? OR ? LIMIT ?)',
+            (state["pushed_seq"], not synced, batch_size)
+        )
+        removed = len(rows) + cursor.rowcount
+        conn.commit()
+        return removed
+    
+    def get_sync_state(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT key, value FROM sync_state')
+        state = dict(cursor.fetchall())
         conn.close()
+        return state
+    
+    @retry_on_busy
+    def set_sync_state(self, **values):
+        conn = self.writer()
+        conn.executemany('UPDATE sync_state SET value = ? WHERE key = ?', [(v, k) for k, v in values.items()])
+        conn.commit()
+    
+    def get_local_changes(self, since, limit):
+        # Activities and tombstones changed after the change_seq watermark,
+        # oldest first, as (change_seq, change) in SyncEngine's wire format.
+        # Soft-deleted rows go out as deletes.
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT change_seq, uid, deleted_at IS NOT NULL, title, description, category_id, priority_id,
+                   start_time, end_time, date, completed, updated_at
+            FROM activities WHERE change_seq > ?
+            UNION ALL
+            SELECT change_seq, uid, 0, title, description, category_id, priority_id,
+                   start_time, end_time, date, completed, updated_at
+            FROM activities_archive WHERE change_seq > ?
+            UNION ALL
+            SELECT change_seq, uid, 1, NULL, NULL, NULL, NULL, NULL, NULL, NULL, 0, updated_at
+            FROM tombstones WHERE change_seq > ?
+            ORDER BY 1
+            LIMIT ?
+        ''', (since, since, since, limit))
+        rows = cursor.fetchall()
+        conn.close()
+        changes = []
+        for seq, uid, deleted, title, description, category_id, priority_id, start, end, day, completed, updated in rows:
+            change = {"uid": uid, "updated_at": updated, "deleted": bool(deleted)}
+            if not deleted:
+                change.update(
+                    title=title,
+                    description=description,
+                    category=categories.name(category_id) or None,
+                    priority=priorities.name(priority_id) or None,
+                    start_time=start,
+                    end_time=end,
+                    date=day,
+                    completed=bool(completed),
+                )
+            changes.append((seq, change))
+        return changes
+    
+    @retry_on_busy
+    def apply_remote_changes(self, changes, notify=True):
+        # Last writer wins on updated_at (see zenith_core.local_wins). Local
+        # rows changed since the last push keep their version; the server
+        # settles those on the next push.
+        # Applied rows get change_seq 0 so they are never pushed back.
+        # Pass notify=False off the UI thread: activity_events then stay
+        # quiet and the app picks the writes up through DataVersionWatcher.
+        conn = self.writer()
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM sync_state WHERE key = 'pushed_seq'")
+        pushed_seq = cursor.fetchone()[0]
+        events = []
+        for change in changes:
+            uid = change["uid"]
+            self._unarchive(cursor, "uid", uid)
+            cursor.execute('SELECT * FROM activities WHERE uid = ?', (uid,))
+            old = cursor.fetchone()
+            if old is not None:
+                local_updated, local_seq = old[11] or 0, old[12] or 0
+            else:
+                cursor.execute('SELECT updated_at, change_seq FROM tombstones WHERE uid = ?', (uid,))
+                tombstone = cursor.fetchone()
+                local_updated, local_seq = tombstone or (None, 0)
+            if local_wins(local_updated, local_seq, pushed_seq, change["updated_at"]):
+                continue
+            if change["deleted"]:
+                if old is not None:
+                    cursor.execute(
+                        '''UPDATE activities SET deleted_at = COALESCE(deleted_at, ?), updated_at = ?, change_seq = 0
+                           WHERE id = ?''',
+                        (change["updated_at"], change["updated_at"], old[0])
+                    )
+                    if old[13] is None:
+                        events.append(('on_activity_deleted', old))
+                else:
+                    cursor.execute(
+                        'INSERT OR REPLACE INTO tombstones (uid, updated_at, change_seq) VALUES (?, ?, 0)',
+                        (uid, change["updated_at"])
+                    )
+                continue
+            # Fields a client does not track (proando has no category or
+            # date) are left as they are
+            def field(key, index):
+                return change[key] if key in change else (old[index] if old is not None else None)
+            category_id, priority_id = field("category", 3), field("priority", 4)
+            if "category" in change:
+                category_id = categories.intern(cursor, category_id) if category_id else None
+            if "priority" in change:
+                priority_id = priorities.intern(cursor, priority_id) if priority_id else None
+            values = (
+                change["title"], field("description", 2), category_id, priority_id,
+                field("start_time", 5), field("end_time", 6), field("date", 7),
+                1 if change.get("completed") else 0, change["updated_at"],
+            )
+            if old is not None:
+                cursor.execute('''
+                    UPDATE activities
+                    SET title = ?, description = ?, category_id = ?, priority_id = ?, start_time = ?,
+                        end_time = ?, date = ?, completed = ?, updated_at = ?, change_seq = 0, deleted_at = NULL
+                    WHERE id = ?
+                ''', values + (old[0],))
+                new = self._get_activity(cursor, old[0])
+                if old[13] is None:
+                    events.append(('on_activity_updated', old, new))
+                else:
+                    events.append(('on_activity_added', new))
+            else:
+                cursor.execute('DELETE FROM tombstones WHERE uid = ?', (uid,))
+                cursor.execute('''
+                    INSERT INTO activities (title, description, category_id, priority_id, start_time,
+                                            end_time, date, completed, updated_at, uid, change_seq)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                ''', values + (uid,))
+                events.append(('on_activity_added', self._get_activity(cursor, cursor.lastrowid)))
+        conn.commit()
+        query_cache.invalidate(self.db_path, *{row[7] for event in events for row in event[1:]})
+        if notify:
+            for event in events:
+                activity_events.dispatch(*event)
+        return len(events)
+
+class DataVersionWatcher(EventDispatcher):
+    # Polls PRAGMA data_version on the shared write connection and fires
+    # on_external_change only when another process (a second instance, a
+    # sync helper) has committed to the database file.
+    __events__ = ('on_external_change',)
+    
+    def __init__(self, db, interval=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.db = db
+        self.interval = interval
+        self.version = db.data_version()
+        self._event = None
+    
+    def start(self):
+        if self._event is None:
+            self._event = Clock.schedule_interval(self.poll, self.interval)
+    
+    def stop(self):
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+    
+    def poll(self, dt=None):
+        version = self.db.data_version()
+        if version != self.version:
+            self.version = version
+            self.dispatch('on_external_change')
+    
+    def on_external_change(self):
+        pass
+
+# Sync server to use, e.g. http://127.0.0.1:8765 for sync_server.py
+SYNC_URL = os.environ.get("ZENITH_SYNC_URL")
+SYNC_INTERVAL = 30.0
+
+class ActivityStats(EventDispatcher):
+    # Running totals kept in sync with activity_events. Loaded with a single
+    # COUNT query, then each change adjusts the counters in O(1).
+    total = NumericProperty(0)
+    completed = NumericProperty(0)
+    today_total = NumericProperty(0)
+    today_completed = NumericProperty(0)
+    completion_rate = NumericProperty(0)
+    today = StringProperty("")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.loaded = False
+        activity_events.bind(
+            on_activity_added=self._on_added,
+            on_activity_updated=self._on_updated,
+            on_activity_deleted=self._on_deleted
+        )
+
+    def load(self, db):
+        self.db = db
+        self.today = datetime.now().strftime("%Y-%m-%d")
+        total, completed, today_total, today_completed = db.get_activity_counts(self.today)
+        self.total = total
+        self.completed = completed
+        self.today_total = today_total
+        self.today_completed = today_completed
+        self._update_rate()
+        self.loaded = True
+
+    def _check_day(self):
+        # The "today" counters are only valid for the day they were loaded on
+        if self.today != datetime.now().strftime("%Y-%m-%d"):
+            self.load(self.db)
+            return False
+        return True
+
+    def _apply(self, activity, sign):
+        completed = 1 if activity[8] else 0
+        self.total += sign
+        self.completed += sign * completed
+        if activity[7] == self.today:
+            self.today_total += sign
+            self.today_completed += sign * completed
+        self._update_rate()
+
+    def _update_rate(self):
+        self.completion_rate = int((self.completed / self.total) * 100) if self.total > 0 else 0
+
+    def _on_added(self, dispatcher, activity):
+        if self.loaded and self._check_day():
+            self._apply(activity, 1)
+
+    def _on_updated(self, dispatcher, old, new):
+        if self.loaded and self._check_day():
+            self._apply(old, -1)
+            self._apply(new, 1)
+
+    def _on_deleted(self, dispatcher, activity):
+        if self.loaded and self._check_day():
+            self._apply(activity, -1)
+
+activity_stats = ActivityStats()
+
+def get_activity_stats(db):
+    if not activity_stats.loaded:
+        activity_stats.load(db)
+    return activity_stats
+
+class ActivityAnalytics(EventDispatcher):
+    # Productivity aggregates for the Profile screen: completion per week and
+    # month, start-hour distribution, category/priority breakdowns and
+    # streaks. Loaded with GROUP BY queries, then patched in O(1) from
+    # activity_events, so coming back to the screen costs nothing.
+    version = NumericProperty(0)
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.loaded = False
+        self._streaks = None
+        activity_events.bind(
+            on_activity_added=self._on_added,
+            on_activity_updated=self._on_updated,
+            on_activity_deleted=self._on_deleted
+        )
+    
+    def load(self, db):
+        breakdowns = db.get_activity_breakdowns()
+        self.groups = {}
+        for name in ("week", "month", "hour", "category", "priority"):
+            self.groups[name] = {
+                bucket: [total, completed]
+                for bucket, total, completed in breakdowns[name]
+            }
+        self.completed_days = dict(breakdowns["completed_days"])
+        self._streaks = None
+        self.loaded = True
+        self.version += 1
+    
+    @staticmethod
+    def bucket_keys(activity):
+        # Same buckets as DatabaseManager.get_activity_breakdowns
+        try:
+            day = datetime.strptime(activity[7], "%Y-%m-%d")
+            week, month = day.strftime("%Y-%W"), day.strftime("%Y-%m")
+        except (TypeError, ValueError):
+            week = month = None
+        start = (activity[5] or "")[:2]
+        digits = start if start.isdigit() else start[:1] if start[:1].isdigit() else ""
+        return {
+            "week": week,
+            "month": month,
+            "hour": int(digits) if digits else None,
+            "category": activity[3],
+            "priority": activity[4],
+        }
+    
+    def _apply(self, activity, sign):
+        completed = 1 if activity[8] else 0
+        for name, bucket in self.bucket_keys(activity).items():
+            counts = self.groups[name].setdefault(bucket, [0, 0])
+            counts[0] += sign
+            counts[1] += sign * completed
+            if counts[0] <= 0:
+                del self.groups[name][bucket]
+        if completed:
+            remaining = self.completed_days.get(activity[7], 0) + sign
+            if remaining > 0:
+                self.completed_days[activity[7]] = remaining
+            else:
+                self.completed_days.pop(activity[7], None)
+            self._streaks = None
+    
+    def _changed(self, activity, sign, new=None):
+        if not self.loaded:
+            return
+        self._apply(activity, sign)
+        if new is not None:
+            self._apply(new, 1)
+        self.version += 1
+    
+    def _on_added(self, dispatcher, activity):
+        self._changed(activity, 1)
+    
+    def _on_updated(self, dispatcher, old, new):
+        self._changed(old, -1, new)
+    
+    def _on_deleted(self, dispatcher, activity):
+        self._changed(activity, -1)
+    
+    def trend(self, period="week", last=4):
+        # Most recent periods first: (period, total, completed, rate %)
+        periods = sorted((key for key in self.groups[period] if key), reverse=True)[:last]
+        rows = []
+        for key in periods:
+            total, completed = self.groups[period][key]
+            rows.append((key, total, completed, int(completed / total * 100) if total else 0))
+        return rows
+    
+    def breakdown(self, name):
+        # Buckets sorted by volume: (bucket, total, completed)
+        rows = [(key, total, completed) for key, (total, completed) in self.groups[name].items() if key is not None]
+        return sorted(rows, key=lambda row: -row[1])
+    
+    def busiest_hour(self):
+        hours = [(total, hour) for hour, (total, _) in self.groups["hour"].items() if hour is not None and 0 <= hour < 24]
+        return max(hours)[1] if hours else None
+    
+    def streaks(self):
+        # (current, longest) runs of consecutive days with a completed activity
+        if self._streaks is None:
+            days = []
+            for day in self.completed_days:
+                try:
+                    days.append(date.fromisoformat(day).toordinal())
+                except (TypeError, ValueError):
+                    pass
+            days.sort()
+            longest = run = 0
+            previous = None
+            for day in days:
+                run = run + 1 if previous is not None and day == previous + 1 else 1
+                longest = max(longest, run)
+                previous = day
+            today = date.today().toordinal()
+            current = run if previous is not None and previous >= today - 1 else 0
+            self._streaks = (current, longest)
+        return self._streaks
+
+activity_analytics = ActivityAnalytics()
+
+def get_activity_analytics(db):
+    if not activity_analytics.loaded:
+        activity_analytics.load(db)
+    return activity_analytics
+
+class ActivityColumns:
+    # Optional columnar snapshot of the activities table for filtering: one
+    # typed array per column so a query such as "today's incomplete Alta
+    # activities" is a few mask operations instead of a walk over row tuples.
+    # Filters run on NumPy views of the arrays when NumPy is installed and
+    # fall back to plain loops otherwise. Loaded once, patched from
+    # activity_events.
+    COLUMNS = (
+        ("ids", "q"),
+        ("day", "i"),
+        ("start", "h"),
+        ("end", "h"),
+        ("priority", "h"),
+        ("completed", "b"),
+    )
+    
+    def __init__(self, use_numpy=True):
+        self.use_numpy = use_numpy
+        self.numpy = None
+        self.loaded = False
+        self.columns = {name: array.array(typecode) for name, typecode in self.COLUMNS}
+        self.positions = {}
+        activity_events.bind(
+            on_activity_added=self._on_added,
+            on_activity_updated=self._on_updated,
+            on_activity_deleted=self._on_deleted
+        )
+    
+    def __len__(self):
+        return len(self.columns["ids"])
+    
+    def load(self, db):
+        if self.use_numpy and self.numpy is None:
+            try:
+                import numpy
+            except ImportError:
+                numpy = None
+            self.numpy = numpy
+        rows = db.get_activity_columns()
+        values = list(zip(*rows)) if rows else [()] * len(self.COLUMNS)
+        self.columns = {
+            name: array.array(typecode, column)
+            for (name, typecode), column in zip(self.COLUMNS, values)
+        }
+        self.positions = {activity_id: i for i, activity_id in enumerate(self.columns["ids"])}
+        self.loaded = True
+    
+    @staticmethod
+    def day_ordinal(day):
+        if isinstance(day, date):
+            return day.toordinal()
+        try:
+            return date.fromisoformat(day).toordinal()
+        except (TypeError, ValueError):
+            return 0
+    
+    @staticmethod
+    def minutes(value):
+        # Same rule as DatabaseManager.get_activity_columns: leading "HH:MM"
+        value = value or ""
+        if len(value) >= 5 and value[2] == ":" and value[:2].isdigit() and value[3:5].isdigit():
+            return int(value[:2]) * 60 + int(value[3:5])
+        return -1
+    
+    def row_of(self, activity):
+        return (
+            activity[0],
+            self.day_ordinal(activity[7]),
+            self.minutes(activity[5]),
+            self.minutes(activity[6]),
+            activity[4] if activity[4] is not None else -1,
+            1 if activity[8] else 0,
+        )
+    
+    def _on_added(self, dispatcher, activity):
+        if self.loaded:
+            self._store(activity)
+    
+    def _on_updated(self, dispatcher, old, new):
+        # A row missing here is stored too: it may have been archived when
+        # the snapshot was loaded and moved back to be changed
+        if not self.loaded:
+            return
+        if new[13] is not None:
+            self._remove(new[0])
+        else:
+            self._store(new)
+    
+    def _on_deleted(self, dispatcher, activity):
+        if self.loaded:
+            self._remove(activity[0])
+    
+    def _store(self, activity):
+        # Overwrites the row if it is already here, appends it otherwise
+        position = self.positions.get(activity[0])
+        if position is None:
+            self.positions[activity[0]] = len(self)
+            for (name, _), value in zip(self.COLUMNS, self.row_of(activity)):
+                self.columns[name].append(value)
+        else:
+            for (name, _), value in zip(self.COLUMNS, self.row_of(activity)):
+                self.columns[name][position] = value
+    
+    def _remove(self, activity_id):
+        position = self.positions.pop(activity_id, None)
+        if position is None:
+            return
+        # Move the last row into the hole so deletes stay O(1)
+        last = len(self) - 1
+        if position != last:
+            self.positions[self.columns["ids"][last]] = position
+            for column in self.columns.values():
+                column[position] = column[last]
+        for column in self.columns.values():
+            column.pop()
+    
+    def _criteria(self, filters):
+        criteria = []
+        for name, value in filters.items():
+            if name not in self.columns or name == "ids":
+                raise TypeError(f"unknown column {name!r}")
+            if name == "day":
+                value = tuple(map(self.day_ordinal, value)) if isinstance(value, tuple) else self.day_ordinal(value)
+            elif name == "completed" and not isinstance(value, tuple):
+                value = 1 if value else 0
+            criteria.append((self.columns[name], value))
+        return criteria
+    
+    def select(self, **filters):
+        """Return the ids of the activities matching ``filters``.
+        
+        Each keyword names a column and is either a value to match or a
+        ``(low, high)`` half-open range, e.g.
+        ``select(day=date.today(), completed=False, priority=priorities.id_of("Alta"))``
+        or ``select(start=(9 * 60, 12 * 60))``.
+        """
+        criteria = self._criteria(filters)
+        ids = self.columns["ids"]
+        numpy = self.numpy
+        if numpy is not None and len(ids):
+            mask = numpy.ones(len(ids), dtype=bool)
+            for column, value in criteria:
+                view = numpy.frombuffer(column, dtype=column.typecode)
+                if isinstance(value, tuple):
+                    mask &= (view >= value[0]) & (view < value[1])
+                else:
+                    mask &= view == value
+            return numpy.frombuffer(ids, dtype=ids.typecode)[mask].tolist()
+        positions = range(len(ids))
+        for column, value in criteria:
+            if isinstance(value, tuple):
+                low, high = value
+                positions = [i for i in positions if low <= column[i] < high]
+            else:
+                positions = [i for i in positions if column[i] == value]
+        return [ids[i] for i in positions]
+    
+    def count(self, **filters):
+        return len(self.select(**filters))
+
+activity_columns = ActivityColumns()
+
+def get_activity_columns(db):
+    if not activity_columns.loaded:
+        activity_columns.load(db)
+    return activity_columns
+
+class DateIndex:
+    # date -> activities buckets for the Schedule views. Whole months are
+    # loaded with a single range query, then kept current from
+    # activity_events, so per-day lookups and counts are O(1).
+    def __init__(self, db):
+        self.db = db
+        self.buckets = {}
+        self.months = set()
+        activity_events.bind(
+            on_activity_added=self._on_added,
+            on_activity_updated=self._on_updated,
+            on_activity_deleted=self._on_deleted
+        )
+    
+    def close(self):
+        # Stop following activity_events; the owning screen calls this when
+        # it is torn down
+        activity_events.unbind(
+            on_activity_added=self._on_added,
+            on_activity_updated=self._on_updated,
+            on_activity_deleted=self._on_deleted
+        )
+        self.clear()
+    
+    @staticmethod
+    def month_range(start, end):
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            yield year, month
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    
+    def ensure_range(self, start, end):
+        # One range query per run of consecutive months not loaded yet
+        run = []
+        for month in self.month_range(start, end):
+            if month in self.months:
+                self._load_months(run)
+                run = []
+            else:
+                run.append(month)
+        self._load_months(run)
+    
+    def _load_months(self, months):
+        if not months:
+            return
+        first_year, first_month = months[0]
+        last_year, last_month = months[-1]
+        first = date(first_year, first_month, 1)
+        last = date(last_year, last_month, calendar.monthrange(last_year, last_month)[1])
+        for activity in self.db.get_activities_between(first.isoformat(), last.isoformat()):
+            self.buckets.setdefault(activity[7], []).append(activity)
+        self.months.update(months)
+    
+    def clear(self):
+        self.buckets = {}
+        self.months = set()
+    
+    def activities_on(self, day):
+        return self.buckets.get(day.isoformat(), [])
+    
+    def count_on(self, day):
+        return len(self.buckets.get(day.isoformat(), ()))
+    
+    def _month_of(self, day):
+        try:
+            return int(day[:4]), int(day[5:7])
+        except (TypeError, ValueError):
+            return None
+    
+    def _insert(self, activity):
+        if self._month_of(activity[7]) not in self.months:
+            return
+        bucket = self.buckets.setdefault(activity[7], [])
+        keys = [a[5] or "" for a in bucket]
+        bucket.insert(bisect.bisect_right(keys, activity[5] or ""), activity)
+    
+    def _remove(self, activity):
+        bucket = self.buckets.get(activity[7])
+        if not bucket:
+            return
+        for i, existing in enumerate(bucket):
+            if existing[0] == activity[0]:
+                del bucket[i]
+                break
+        if not bucket:
+            del self.buckets[activity[7]]
+    
+    def _on_added(self, dispatcher, activity):
+        self._insert(activity)
+    
+    def _on_updated(self, dispatcher, old, new):
+        self._remove(old)
+        self._insert(new)
+    
+    def _on_deleted(self, dispatcher, activity):
+        self._remove(activity)
+
+class ScheduleTask:
+    # Something for AutoScheduler to place: `duration` minutes, `priority` a
+    # weight (higher is more urgent) and `deadline` the last date it may be
+    # on, or None. day/start are filled in by the scheduler.
+    __slots__ = ("key", "title", "duration", "priority", "deadline", "limit", "day", "start")
+    
+    def __init__(self, key, title, duration, priority, deadline=None):
+        self.key = key
+        self.title = title
+        self.duration = duration
+        self.priority = priority
+        self.deadline = deadline
+        self.limit = None
+        self.day = None
+        self.start = None
+    
+    @classmethod
+    def from_activity(cls, activity):
+        # Keeps the activity's duration (an hour if it has none). The weight
+        # is its priority's rank clamped to the seeded ones, so a priority
+        # interned later (rank 0) weighs like Baja and never above Alta
+        start = ActivityColumns.minutes(activity[5])
+        end = ActivityColumns.minutes(activity[6])
+        duration = end - start if 0 <= start < end else 60
+        top = max(rank for _, _, _, rank in priorities.seeds)
+        weight = min(max(priorities.rank(activity[4]), 1), top)
+        return cls(activity[0], activity[1], duration, weight)
+
+class AutoScheduler:
+    # Packs tasks into the free time left by fixed blocks over `days` days
+    # from first_day, within SCHEDULE_DAY_START-SCHEDULE_DAY_END on a
+    # 15-minute grid. Free time is a sorted list of (start, end) minutes per
+    # day. The greedy pass places tasks earliest deadline first (higher
+    # priority, then longer, on ties) into the earliest slot that fits.
+    # A bounded local search then repeats three moves until none helps:
+    # evict a lower-priority task to make room for an unscheduled one, swap
+    # a higher-priority task into an earlier lower-priority slot, and pull
+    # tasks into gaps the other moves opened. The cost is priority-weighted
+    # start time plus a penalty per unscheduled task larger than any start.
+    # Every order is fully keyed, so results are deterministic unless
+    # time_limit cuts the search short.
+    step = 15
+    candidates = 16
+    max_rounds = 4
+    
+    def __init__(self, first_day, days=None, day_start=None, day_end=None, earliest=None):
+        self.first_day = first_day
+        self.days = days or SCHEDULE_HORIZON_DAYS
+        self.day_start = SCHEDULE_DAY_START if day_start is None else day_start
+        self.day_end = SCHEDULE_DAY_END if day_end is None else day_end
+        self.free = [[(self.day_start, self.day_end)] for _ in range(self.days)]
+        if earliest is not None:
+            # Nothing before `earliest` (minutes) on the first day, e.g. now
+            self._take(0, self.day_start, min(max(self._round_up(earliest), self.day_start), self.day_end))
+        self.tasks = []
+    
+    @classmethod
+    def for_database(cls, db, first_day, days=None, exclude=(), earliest=None):
+        # Free time around every live activity in the range, except the
+        # ids in `exclude` (the ones being rescheduled)
+        scheduler = cls(first_day, days, earliest=earliest)
+        last_day = first_day + timedelta(days=scheduler.days - 1)
+        exclude = set(exclude)
+        for activity in db.get_activities_between(first_day.isoformat(), last_day.isoformat()):
+            if activity[0] not in exclude:
+                scheduler.block(date.fromisoformat(activity[7]),
+                                ActivityColumns.minutes(activity[5]), ActivityColumns.minutes(activity[6]))
+        return scheduler
+    
+    def block(self, day, start, end):
+        # Mark day (a date) start-end (minutes) as taken by a fixed activity
+        index = (day - self.first_day).days
+        if 0 <= index < self.days and start >= 0 and end > start:
+            self._take(index, max(start, self.day_start), min(end, self.day_end))
+    
+    def _round_up(self, minute):
+        return -(-minute // self.step) * self.step
+    
+    def _take(self, day, start, end):
+        # Remove [start, end) from the free intervals of `day`
+        if start >= end:
+            return
+        free = self.free[day]
+        i = bisect.bisect_right(free, (start, float("inf"))) - 1
+        i = max(i, 0)
+        pieces = []
+        while i < len(free) and free[i][0] < end:
+            low, high = free[i]
+            if high > start:
+                del free[i]
+                if low < start:
+                    pieces.append((low, start))
+                if high > end:
+                    pieces.append((end, high))
+                continue
+            i += 1
+        for piece in pieces:
+            bisect.insort(free, piece)
+    
+    def _release(self, day, start, end):
+        # Give [start, end) back to `day`, merging with its neighbours
+        free = self.free[day]
+        i = bisect.bisect_left(free, (start, end))
+        if i > 0 and free[i - 1][1] == start:
+            i -= 1
+            start = free.pop(i)[0]
+        if i < len(free) and free[i][0] == end:
+            end = free.pop(i)[1]
+        free.insert(i, (start, end))
+    
+    def _fit(self, task):
+        # Earliest (day, start) with room for the task by its deadline
+        for day in range(task.limit + 1):
+            for low, high in self.free[day]:
+                start = self._round_up(low)
+                if start + task.duration <= high:
+                    return day, start
+        return None
+    
+    def _fits_at(self, day, start, duration):
+        free = self.free[day]
+        i = bisect.bisect_right(free, (start, float("inf"))) - 1
+        return i >= 0 and free[i][0] <= start and start + duration <= free[i][1]
+    
+    def _place(self, task, position):
+        task.day, task.start = position
+        self._take(task.day, task.start, task.start + task.duration)
+    
+    def _unplace(self, task):
+        self._release(task.day, task.start, task.start + task.duration)
+        position = task.day, task.start
+        task.day = task.start = None
+        return position
+    
+    def offset(self, task):
+        return task.day * 24 * 60 + task.start
+    
+    def cost(self):
+        penalty = self.days * 24 * 60
+        return sum(
+            task.priority * (self.offset(task) if task.day is not None else penalty)
+            for task in self.tasks
+        )
+    
+    def schedule(self, tasks, local_search=True, time_limit=0.5):
+        # Returns (placed, unscheduled); placed tasks have day (index from
+        # first_day) and start (minutes) set
+        for task in tasks:
+            if task.deadline is None:
+                task.limit = self.days - 1
+            else:
+                task.limit = min((task.deadline - self.first_day).days, self.days - 1)
+            task.day = task.start = None
+        self.tasks = sorted(
+            tasks, key=lambda t: (t.limit, -t.priority, -t.duration, str(t.key))
+        )
+        for task in self.tasks:
+            if task.limit >= 0 and task.duration <= self.day_end - self.day_start:
+                position = self._fit(task)
+                if position is not None:
+                    self._place(task, position)
+        if local_search:
+            stop = time.perf_counter() + time_limit
+            for _ in range(self.max_rounds):
+                improved = self._evict_for_unscheduled()
+                improved = self._swap_earlier(stop) or improved
+                improved = self._pull_earlier() or improved
+                if not improved or time.perf_counter() > stop:
+                    break
+        placed = sorted((t for t in self.tasks if t.day is not None), key=self.offset)
+        return placed, [t for t in self.tasks if t.day is None]
+    
+    def _evict_for_unscheduled(self):
+        improved = False
+        pending = sorted((t for t in self.tasks if t.day is None and t.limit >= 0),
+                         key=lambda t: (-t.priority, t.limit))
+        for task in pending:
+            # Latest lower-priority tasks first: cheapest to push back
+            victims = sorted(
+                (t for t in self.tasks if t.day is not None and t.priority < task.priority and t.day <= task.limit),
+                key=lambda t: (t.priority, -self.offset(t))
+            )[:self.candidates]
+            for victim in victims:
+                old = self._unplace(victim)
+                position = self._fit(task)
+                if position is None:
+                    self._place(victim, old)
+                    continue
+                self._place(task, position)
+                position = self._fit(victim)
+                if position is not None:
+                    self._place(victim, position)
+                improved = True
+                break
+        return improved
+    
+    def _swap_earlier(self, stop):
+        improved = False
+        placed = sorted((t for t in self.tasks if t.day is not None), key=lambda t: (-t.priority, self.offset(t)))
+        for high in placed:
+            if time.perf_counter() > stop:
+                break
+            if high.day is None:
+                continue
+            lows = sorted(
+                (t for t in self.tasks if t.day is not None and t.priority < high.priority
+                 and self.offset(t) < self.offset(high) and t.day <= high.limit),
+                key=self.offset
+            )[:self.candidates]
+            for low in lows:
+                if self._try_swap(high, low):
+                    improved = True
+                    break
+        return improved
+    
+    def _try_swap(self, high, low):
+        before = high.priority * self.offset(high) + low.priority * self.offset(low)
+        high_old = self._unplace(high)
+        low_old = self._unplace(low)
+        if self._fits_at(low_old[0], low_old[1], high.duration):
+            self._place(high, low_old)
+            if high_old[0] <= low.limit and self._fits_at(high_old[0], high_old[1], low.duration):
+                position = high_old
+            else:
+                position = self._fit(low)
+            if position is not None:
+                self._place(low, position)
+                if high.priority * self.offset(high) + low.priority * self.offset(low) < before:
+                    return True
+                self._unplace(low)
+            self._unplace(high)
+        self._place(high, high_old)
+        self._place(low, low_old)
+        return False
+    
+    def _pull_earlier(self):
+        improved = False
+        for task in sorted((t for t in self.tasks if t.day is not None), key=lambda t: (-t.priority, self.offset(t))):
+            old = self._unplace(task)
+            position = self._fit(task)
+            self._place(task, position)
+            improved = improved or position < old
+        return improved
+    
+    def as_changes(self, placed):
+        # (key, date, start, end) tuples in reschedule_activities' shape
+        return [
+            (task.key, (self.first_day + timedelta(days=task.day)).isoformat(),
+             f"{task.start // 60:02d}:{task.start % 60:02d}",
+             f"{(task.start + task.duration) // 60:02d}:{(task.start + task.duration) % 60:02d}")
+            for task in placed
+        ]
+
+class LoadScheduler:
+    # Runs screen loads as generators, a slice per frame. Work for the visible
+    # screen goes first; hidden screens only get frames with nothing else to
+    # do. A slice stops once frame_budget is spent so no frame runs long.
+    frame_budget = 0.012
+    
+    def __init__(self):
+        self.tasks = {}
+        self.reloads = {}
+        self.stale = set()
+        self.visible = None
+        self._trigger = Clock.create_trigger(self._run)
+    
+    def schedule(self, key, task, first=0, reload=None):
+        # A newer load for the same screen replaces the one in flight. The
+        # first steps run right away, so a list shows its first screenful
+        # in this frame. Loads given a reload callback are dropped when
+        # their screen is hidden and run again when it is shown.
+        self.tasks.pop(key, None)
+        self.stale.discard(key)
+        if reload is not None:
+            self.reloads[key] = reload
+        try:
+            for _ in itertools.islice(task, first):
+                pass
+        except sqlite3.Error:
+            Logger.exception(f"LoadScheduler: loading {key} failed")
+            return
+        self.tasks[key] = task
+        self._trigger()
+    
+    def cancel(self, key):
+        self.tasks.pop(key, None)
+        self.stale.discard(key)
+    
+    def flush(self):
+        # Run every pending load to completion, ignoring the frame budget
+        while self.tasks:
+            key = self._next_key()
+            task = self.tasks.pop(key)
+            for _ in task:
+                pass
+    
+    def set_visible(self, key):
+        previous, self.visible = self.visible, key
+        if previous is not key and previous in self.reloads and previous in self.tasks:
+            del self.tasks[previous]
+            self.stale.add(previous)
+        if key in self.stale:
+            self.stale.discard(key)
+            self.reloads[key]()
+        if self.tasks:
+            self._trigger()
+    
+    def _next_key(self):
+        if self.visible in self.tasks:
+            return self.visible
+        return next(iter(self.tasks))
+    
+    def _drop(self, key, task):
+        if self.tasks.get(key) is task:
+            del self.tasks[key]
+    
+    def _run(self, dt):
+        deadline = time.perf_counter() + self.frame_budget
+        while self.tasks and time.perf_counter() < deadline:
+            key = self._next_key()
+            task = self.tasks[key]
+            try:
+                while time.perf_counter() < deadline:
+                    next(task)
+            except StopIteration:
+                self._drop(key, task)
+            except sqlite3.Error:
+                # A database that stays locked past the retries, or a disk
+                # error, only ends this load
+                Logger.exception(f"LoadScheduler: loading {key} failed")
+                self._drop(key, task)
+            except Exception:
+                # Anything else is a bug: drop the load, keep the others
+                # going and let the error reach Kivy's handler (and tests)
+                self._drop(key, task)
+                if self.tasks:
+                    self._trigger()
+                raise
+            if key != self.visible:
+                # Idle work gets at most one slice per frame
+                break
+        if self.tasks:
+            self._trigger()
+
+load_scheduler = LoadScheduler()
+
+class MaintenanceJob:
+    # Every interval, hands load_scheduler a generator that purges
+    # soft-deleted activities and then archives old completed ones, one
+    # batch per step. It is never the visible task, so it only runs on idle
+    # frames, at most a slice per frame. An idle frame is not an idle user:
+    # every batch first checks that no touch or key came in the last
+    # idle_after seconds, and otherwise stops and tries again later.
+    def __init__(self, db, interval=PURGE_INTERVAL, batch_size=PURGE_BATCH, idle_after=IDLE_AFTER):
+        self.db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        self.idle_after = idle_after
+        self.last_input = time.monotonic()
+        self._event = None
+        self._retry = Clock.create_trigger(self.run, idle_after)
+    
+    def start(self):
+        if self._event is None:
+            Window.bind(on_touch_down=self.on_user_input, on_key_down=self.on_user_input)
+            self._event = Clock.schedule_interval(self.run, self.interval)
+    
+    def stop(self):
+        if self._event is not None:
+            Window.unbind(on_touch_down=self.on_user_input, on_key_down=self.on_user_input)
+            self._event.cancel()
+            self._event = None
+        self._retry.cancel()
+        load_scheduler.cancel(self)
+    
+    def on_user_input(self, *args):
+        # Not returning True: the touch or key carries on to the widgets
+        self.last_input = time.monotonic()
+    
+    def user_idle(self):
+        return time.monotonic() - self.last_input >= self.idle_after
+    
+    def run(self, dt=None):
+        load_scheduler.schedule(self, self.maintain())
+    
+    def maintain(self):
+        for step in (self.db.purge_deleted, self.db.archive_activities):
+            while True:
+                if not self.user_idle():
+                    self._retry()
+                    return
+                if not step(self.batch_size):
+                    break
+                yield
+
+class ActivityItemCard(MDCard):
+    # Dashboard row: checkbox, title/details and delete button
+    def __init__(self, **kwargs):
+        super().__init__(
+            elevation=2,
+            radius=[5],
+            size_hint_y=None,
+            height=dp(80),
+            **kwargs
+        )
+        self.owner = None
+        self.activity_id = None
+        self._updating = False
+        
+        item_layout = MDBoxLayout(
+            orientation="horizontal",
+            spacing=dp(10),
+            size_hint_y=None,
+            height=dp(70),
+            padding=[dp(10), dp(5)]
+        )
+        
+        # Checkbox
+        self.checkbox = MDCheckbox(
+            size_hint=(None, None),
+            size=(dp(30), dp(30))
+        )
+        self.checkbox.bind(active=self.on_checkbox_active)
+        
+        # Activity info
+        info_layout = MDBoxLayout(
+            orientation="vertical",
+            spacing=dp(2)
+        )
+        
+        self.title_label = MDLabel(
+            theme_text_color="Primary",
+            font_style="Subtitle1",
+            size_hint_y=None,
+            height=dp(25)
+        )
+        
+        self.details_label = MDLabel(
+            theme_text_color="Secondary",
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(20)
+        )
+        
+        info_layout.add_widget(self.title_label)
+        info_layout.add_widget(self.details_label)
+        
+        # Delete button
+        delete_btn = MDIconButton(
+            icon="delete",
+            theme_icon_color="Custom",
+            icon_color="#F44336",
+            on_release=self.on_delete
+        )
+        
+        item_layout.add_widget(self.checkbox)
+        item_layout.add_widget(info_layout)
+        item_layout.add_widget(delete_btn)
+        self.add_widget(item_layout)
+    
+    def set_activity(self, activity, owner):
+        self.owner = owner
+        self.activity_id = activity[0]
+        self._updating = True
+        self.checkbox.active = bool(activity[8])  # completed status
+        self._updating = False
+        self.title_label.text = activity[1]  # title
+        self.details_label.text = f"{activity[5]} - {activity[6]} | {categories.name(activity[3])}"  # time range and category
+        self.md_bg_color = "white" if not activity[8] else "#E8F5E8"
+    
+    def on_checkbox_active(self, checkbox, active):
+        if not self._updating and self.owner is not None:
+            self.owner.toggle_activity(self.activity_id, active)
+    
+    def on_delete(self, instance):
+        if self.owner is not None:
+            self.owner.delete_activity(self.activity_id)
+
+class ActivityDetailCard(MDCard):
+    # Activities screen card: title, status, optional description and details
+    def __init__(self, **kwargs):
+        super().__init__(
+            elevation=3,
+            radius=[10],
+            size_hint_y=None,
+            height=dp(120),
+            **kwargs
+        )
+        self.card_layout = MDBoxLayout(
+            orientation="vertical",
+            spacing=dp(10),
+            padding=dp(15)
+        )
+        
+        # Title and status
+        title_layout = MDBoxLayout(
+            orientation="horizontal",
+            spacing=dp(10),
+            size_hint_y=None,
+            height=dp(30)
+        )
+        
+        self.title_label = MDLabel(
+            theme_text_color="Primary",
+            font_style="H6"
+        )
+        
+        self.status_label = MDLabel(
+            theme_text_color="Custom",
+            font_style="Caption",
+            size_hint_x=None,
+            width=dp(100)
+        )
+        
+        title_layout.add_widget(self.title_label)
+        title_layout.add_widget(self.status_label)
+        
+        # Description, only attached when the activity has one
+        self.desc_label = MDLabel(
+            theme_text_color="Secondary",
+            font_style="Body2",
+            size_hint_y=None,
+            height=dp(40)
+        )
+        
+        # Details
+        self.details_label = MDLabel(
+            theme_text_color="Secondary",
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(25)
+        )
+        
+        self.card_layout.add_widget(title_layout)
+        self.card_layout.add_widget(self.details_label)
+        self.add_widget(self.card_layout)
+    
+    def set_activity(self, activity, owner):
+        self.title_label.text = activity[1]
+        self.status_label.text = "Completada" if activity[8] else "Pendiente"
+        self.status_label.text_color = "#4CAF50" if activity[8] else "#FF9800"
+        
+        if activity[2]:  # description exists
+            self.desc_label.text = activity[2]
+            if self.desc_label.parent is None:
+                self.card_layout.add_widget(self.desc_label, index=len(self.card_layout.children))
+        elif self.desc_label.parent is not None:
+            self.card_layout.remove_widget(self.desc_label)
+        
+        self.details_label.text = (
+            f"📅 {activity[7]} | ⏰ {activity[5]} - {activity[6]} | "
+            f"📂 {categories.name(activity[3])} | 🔥 {priorities.name(activity[4])}"
+        )
+        self.line_color = priorities.color(activity[4])
+        self.md_bg_color = "#E8F5E8" if activity[8] else "white"
+
+class DayCard(MDCard):
+    # Schedule screen card for one day with a preview of its first activities
+    max_preview = 3
+    
+    def __init__(self, **kwargs):
+        super().__init__(
+            elevation=2,
+            radius=[10],
+            size_hint_y=None,
+            height=dp(150),
+            md_bg_color="white",
+            **kwargs
+        )
+        self.day_layout = MDBoxLayout(
+            orientation="vertical",
+            padding=dp(15),
+            spacing=dp(5)
+        )
+        
+        # Day header
+        day_header = MDBoxLayout(
+            orientation="horizontal",
+            size_hint_y=None,
+            height=dp(30)
+        )
+        
+        self.day_title = MDLabel(
+            theme_text_color="Primary",
+            font_style="Subtitle1"
+        )
+        
+        self.activity_count = MDLabel(
+            theme_text_color="Secondary",
+            font_style="Caption",
+            size_hint_x=None,
+            width=dp(100),
+            halign="right"
+        )
+        
+        day_header.add_widget(self.day_title)
+        day_header.add_widget(self.activity_count)
+        self.day_layout.add_widget(day_header)
+        
+        # Preview rows are built once and attached as needed
+        self.activity_labels = [
+            MDLabel(
+                font_style="Caption",
+                size_hint_y=None,
+                height=dp(20)
+            )
+            for _ in range(self.max_preview)
+        ]
+        
+        self.more_label = MDLabel(
+            theme_text_color="Secondary",
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(20)
+        )
+        
+        self.empty_label = MDLabel(
+            text="No hay actividades programadas",
+            theme_text_color="Hint",
+            font_style="Caption",
+            italic=True,
+            size_hint_y=None,
+            height=dp(20)
+        )
+        
+        self.add_widget(self.day_layout)
+    
+    def set_day(self, day_name, day_date, day_activities):
+        self.day_title.text = f"{day_name} ({day_date.strftime('%d/%m')})"
+        self.activity_count.text = f"{len(day_activities)} actividades"
+        
+        # Drop the previous preview rows, keep the header
+        for row in self.day_layout.children[:-1]:
+            self.day_layout.remove_widget(row)
+        
+        # Activities preview
+        if day_activities:
+            for activity, activity_label in zip(day_activities, self.activity_labels):
+                activity_text = f"• {activity[5]} - {activity[1]}"
+                if activity[8]:  # completed
+                    activity_text += " ✓"
+                    activity_label.theme_text_color = "Custom"
+                    activity_label.text_color = "#4CAF50"
+                else:
+                    activity_label.theme_text_color = "Secondary"
+                activity_label.text = activity_text
+                self.day_layout.add_widget(activity_label)
+            
+            if len(day_activities) > self.max_preview:
+                self.more_label.text = f"... y {len(day_activities) - self.max_preview} más"
+                self.day_layout.add_widget(self.more_label)
+        else:
+            self.day_layout.add_widget(self.empty_label)
+
+class MonthDayCell(ButtonBehavior, MDBoxLayout):
+    # One day in the month grid, shaded by how many activities it has
+    def __init__(self, **kwargs):
+        super().__init__(
+            orientation="vertical",
+            size_hint_y=None,
+            height=dp(56),
+            padding=dp(4),
+            radius=[6],
+            **kwargs
+        )
+        self.owner = None
+        self.day = None
+        self.day_label = MDLabel(
+            theme_text_color="Primary",
+            font_style="Subtitle2",
+            halign="center"
+        )
+        self.count_label = MDLabel(
+            theme_text_color="Secondary",
+            font_style="Caption",
+            halign="center"
+        )
+        self.add_widget(self.day_label)
+        self.add_widget(self.count_label)
+    
+    def set_day(self, day, count, max_count, in_month, owner):
+        self.owner = owner
+        self.day = day
+        self.day_label.text = str(day.day)
+        self.day_label.theme_text_color = "Primary" if in_month else "Hint"
+        self.count_label.text = str(count) if count else ""
+        if count:
+            ratio = count / max_count if max_count else 0
+            self.md_bg_color = (0.13, 0.59, 0.95, 0.15 + 0.6 * ratio)
+        else:
+            self.md_bg_color = (1, 1, 1, 1) if in_month else (0.96, 0.96, 0.96, 1)
+    
+    def on_release(self):
+        if self.owner is not None:
+            self.owner.show_week_of(self.day)
+
+class AgendaDayCard(MDCard):
+    # Agenda view: one day and every activity on it
+    row_height = dp(22)
+    
+    def __init__(self, **kwargs):
+        super().__init__(
+            elevation=1,
+            radius=[10],
+            size_hint_y=None,
+            md_bg_color="white",
+            **kwargs
+        )
+        self.day_layout = MDBoxLayout(
+            orientation="vertical",
+            padding=dp(12),
+            spacing=dp(2)
+        )
+        self.day_title = MDLabel(
+            theme_text_color="Primary",
+            font_style="Subtitle1",
+            size_hint_y=None,
+            height=dp(28)
+        )
+        self.day_layout.add_widget(self.day_title)
+        self.rows = []
+        self.add_widget(self.day_layout)
+    
+    def set_day(self, day_name, day_date, day_activities):
+        self.day_title.text = f"{day_name} {day_date.strftime('%d/%m/%Y')}"
+        
+        # Grow the row labels as needed and keep them for later days
+        while len(self.rows) < len(day_activities):
+            self.rows.append(MDLabel(
+                font_style="Caption",
+                size_hint_y=None,
+                height=self.row_height
+            ))
+        for row in self.day_layout.children[:-1]:
+            self.day_layout.remove_widget(row)
+        
+        for activity, row in zip(day_activities, self.rows):
+            text = f"{activity[5]} - {activity[6]}  {activity[1]}"
+            if activity[8]:
+                text += " ✓"
+                row.theme_text_color = "Custom"
+                row.text_color = "#4CAF50"
+            else:
+                row.theme_text_color = "Secondary"
+            row.text = text
+            self.day_layout.add_widget(row)
+        self.height = dp(52) + len(day_activities) * (self.row_height + dp(2))
+
+class TimeGrid(zenith_core.TimeGrid):
+    # Week or day grid over activity rows; on_reschedule gets
+    # (activity_id, date, start_time, end_time) per dropped block, ready for
+    # DatabaseManager.reschedule_activities
+    def __init__(self, **kwargs):
+        self._colors = {}
+        super().__init__(**kwargs)
+    
+    def activity_times(self, activity):
+        return ActivityColumns.minutes(activity[5]), ActivityColumns.minutes(activity[6])
+    
+    def activity_title(self, activity):
+        return activity[1]
+    
+    def activity_color(self, activity):
+        # One shared Color per priority/completed combination
+        key = (activity[4], bool(activity[8]))
+        color = self._colors.get(key)
+        if color is None:
+            from kivy.utils import get_color_from_hex
+            rgba = get_color_from_hex(priorities.color(activity[4], "#2196F3"))
+            color = self._colors[key] = Color(*rgba[:3], 0.45 if activity[8] else 0.85)
+        return color
+    
+    def reschedule_change(self, block):
+        return block.activity[0], self.days[block.day].isoformat(), self.clock(block.start), self.clock(block.end)
 
 class DashboardScreen(MDScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = "dashboard"
         self.db = DatabaseManager()
+        self.card_pool = WidgetPool()
+        self.snackbar = None
+        self.undo_id = None
         self.build_ui()
     
     def build_ui(self):
@@ -125,6 +2266,12 @@ class DashboardScreen(MDScreen):
         stats_layout = MDGridLayout(cols=2, spacing=dp(15), size_hint_y=None, height=dp(120))
         
         # Today's tasks card
+        self.today_count_label = MDLabel(
+            text="0",
+            theme_text_color="Primary",
+            font_style="H3",
+            halign="center"
+        )
         today_card = MDCard(
             MDBoxLayout(
                 MDLabel(
@@ -133,13 +2280,7 @@ class DashboardScreen(MDScreen):
                     font_style="H6",
                     halign="center"
                 ),
-                MDLabel(
-                    text="0",
-                    theme_text_color="Primary",
-                    font_style="H3",
-                    halign="center",
-                    id="today_tasks_count"
-                ),
+                self.today_count_label,
                 orientation="vertical",
                 padding=dp(15),
                 spacing=dp(5)
@@ -150,6 +2291,12 @@ class DashboardScreen(MDScreen):
         )
         
         # Completed tasks card
+        self.completed_count_label = MDLabel(
+            text="0",
+            theme_text_color="Primary",
+            font_style="H3",
+            halign="center"
+        )
         completed_card = MDCard(
             MDBoxLayout(
                 MDLabel(
@@ -158,13 +2305,7 @@ class DashboardScreen(MDScreen):
                     font_style="H6",
                     halign="center"
                 ),
-                MDLabel(
-                    text="0",
-                    theme_text_color="Primary",
-                    font_style="H3",
-                    halign="center",
-                    id="completed_tasks_count"
-                ),
+                self.completed_count_label,
                 orientation="vertical",
                 padding=dp(15),
                 spacing=dp(5)
@@ -178,6 +2319,12 @@ class DashboardScreen(MDScreen):
         stats_layout.add_widget(completed_card)
         main_layout.add_widget(stats_layout)
         
+        # Keep the counters live instead of recomputing them in load_data
+        stats = get_activity_stats(self.db)
+        stats.bind(today_total=self.update_today_total, today_completed=self.update_today_completed)
+        self.update_today_total(stats, stats.today_total)
+        self.update_today_completed(stats, stats.today_completed)
+        
         # Today's activities section
         activities_label = MDLabel(
             text="Actividades de Hoy",
@@ -207,107 +2354,337 @@ class DashboardScreen(MDScreen):
         main_layout.add_widget(add_btn)
         
         self.add_widget(main_layout)
-        Clock.schedule_once(self.load_data, 0.5)
+        self.load_data()
+    
+    def load_data(self, dt=None):
+        load_scheduler.schedule(self, self.populate_activities())
+    
+    def populate_activities(self):
+        today = datetime.now().strftime("%Y-%m-%d")
+        activities = self.db.get_activities(today)
+        
+        self.card_pool.release_all(self.activities_list)
+        for activity in activities:
+            self.add_activity_item(activity)
+            yield
+    
+    def update_today_total(self, stats, value):
+        self.today_count_label.text = str(value)
+    
+    def update_today_completed(self, stats, value):
+        self.completed_count_label.text = str(value)
+    
+    def add_activity_item(self, activity):
+        card = self.card_pool.acquire(ActivityItemCard)
+        card.set_activity(activity, self)
+        self.activities_list.add_widget(card)
+    
+    def toggle_activity(self, activity_id, completed):
+        self.db.update_activity_status(activity_id, 1 if completed else 0)
+        self.load_data()
+    
+    def delete_activity(self, activity_id):
+        self.db.delete_activity(activity_id)
+        self.load_data()
+        self.show_undo(activity_id)
+    
+    def show_undo(self, activity_id):
+        # One snackbar for the screen's lifetime. The button reads the id
+        # from undo_id, so no per-delete closure keeps an old snackbar (and
+        # the screen) alive. A delete while it is showing retargets it.
+        from kivymd.uix.snackbar import MDSnackbar, MDSnackbarActionButton
+        self.undo_id = activity_id
+        if self.snackbar is None:
+            self.snackbar = MDSnackbar(
+                MDLabel(
+                    text="Actividad eliminada",
+                    theme_text_color="Custom",
+                    text_color="white"
+                ),
+                MDSnackbarActionButton(
+                    text="Deshacer",
+                    theme_text_color="Custom",
+                    text_color="#FFEB3B",
+                    on_release=self.undo_delete
+                ),
+                y=dp(80),
+                pos_hint={"center_x": 0.5},
+                size_hint_x=0.9,
+                duration=UNDO_DURATION
+            )
+        if self.snackbar.parent is None:
+            self.snackbar.open()
+    
+    def undo_delete(self, instance=None):
+        self.snackbar.dismiss()
+        if self.undo_id is not None:
+            self.db.restore_activity(self.undo_id)
+            self.undo_id = None
+            self.load_data()
+    
+    def show_add_activity_dialog(self, instance):
+        # Switch to activities tab
+        MDApp.get_running_app().root.switch_tab("activities")
+
+# Messages under each form field; parsing itself is zenith_core's
+ACTIVITY_INPUT_ERRORS = {
+    "title": "Campo requerido",
+    "date": "Fecha inválida",
+    "start_time": "Hora inválida",
+    "end_time": "Hora inválida",
+    "order": "Debe ser posterior al inicio",
+}
+
+def ranked_priorities():
+    # Priority rows a form may pick, most urgent last; names interned by
+    # sync (rank 0) stay readable but cannot be typed in. Seeds stand in
+    # until a database has been opened.
+    rows = [row for row in (priorities.rows.values() or priorities.seeds) if row[3] > 0]
+    return sorted(rows, key=lambda row: row[3])
+
+def parse_priority(text):
+    # "alta", " MEDIA " -> "Alta", "Media"; empty picks "Media". Not
+    # memoized: the priorities table can change under it.
+    text = text.strip().lower()
+    if not text:
+        return "Media"
+    for row in ranked_priorities():
+        if row[1].lower() == text:
+            return row[1]
+    return None
+
+def validate_activity_input(title, day, start_time, end_time, priority="Media"):
+    # Returns (values, errors): canonical text per field, and a Spanish
+    # message per field that cannot be saved
+    values, errors = check_activity_input(title, day, start_time, end_time, ACTIVITY_INPUT_ERRORS)
+    values["priority"] = parse_priority(priority)
+    if values["priority"] is None:
+        errors["priority"] = "Prioridad desconocida (" + ", ".join(row[1] for row in ranked_priorities()) + ")"
+    return values, errors
+
+class FormFactory:
+    # Hands out a cached form instance. warm() builds it on an idle frame so
+    # the first open does not pay for constructing the dialog.
+    def __init__(self, form_class, *args):
+        self.form_class = form_class
+        self.args = args
+        self.form = None
     
-    def load_data(self, dt):
-        today = datetime.now().strftime("%Y-%m-%d")
-        activities = self.db.get_activities(today)
-        
-        self.activities_list.clear_widgets()
-        today_count = len(activities)
-        completed_count = len([a for a in activities if a[8] == 1])  # completed column
-        
-        # Update stats
-        today_label = self.ids.get("today_tasks_count")
-        completed_label = self.ids.get("completed_tasks_count")
-        
-        for activity in activities:
-            self.add_activity_item(activity)
+    def warm(self):
+        if self.form is None:
+            load_scheduler.schedule(self, self._build())
     
-    def add_activity_item(self, activity):
-        item_layout = MDBoxLayout(
-            orientation="horizontal",
-            spacing=dp(10),
+    def _build(self):
+        yield
+        if self.form is None:
+            self.form = self.form_class(*self.args)
+    
+    def get(self):
+        load_scheduler.cancel(self)
+        if self.form is None:
+            self.form = self.form_class(*self.args)
+        return self.form
+
+class ActivityFormDialog:
+    # "Nueva Actividad" dialog. Fields are reset on every open; checks run on
+    # a trigger after typing stops so the text fields never wait on them.
+    # parse_time and parse_date are memoized, so a pass only really parses
+    # the field that changed. Leaving a field rewrites it in canonical form.
+    defaults = {
+        "category": "Trabajo",
+        "priority": "Media",
+        "start_time": "09:00",
+        "end_time": "10:00",
+    }
+    
+    def __init__(self, on_save):
+        from kivymd.uix.button import MDFlatButton
+        from kivymd.uix.dialog import MDDialog
+        from kivymd.uix.textfield import MDTextField
+        
+        content = MDBoxLayout(
+            orientation="vertical",
+            spacing=dp(15),
             size_hint_y=None,
-            height=dp(70),
-            padding=[dp(10), dp(5)]
+            height=dp(400),
+            padding=dp(20)
         )
         
-        # Checkbox
-        checkbox = MDCheckbox(
-            size_hint=(None, None),
-            size=(dp(30), dp(30)),
-            active=bool(activity[8]),  # completed status
-            on_active=lambda x, active, aid=activity[0]: self.toggle_activity(aid, active)
+        self.title_field = MDTextField(
+            hint_text="Título de la actividad",
+            required=True,
+            helper_text="Campo requerido",
+            helper_text_mode="on_error"
         )
         
-        # Activity info
-        info_layout = MDBoxLayout(
-            orientation="vertical",
-            spacing=dp(2)
+        self.desc_field = MDTextField(
+            hint_text="Descripción (opcional)",
+            multiline=True,
+            max_text_length=200
         )
         
-        title_label = MDLabel(
-            text=activity[1],  # title
-            theme_text_color="Primary",
-            font_style="Subtitle1",
-            size_hint_y=None,
-            height=dp(25)
+        self.category_field = MDTextField(
+            hint_text="Categoría"
         )
         
-        details_text = f"{activity[5]} - {activity[6]} | {activity[3]}"  # time range and category
-        details_label = MDLabel(
-            text=details_text,
-            theme_text_color="Secondary",
-            font_style="Caption",
-            size_hint_y=None,
-            height=dp(20)
+        self.priority_field = MDTextField(
+            hint_text="Prioridad",
+            helper_text="Prioridad desconocida",
+            helper_text_mode="on_error"
         )
         
-        info_layout.add_widget(title_label)
-        info_layout.add_widget(details_label)
-        
-        # Delete button
-        delete_btn = MDIconButton(
-            icon="delete",
-            theme_icon_color="Custom",
-            icon_color="#F44336",
-            on_release=lambda x, aid=activity[0]: self.delete_activity(aid)
+        self.date_field = MDTextField(
+            hint_text="Fecha (YYYY-MM-DD)",
+            helper_text="Fecha inválida",
+            helper_text_mode="on_error"
         )
         
-        item_layout.add_widget(checkbox)
-        item_layout.add_widget(info_layout)
-        item_layout.add_widget(delete_btn)
+        self.start_time_field = MDTextField(
+            hint_text="Hora inicio (HH:MM)",
+            helper_text="Hora inválida",
+            helper_text_mode="on_error"
+        )
         
-        card = MDCard(
-            item_layout,
-            elevation=2,
-            radius=[5],
-            size_hint_y=None,
-            height=dp(80),
-            md_bg_color="white" if not activity[8] else "#E8F5E8"
+        self.end_time_field = MDTextField(
+            hint_text="Hora fin (HH:MM)",
+            helper_text="Hora inválida",
+            helper_text_mode="on_error"
         )
         
-        self.activities_list.add_widget(card)
+        self.fields = [
+            self.title_field,
+            self.desc_field,
+            self.category_field,
+            self.priority_field,
+            self.date_field,
+            self.start_time_field,
+            self.end_time_field,
+        ]
+        for field in self.fields:
+            content.add_widget(field)
+        
+        self._validate_trigger = Clock.create_trigger(self.validate, 0.15)
+        for field in self.validated_fields().values():
+            field.bind(text=self.on_field_text)
+        for key in ("priority", "date", "start_time", "end_time"):
+            self.validated_fields()[key].bind(focus=functools.partial(self.on_field_focus, key))
+        
+        self.dialog = MDDialog(
+            title="Nueva Actividad",
+            type="custom",
+            content_cls=content,
+            buttons=[
+                MDFlatButton(
+                    text="CANCELAR",
+                    theme_text_color="Custom",
+                    text_color="#2196F3",
+                    on_release=self.dismiss
+                ),
+                MDRaisedButton(
+                    text="GUARDAR",
+                    md_bg_color="#4CAF50",
+                    theme_text_color="Custom",
+                    text_color="white",
+                    on_release=on_save
+                ),
+            ]
+        )
+        self.errors = {}
+        self.parsed = {}
+        self.reset()
     
-    def toggle_activity(self, activity_id, completed):
-        self.db.update_activity_status(activity_id, 1 if completed else 0)
-        self.load_data(None)
+    def reset(self):
+        self.title_field.text = ""
+        self.desc_field.text = ""
+        self.category_field.text = self.defaults["category"]
+        self.priority_field.text = self.defaults["priority"]
+        self.date_field.text = datetime.now().strftime("%Y-%m-%d")
+        self.start_time_field.text = self.defaults["start_time"]
+        self.end_time_field.text = self.defaults["end_time"]
+        self._validate_trigger.cancel()
+        self.errors = {}
+        for field in self.fields:
+            field.error = False
+        self._dirty = True
     
-    def delete_activity(self, activity_id):
-        self.db.delete_activity(activity_id)
-        self.load_data(None)
+    def open(self):
+        self.reset()
+        self.dialog.open()
     
-    def show_add_activity_dialog(self, instance):
-        # Switch to activities screen
-        self.manager.current = "activities"
+    def dismiss(self, *args):
+        self._validate_trigger.cancel()
+        self.dialog.dismiss()
+    
+    def on_field_text(self, field, text):
+        self._dirty = True
+        self._validate_trigger()
+    
+    def on_field_focus(self, key, field, focused):
+        # "9am" becomes "09:00" (and "alta" becomes "Alta") once the user moves on
+        if not focused:
+            value = self.parse()[0][key]
+            if value is not None and value != field.text:
+                field.text = value
+    
+    def parse(self):
+        fields = self.validated_fields()
+        return validate_activity_input(*(fields[key].text for key in ("title", "date", "start_time", "end_time",
+                                                                      "priority")))
+    
+    def validate(self, dt=None):
+        values, errors = self.parse()
+        flagged = set(errors)
+        if dt is not None:
+            # While typing, leave the empty title alone until save
+            flagged.discard("title")
+        for key, field in self.validated_fields().items():
+            if key in errors:
+                field.helper_text = errors[key]
+            field.error = key in flagged
+        self.errors = errors
+        self.parsed = values
+        self._dirty = False
+        return errors
+    
+    def validated_fields(self):
+        return {
+            "title": self.title_field,
+            "date": self.date_field,
+            "start_time": self.start_time_field,
+            "end_time": self.end_time_field,
+            "priority": self.priority_field,
+        }
+    
+    def is_valid(self):
+        # Saving only re-checks if a field changed since the last pass
+        self._validate_trigger.cancel()
+        if self._dirty:
+            self.validate()
+        fields = self.validated_fields()
+        for key in self.errors:
+            fields[key].error = True
+        return not self.errors
+    
+    def values(self):
+        # Canonical values from the last validation; call is_valid() first
+        return (
+            self.parsed["title"],
+            self.desc_field.text.strip(),
+            self.category_field.text.strip() or "General",
+            self.parsed["priority"],
+            self.parsed["start_time"],
+            self.parsed["end_time"],
+            self.parsed["date"],
+        )
 
 class ActivitiesScreen(MDScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = "activities"
         self.db = DatabaseManager()
-        self.dialog = None
+        self.card_pool = WidgetPool()
+        self.form = None
+        self.form_factory = FormFactory(ActivityFormDialog, self.save_activity)
         self.build_ui()
     
     def build_ui(self):
@@ -340,197 +2717,64 @@ class ActivitiesScreen(MDScreen):
         main_layout.add_widget(scroll)
         
         self.add_widget(main_layout)
-        Clock.schedule_once(self.load_activities, 0.5)
+        self.load_activities()
+        self.form_factory.warm()
     
-    def load_activities(self, dt):
+    def load_activities(self, dt=None):
+        load_scheduler.schedule(self, self.populate_activities(), first=screenful(dp(120)),
+                                reload=self.load_activities)
+    
+    def populate_activities(self):
+        # One card per step: the first screenful is added at once, the rest
+        # across frames
         activities = self.db.get_activities()
-        self.activities_list.clear_widgets()
+        self.card_pool.release_all(self.activities_list)
         
         for activity in activities:
             self.add_activity_card(activity)
+            yield
     
     def add_activity_card(self, activity):
-        card_layout = MDBoxLayout(
-            orientation="vertical",
-            spacing=dp(10),
-            padding=dp(15)
-        )
-        
-        # Title and status
-        title_layout = MDBoxLayout(
-            orientation="horizontal",
-            spacing=dp(10),
-            size_hint_y=None,
-            height=dp(30)
-        )
-        
-        title = MDLabel(
-            text=activity[1],
-            theme_text_color="Primary",
-            font_style="H6"
-        )
-        
-        status_color = "#4CAF50" if activity[8] else "#FF9800"
-        status_text = "Completada" if activity[8] else "Pendiente"
-        
-        status = MDLabel(
-            text=status_text,
-            theme_text_color="Custom",
-            text_color=status_color,
-            font_style="Caption",
-            size_hint_x=None,
-            width=dp(100)
-        )
-        
-        title_layout.add_widget(title)
-        title_layout.add_widget(status)
-        
-        # Description
-        if activity[2]:  # description exists
-            desc = MDLabel(
-                text=activity[2],
-                theme_text_color="Secondary",
-                font_style="Body2",
-                size_hint_y=None,
-                height=dp(40)
-            )
-            card_layout.add_widget(desc)
-        
-        # Details
-        details_text = f"📅 {activity[7]} | ⏰ {activity[5]} - {activity[6]} | 📂 {activity[3]} | 🔥 {activity[4]}"
-        details = MDLabel(
-            text=details_text,
-            theme_text_color="Secondary",
-            font_style="Caption",
-            size_hint_y=None,
-            height=dp(25)
-        )
-        
-        card_layout.add_widget(title_layout)
-        card_layout.add_widget(details)
-        
-        card = MDCard(
-            card_layout,
-            elevation=3,
-            radius=[10],
-            size_hint_y=None,
-            height=dp(120),
-            md_bg_color="#E8F5E8" if activity[8] else "white"
-        )
-        
+        card = self.card_pool.acquire(ActivityDetailCard)
+        card.set_activity(activity, self)
         self.activities_list.add_widget(card)
     
     def show_add_dialog(self, instance):
-        if not self.dialog:
-            content = MDBoxLayout(
-                orientation="vertical",
-                spacing=dp(15),
-                size_hint_y=None,
-                height=dp(400),
-                padding=dp(20)
-            )
-            
-            self.title_field = MDTextField(
-                hint_text="Título de la actividad",
-                required=True,
-                helper_text="Campo requerido",
-                helper_text_mode="on_error"
-            )
-            
-            self.desc_field = MDTextField(
-                hint_text="Descripción (opcional)",
-                multiline=True,
-                max_text_length=200
-            )
-            
-            self.category_field = MDTextField(
-                hint_text="Categoría",
-                text="Trabajo"
-            )
-            
-            self.priority_field = MDTextField(
-                hint_text="Prioridad",
-                text="Media"
-            )
-            
-            self.date_field = MDTextField(
-                hint_text="Fecha (YYYY-MM-DD)",
-                text=datetime.now().strftime("%Y-%m-%d")
-            )
-            
-            self.start_time_field = MDTextField(
-                hint_text="Hora inicio (HH:MM)",
-                text="09:00"
-            )
-            
-            self.end_time_field = MDTextField(
-                hint_text="Hora fin (HH:MM)",
-                text="10:00"
-            )
-            
-            content.add_widget(self.title_field)
-            content.add_widget(self.desc_field)
-            content.add_widget(self.category_field)
-            content.add_widget(self.priority_field)
-            content.add_widget(self.date_field)
-            content.add_widget(self.start_time_field)
-            content.add_widget(self.end_time_field)
-            
-            self.dialog = MDDialog(
-                title="Nueva Actividad",
-                type="custom",
-                content_cls=content,
-                buttons=[
-                    MDFlatButton(
-                        text="CANCELAR",
-                        theme_text_color="Custom",
-                        text_color="#2196F3",
-                        on_release=lambda x: self.dialog.dismiss()
-                    ),
-                    MDRaisedButton(
-                        text="GUARDAR",
-                        md_bg_color="#4CAF50",
-                        theme_text_color="Custom",
-                        text_color="white",
-                        on_release=self.save_activity
-                    ),
-                ]
-            )
-        
-        self.dialog.open()
+        self.form = self.form_factory.get()
+        self.form.open()
     
     def save_activity(self, instance):
-        if not self.title_field.text.strip():
-            self.title_field.error = True
+        form = self.form
+        if not form.is_valid():
             return
         
         try:
-            self.db.add_activity(
-                self.title_field.text.strip(),
-                self.desc_field.text.strip(),
-                self.category_field.text.strip() or "General",
-                self.priority_field.text.strip() or "Media",
-                self.start_time_field.text.strip(),
-                self.end_time_field.text.strip(),
-                self.date_field.text.strip()
-            )
-            
-            self.dialog.dismiss()
-            self.load_activities(None)
-            
-            # Clear fields
-            self.title_field.text = ""
-            self.desc_field.text = ""
-            
+            self.db.add_activity(*form.values())
+            form.dismiss()
+            self.load_activities()
         except Exception as e:
             print(f"Error saving activity: {e}")
 
+DAY_NAMES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+MONTH_NAMES = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio",
+               "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+
 class ScheduleScreen(MDScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = "schedule"
         self.db = DatabaseManager()
+        self.index = DateIndex(self.db)
+        self.card_pool = WidgetPool(max_free=62)
+        self.view_mode = "week"
         self.current_week_start = datetime.now() - timedelta(days=datetime.now().weekday())
+        self.current_month = date.today().replace(day=1)
+        self.current_day = date.today()
+        self.month_cells = []
+        self.agenda_end = None
+        self.time_grid = None
+        self.snackbar = None
+        self.message_label = None
         self.build_ui()
     
     def build_ui(self):
@@ -542,8 +2786,24 @@ class ScheduleScreen(MDScreen):
             elevation=2,
             md_bg_color="#2196F3"
         )
+        self.header = header
         main_layout.add_widget(header)
         
+        # View selector
+        view_bar = MDBoxLayout(
+            orientation="horizontal",
+            size_hint_y=None,
+            height=dp(48)
+        )
+        for mode, icon in (("day", "calendar-today"), ("week", "calendar-week"), ("grid", "calendar-clock"),
+                           ("month", "calendar-month"), ("agenda", "view-agenda")):
+            view_bar.add_widget(MDIconButton(
+                icon=icon,
+                on_release=functools.partial(self.set_view_mode, mode)
+            ))
+        view_bar.add_widget(MDIconButton(icon="auto-fix", on_release=self.auto_schedule))
+        main_layout.add_widget(view_bar)
+        
         # Week navigation
         week_nav = MDBoxLayout(
             orientation="horizontal",
@@ -575,18 +2835,71 @@ class ScheduleScreen(MDScreen):
         
         main_layout.add_widget(week_nav)
         
-        # Days of the week
-        self.days_layout = MDBoxLayout(orientation="vertical", spacing=dp(10))
-        scroll = MDScrollView()
-        scroll.add_widget(self.days_layout)
-        main_layout.add_widget(scroll)
+        # Days of the week, month grid or agenda
+        self.days_layout = MDBoxLayout(orientation="vertical", spacing=dp(10), adaptive_height=True)
+        self.scroll = MDScrollView()
+        self.scroll.add_widget(self.days_layout)
+        self.scroll.bind(scroll_y=self.on_scroll)
+        main_layout.add_widget(self.scroll)
+        
+        self.month_grid = MDGridLayout(cols=7, spacing=dp(4), adaptive_height=True)
+        for day_name in DAY_NAMES:
+            self.month_grid.add_widget(MDLabel(
+                text=day_name[:2],
+                theme_text_color="Secondary",
+                font_style="Caption",
+                halign="center",
+                size_hint_y=None,
+                height=dp(20)
+            ))
         
         self.add_widget(main_layout)
-        Clock.schedule_once(self.load_week_data, 0.5)
+        self.load_schedule()
+    
+    def set_view_mode(self, mode, instance=None):
+        self.view_mode = mode
+        self.header.title = {
+            "day": "Horario del Día",
+            "week": "Horario Semanal",
+            "grid": "Cuadrícula Semanal",
+            "month": "Horario Mensual",
+            "agenda": "Agenda",
+        }[mode]
+        week_start = self.current_week_start.date()
+        if mode in ("month", "agenda"):
+            self.current_month = week_start.replace(day=1)
+        elif mode == "day" and not week_start <= self.current_day < week_start + timedelta(days=7):
+            self.current_day = week_start
+        self.load_schedule()
+    
+    def load_schedule(self, dt=None):
+        if self.view_mode == "month":
+            self.load_month_data()
+        elif self.view_mode == "agenda":
+            self.load_agenda_data()
+        elif self.view_mode in ("day", "grid"):
+            self.load_grid_data()
+        else:
+            self.load_week_data()
+    
+    def close(self):
+        self.index.close()
     
-    def load_week_data(self, dt):
+    def reload_schedule(self):
+        self.index.clear()
+        self.load_schedule()
+    
+    def clear_days(self):
+        if self.month_grid.parent is not None:
+            self.days_layout.remove_widget(self.month_grid)
+        if self.time_grid is not None and self.time_grid.parent is not None:
+            self.days_layout.remove_widget(self.time_grid)
+        self.card_pool.release_all(self.days_layout)
+        self.scroll.scroll_y = 1
+    
+    def load_week_data(self, dt=None):
         self.update_week_label()
-        self.load_week_activities()
+        load_scheduler.schedule(self, self.load_week_activities())
     
     def update_week_label(self):
         start_date = self.current_week_start.strftime("%d/%m")
@@ -594,101 +2907,169 @@ class ScheduleScreen(MDScreen):
         self.week_label.text = f"{start_date} - {end_date}"
     
     def load_week_activities(self):
-        self.days_layout.clear_widgets()
-        days = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+        week_start = self.current_week_start.date()
+        self.index.ensure_range(week_start, week_start + timedelta(days=6))
+        self.clear_days()
         
-        for i, day_name in enumerate(days):
+        for i, day_name in enumerate(DAY_NAMES):
             day_date = self.current_week_start + timedelta(days=i)
-            day_activities = self.db.get_activities(day_date.strftime("%Y-%m-%d"))
-            
-            # Day card
-            day_card = MDCard(
-                elevation=2,
-                radius=[10],
-                size_hint_y=None,
-                height=dp(150),
-                md_bg_color="white"
-            )
-            
-            day_layout = MDBoxLayout(
-                orientation="vertical",
-                padding=dp(15),
-                spacing=dp(5)
-            )
-            
-            # Day header
-            day_header = MDBoxLayout(
-                orientation="horizontal",
-                size_hint_y=None,
-                height=dp(30)
-            )
+            day_activities = self.index.activities_on(day_date.date())
             
-            day_title = MDLabel(
-                text=f"{day_name} ({day_date.strftime('%d/%m')})",
-                theme_text_color="Primary",
-                font_style="Subtitle1"
+            day_card = self.card_pool.acquire(DayCard)
+            day_card.set_day(day_name, day_date, day_activities)
+            self.days_layout.add_widget(day_card)
+            yield
+    
+    def load_grid_data(self, dt=None):
+        if self.view_mode == "day":
+            self.week_label.text = f"{DAY_NAMES[self.current_day.weekday()]} {self.current_day.strftime('%d/%m/%Y')}"
+        else:
+            self.update_week_label()
+        load_scheduler.schedule(self, self.load_grid_activities())
+    
+    def load_grid_activities(self):
+        if self.view_mode == "day":
+            days = [self.current_day]
+        else:
+            week_start = self.current_week_start.date()
+            days = [week_start + timedelta(days=i) for i in range(7)]
+        self.index.ensure_range(days[0], days[-1])
+        self.clear_days()
+        if self.time_grid is None:
+            # Blocks are dragged after a press-and-hold: a quick swipe is
+            # still taken by the scroll view before it reaches the grid
+            self.time_grid = TimeGrid(on_reschedule=self.on_reschedule)
+        self.time_grid.set_days(days, [self.index.activities_on(day) for day in days])
+        self.days_layout.add_widget(self.time_grid)
+        yield
+        # Start the view around 07:00 rather than at midnight
+        overflow = self.days_layout.height - self.scroll.height
+        if overflow > 0:
+            self.scroll.scroll_y = max(0, 1 - 7 * self.time_grid.hour_height / overflow)
+    
+    def on_reschedule(self, grid, changes):
+        self.db.reschedule_activities(changes)
+    
+    def auto_schedule(self, instance=None):
+        # Unfinished activities from past days are moved into free time over
+        # the next SCHEDULE_HORIZON_DAYS days, around what is already planned,
+        # keeping their duration
+        now = datetime.now()
+        tasks = [ScheduleTask.from_activity(activity)
+                 for activity in self.db.get_pending_activities(now.strftime("%Y-%m-%d"))]
+        scheduler = AutoScheduler.for_database(self.db, now.date(), earliest=now.hour * 60 + now.minute)
+        placed, unscheduled = scheduler.schedule(tasks)
+        self.db.reschedule_activities(scheduler.as_changes(placed))
+        text = f"{len(placed)} actividades reprogramadas"
+        if unscheduled:
+            text += f", {len(unscheduled)} sin hueco"
+        self.show_message(text)
+        self.load_schedule()
+    
+    def show_message(self, text):
+        # Built once; later messages only change the label
+        from kivymd.uix.snackbar import MDSnackbar
+        if self.snackbar is None:
+            self.message_label = MDLabel(
+                theme_text_color="Custom",
+                text_color="white"
             )
-            
-            activity_count = MDLabel(
-                text=f"{len(day_activities)} actividades",
-                theme_text_color="Secondary",
-                font_style="Caption",
-                size_hint_x=None,
-                width=dp(100),
-                halign="right"
+            self.snackbar = MDSnackbar(
+                self.message_label,
+                y=dp(80),
+                pos_hint={"center_x": 0.5},
+                size_hint_x=0.9
             )
-            
-            day_header.add_widget(day_title)
-            day_header.add_widget(activity_count)
-            day_layout.add_widget(day_header)
-            
-            # Activities preview
+        self.message_label.text = text
+        if self.snackbar.parent is None:
+            self.snackbar.open()
+    
+    def load_month_data(self, dt=None):
+        self.week_label.text = f"{MONTH_NAMES[self.current_month.month - 1]} {self.current_month.year}"
+        load_scheduler.schedule(self, self.load_month_activities())
+    
+    def load_month_activities(self):
+        month = self.current_month
+        grid_start = month - timedelta(days=month.weekday())
+        grid_days = [grid_start + timedelta(days=i) for i in range(42)]
+        self.index.ensure_range(grid_days[0], grid_days[-1])
+        self.clear_days()
+        self.days_layout.add_widget(self.month_grid)
+        
+        counts = [self.index.count_on(day) for day in grid_days]
+        max_count = max(counts)
+        for week in range(6):
+            for i in range(week * 7, week * 7 + 7):
+                if i == len(self.month_cells):
+                    cell = MonthDayCell()
+                    self.month_cells.append(cell)
+                    self.month_grid.add_widget(cell)
+                self.month_cells[i].set_day(grid_days[i], counts[i], max_count, grid_days[i].month == month.month, self)
+            yield
+        
+        # Neighbouring months are fetched while idle so paging stays smooth
+        load_scheduler.schedule(self.index, self.prefetch_months(month))
+    
+    def prefetch_months(self, month):
+        for offset in (1, -1):
+            neighbour = self.shift_month(month, offset)
+            self.index.ensure_range(neighbour, neighbour + timedelta(days=41))
+            yield
+    
+    def load_agenda_data(self, dt=None):
+        self.week_label.text = f"Desde {self.current_month.strftime('%d/%m/%Y')}"
+        self.agenda_end = self.current_month
+        load_scheduler.schedule(self, self.load_agenda_activities(clear=True))
+    
+    def load_agenda_activities(self, clear=False):
+        start = self.agenda_end
+        end = self.shift_month(start, 1)
+        self.agenda_end = end
+        self.index.ensure_range(start, end - timedelta(days=1))
+        if clear:
+            self.clear_days()
+        
+        day = start
+        while day < end:
+            day_activities = self.index.activities_on(day)
             if day_activities:
-                for activity in day_activities[:3]:  # Show first 3 activities
-                    activity_text = f"• {activity[5]} - {activity[1]}"
-                    if activity[8]:  # completed
-                        activity_text += " ✓"
-                    
-                    activity_label = MDLabel(
-                        text=activity_text,
-                        theme_text_color="Secondary" if not activity[8] else "Custom",
-                        text_color="#4CAF50" if activity[8] else None,
-                        font_style="Caption",
-                        size_hint_y=None,
-                        height=dp(20)
-                    )
-                    day_layout.add_widget(activity_label)
-                
-                if len(day_activities) > 3:
-                    more_label = MDLabel(
-                        text=f"... y {len(day_activities) - 3} más",
-                        theme_text_color="Secondary",
-                        font_style="Caption",
-                        size_hint_y=None,
-                        height=dp(20)
-                    )
-                    day_layout.add_widget(more_label)
-            else:
-                empty_label = MDLabel(
-                    text="No hay actividades programadas",
-                    theme_text_color="Hint",
-                    font_style="Caption",
-                    italic=True,
-                    size_hint_y=None,
-                    height=dp(20)
-                )
-                day_layout.add_widget(empty_label)
-            
-            day_card.add_widget(day_layout)
-            self.days_layout.add_widget(day_card)
+                card = self.card_pool.acquire(AgendaDayCard)
+                card.set_day(DAY_NAMES[day.weekday()], day, day_activities)
+                self.days_layout.add_widget(card)
+                yield
+            day += timedelta(days=1)
+    
+    def on_scroll(self, scroll, scroll_y):
+        # Agenda keeps going: near the bottom, append the next month
+        if self.view_mode == "agenda" and scroll_y <= 0.05 and self not in load_scheduler.tasks:
+            load_scheduler.schedule(self, self.load_agenda_activities())
+    
+    @staticmethod
+    def shift_month(month, offset):
+        year, index = divmod(month.year * 12 + month.month - 1 + offset, 12)
+        return date(year, index + 1, 1)
+    
+    def show_week_of(self, day):
+        self.current_week_start = datetime.combine(day - timedelta(days=day.weekday()), datetime.min.time())
+        self.set_view_mode("week")
     
     def prev_week(self, instance):
-        self.current_week_start -= timedelta(days=7)
-        self.load_week_data(None)
+        self.shift_view(-1)
     
     def next_week(self, instance):
-        self.current_week_start += timedelta(days=7)
-        self.load_week_data(None)
+        self.shift_view(1)
+    
+    def shift_view(self, offset):
+        if self.view_mode == "day":
+            self.current_day += timedelta(days=offset)
+            self.current_week_start = datetime.combine(
+                self.current_day - timedelta(days=self.current_day.weekday()), datetime.min.time()
+            )
+        elif self.view_mode in ("week", "grid"):
+            self.current_week_start += timedelta(days=7 * offset)
+        else:
+            self.current_month = self.shift_month(self.current_month, offset)
+        self.load_schedule()
 
 class ProfileScreen(MDScreen):
     def __init__(self, **kwargs):
@@ -757,22 +3138,66 @@ class ProfileScreen(MDScreen):
             spacing=dp(15)
         )
         
+        stats = get_activity_stats(self.db)
+        
         # Total activities
-        total_activities = len(self.db.get_activities())
-        self.add_stat_item(stats_layout, str(total_activities), "Total\nActividades", "#2196F3")
+        self.total_label = self.add_stat_item(stats_layout, str(stats.total), "Total\nActividades", "#2196F3")
         
         # Completed activities
-        all_activities = self.db.get_activities()
-        completed = len([a for a in all_activities if a[8] == 1])
-        self.add_stat_item(stats_layout, str(completed), "Completadas", "#4CAF50")
+        self.completed_label = self.add_stat_item(stats_layout, str(stats.completed), "Completadas", "#4CAF50")
         
         # Completion rate
-        rate = f"{int((completed/total_activities)*100) if total_activities > 0 else 0}%"
-        self.add_stat_item(stats_layout, rate, "Tasa de\nCompletado", "#FF9800")
+        self.rate_label = self.add_stat_item(stats_layout, f"{stats.completion_rate}%", "Tasa de\nCompletado", "#FF9800")
+        
+        stats.bind(total=self.update_total, completed=self.update_completed, completion_rate=self.update_completion_rate)
         
         stats_card.add_widget(stats_layout)
         main_layout.add_widget(stats_card)
         
+        # Analytics card
+        analytics_card = MDCard(
+            elevation=3,
+            radius=[15],
+            size_hint_y=None,
+            height=dp(150),
+            md_bg_color="white"
+        )
+        
+        analytics_layout = MDBoxLayout(
+            orientation="vertical",
+            padding=dp(15),
+            spacing=dp(2)
+        )
+        
+        analytics_title = MDLabel(
+            text="Análisis",
+            theme_text_color="Primary",
+            font_style="Subtitle1",
+            bold=True,
+            size_hint_y=None,
+            height=dp(25)
+        )
+        analytics_layout.add_widget(analytics_title)
+        
+        self.analytics_labels = {}
+        for key in ("streak", "trend", "hour", "category", "priority"):
+            label = MDLabel(
+                theme_text_color="Secondary",
+                font_style="Caption",
+                size_hint_y=None,
+                height=dp(20)
+            )
+            self.analytics_labels[key] = label
+            analytics_layout.add_widget(label)
+        
+        analytics_card.add_widget(analytics_layout)
+        main_layout.add_widget(analytics_card)
+        
+        self.analytics = get_activity_analytics(self.db)
+        self._analytics_trigger = Clock.create_trigger(self.update_analytics)
+        self.analytics.bind(version=lambda *args: self._analytics_trigger())
+        self.update_analytics()
+        
         # Settings section
         settings_label = MDLabel(
             text="Configuración",
@@ -834,25 +3259,72 @@ class ProfileScreen(MDScreen):
         item_layout.add_widget(value_label)
         item_layout.add_widget(desc_label)
         layout.add_widget(item_layout)
+        return value_label
+    
+    def update_total(self, stats, value):
+        self.total_label.text = str(value)
+    
+    def update_completed(self, stats, value):
+        self.completed_label.text = str(value)
+    
+    def update_completion_rate(self, stats, value):
+        self.rate_label.text = f"{value}%"
+    
+    def update_analytics(self, *args):
+        analytics = self.analytics
+        labels = self.analytics_labels
+        
+        current, longest = analytics.streaks()
+        labels["streak"].text = f"Racha actual: {current} días · Mejor racha: {longest} días"
+        
+        trend = analytics.trend("week", last=4)
+        if trend:
+            rates = " → ".join(f"{rate}%" for _, _, _, rate in reversed(trend))
+            labels["trend"].text = f"Últimas semanas: {rates}"
+        else:
+            labels["trend"].text = "Últimas semanas: sin datos"
+        
+        hour = analytics.busiest_hour()
+        labels["hour"].text = f"Hora más activa: {hour:02d}:00" if hour is not None else "Hora más activa: -"
+        
+        top_categories = analytics.breakdown("category")
+        if top_categories:
+            category, total, completed = top_categories[0]
+            labels["category"].text = f"Categoría principal: {categories.name(category)} ({completed}/{total})"
+        else:
+            labels["category"].text = "Categoría principal: -"
+        
+        labels["priority"].text = "Prioridades: " + (
+            ", ".join(
+                f"{priorities.name(priority)} {completed}/{total}"
+                for priority, total, completed in analytics.breakdown("priority")
+            ) or "-"
+        )
     
     def handle_setting(self, setting_name):
         # Placeholder for settings functionality
         print(f"Setting selected: {setting_name}")
 
+profiler.instrument(DatabaseManager, "db")
+for screen_class in (DashboardScreen, ActivitiesScreen, ScheduleScreen, ProfileScreen):
+    profiler.instrument(screen_class, "screen", prefixes=("load_", "update_", "populate_"))
+
 class ZenithMobileApp(MDApp):
     def build(self):
         self.title = "Zenith Mobile"
         self.theme_cls.primary_palette = "Blue"
         self.theme_cls.theme_style = "Light"
         
-        # Screen manager
-        sm = MDScreenManager()
-        
-        # Add screens
-        sm.add_widget(DashboardScreen())
-        sm.add_widget(ActivitiesScreen())
-        sm.add_widget(ScheduleScreen())
-        sm.add_widget(ProfileScreen())
+        # Only the first tab's screen is built up front; the others are built
+        # after the first frame, or as soon as their tab is opened
+        self.screen_classes = {
+            "dashboard": DashboardScreen,
+            "activities": ActivitiesScreen,
+            "schedule": ScheduleScreen,
+            "profile": ProfileScreen,
+        }
+        self.screens = {}
+        self.tabs = {}
         
         # Bottom navigation
         bottom_nav = MDBottomNavigation(
@@ -860,44 +3332,107 @@ class ZenithMobileApp(MDApp):
             text_color_active="white"
         )
         
-        # Dashboard tab
-        dashboard_tab = MDBottomNavigationItem(
-            name="dashboard",
-            text="Inicio",
-            icon="home"
-        )
-        dashboard_tab.add_widget(DashboardScreen())
-        
-        # Activities tab
-        activities_tab = MDBottomNavigationItem(
-            name="activities",
-            text="Actividades",
-            icon="clipboard-text"
-        )
-        activities_tab.add_widget(ActivitiesScreen())
-        
-        # Schedule tab
-        schedule_tab = MDBottomNavigationItem(
-            name="schedule",
-            text="Horario",
-            icon="calendar"
-        )
-        schedule_tab.add_widget(ScheduleScreen())
-        
-        # Profile tab
-        profile_tab = MDBottomNavigationItem(
-            name="profile",
-            text="Perfil",
-            icon="account"
-        )
-        profile_tab.add_widget(ProfileScreen())
+        tabs = [
+            ("dashboard", "Inicio", "home"),
+            ("activities", "Actividades", "clipboard-text"),
+            ("schedule", "Horario", "calendar"),
+            ("profile", "Perfil", "account"),
+        ]
+        for name, text, icon in tabs:
+            tab = MDBottomNavigationItem(
+                name=name,
+                text=text,
+                icon=icon
+            )
+            self.tabs[name] = tab
+            bottom_nav.add_widget(tab)
         
-        bottom_nav.add_widget(dashboard_tab)
-        bottom_nav.add_widget(activities_tab)
-        bottom_nav.add_widget(schedule_tab)
-        bottom_nav.add_widget(profile_tab)
+        # The visible tab loads first, the rest fill in on idle frames
+        load_scheduler.set_visible(self.get_screen("dashboard"))
+        bottom_nav.ids.tab_manager.bind(current=self.on_tab_changed)
         
         return bottom_nav
+    
+    def get_screen(self, name):
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = self.screen_classes[name]()
+            self.screens[name] = screen
+            self.tabs[name].add_widget(screen)
+        return screen
+    
+    def build_hidden_screens(self):
+        for name in self.screen_classes:
+            self.get_screen(name)
+            yield
+    
+    def on_start(self):
+        profiler.start(self.root)
+        memory_diagnostics.start(self.root)
+        Window.bind(on_flip=self.on_first_frame)
+        self.db_watcher = DataVersionWatcher(DatabaseManager())
+        self.db_watcher.bind(on_external_change=self.on_external_change)
+        self.db_watcher.start()
+        self.maintenance_job = MaintenanceJob(DatabaseManager())
+        self.maintenance_job.start()
+        self.sync_thread = None
+        if SYNC_URL:
+            self.start_sync()
+            Clock.schedule_interval(self.start_sync, SYNC_INTERVAL)
+    
+    def start_sync(self, dt=None):
+        if self.sync_thread is not None and self.sync_thread.is_alive():
+            return
+        self.sync_thread = threading.Thread(target=self.run_sync, daemon=True)
+        self.sync_thread.start()
+    
+    def run_sync(self):
+        # Background thread: its own connection, no events; whatever it
+        # writes reaches the UI through DataVersionWatcher
+        try:
+            engine = SyncEngine(DatabaseManager(), SYNC_URL, notify=False)
+            pushed, pulled = engine.sync()
+            Logger.info(f"SyncEngine: pushed {pushed}, pulled {pulled}")
+        except (OSError, ValueError, sqlite3.Error) as error:
+            Logger.warning(f"SyncEngine: sync failed: {error}")
+        finally:
+            DatabaseManager.close_writer()
+    
+    def on_external_change(self, watcher):
+        # Another process wrote to the database: refresh the caches, then
+        # reload the screens that have been built
+        db = watcher.db
+        query_cache.clear(db.db_path)
+        db.reload_lookups(force=True)
+        for cache in (activity_stats, activity_analytics, activity_columns):
+            if cache.loaded:
+                cache.load(db)
+        reloads = {
+            "dashboard": "load_data",
+            "activities": "load_activities",
+            "schedule": "reload_schedule",
+        }
+        for name, method in reloads.items():
+            screen = self.screens.get(name)
+            if screen is not None:
+                getattr(screen, method)()
+    
+    def on_first_frame(self, window):
+        window.unbind(on_flip=self.on_first_frame)
+        load_scheduler.schedule(self, self.build_hidden_screens())
+    
+    def on_stop(self):
+        self.db_watcher.stop()
+        self.maintenance_job.stop()
+        schedule = self.screens.get("schedule")
+        if schedule is not None:
+            schedule.close()
+        profiler.stop()
+        memory_diagnostics.stop()
+    
+    def on_tab_changed(self, tab_manager, name):
+        load_scheduler.set_visible(self.get_screen(name))
+        memory_diagnostics.sample(f"tab {name}")
 
 if __name__ == "__main__":
     ZenithMobileApp().run()
\ No newline at end of file
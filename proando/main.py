@@ -1,420 +1,1387 @@
 import os
+import sys
+import gzip
 import json
-from datetime import datetime
+import threading
+import time
+import uuid
+import itertools
+import functools
+from datetime import datetime, timedelta
 
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.button import Button
 from kivy.uix.label import Label
-from kivy.uix.textinput import TextInput
-from kivy.uix.spinner import Spinner
 from kivy.core.window import Window
 from kivy.uix.popup import Popup
 from kivy.clock import Clock
+from kivy.factory import Factory
+from kivy.lang import Builder
+from kivy.logger import Logger
 from kivy.metrics import dp
-from kivy.properties import StringProperty, ListProperty, ObjectProperty
-from kivy.uix.behaviors import ButtonBehavior
-from kivy.uix.image import Image
-from kivy.uix.widget import Widget
-from kivy.graphics import Color, Ellipse, Rectangle
-
-# Definición de RoundedRectangle para usar en los widgets
-class RoundedRectangle(Rectangle):
-    def __init__(self, **kwargs):
-        self.radius = kwargs.pop('radius', [0, 0, 0, 0])
-        super(RoundedRectangle, self).__init__(**kwargs)
+from kivy.event import EventDispatcher
+from kivy.properties import ListProperty, NumericProperty
+from kivy.graphics import Color, RoundedRectangle
+
+# Código común con la app KivyMD, en zenith_core.py del directorio superior
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import zenith_core
+from zenith_core import (MemoryDiagnostics, Profiler, SyncEngine, WidgetPool, check_activity_input, local_wins,
+                         screenful)
 
 # Configuración de la ventana
 Window.size = (400, 700)  # Tamaño típico de un móvil
 Window.clearcolor = (0.95, 0.95, 0.95, 1)  # Fondo claro
 
+# Reglas de la interfaz: se analizan una sola vez, aquí, y cada pantalla o
+# tarjeta se construye a partir de ellas
+KV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zenith.kv')
+Builder.load_file(KV_FILE)
+
 # Directorio para almacenar datos
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
 os.makedirs(DATA_DIR, exist_ok=True)
 
-# Archivo para almacenar actividades
+# Archivo de actividades del formato anterior, sin fechas; ahora solo se lee
+# para repartirlo en archivos por día (ver ActivityManager), que se guardan
+# junto a él
 ACTIVITIES_FILE = os.path.join(DATA_DIR, 'activities.json')
 
+# Las actividades borradas se pueden recuperar durante PURGE_AFTER segundos;
+# la barra de deshacer solo se muestra los primeros UNDO_DURATION
+PURGE_AFTER = 60 * 60
+PURGE_INTERVAL = 5 * 60
+PURGE_BATCH = 100
+UNDO_DURATION = 5
+# El mantenimiento espera a que pasen IDLE_AFTER segundos sin toques ni
+# teclas, para no competir con el usuario por el frame
+IDLE_AFTER = 10
+
+# Las completadas de hace más de ARCHIVE_AFTER_DAYS días pasan al archivo
+# (comprimido con gzip si ARCHIVE_COMPRESS), fuera de los archivos por día
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_COMPRESS = True
+
+# Líneas de journal.jsonl tras las que se reescriben index.json y locator.json
+JOURNAL_LIMIT = 500
+
 # Colores de la aplicación
 PRIMARY_COLOR = (0.2, 0.6, 0.9, 1)  # Azul
 SECONDARY_COLOR = (0.95, 0.95, 0.95, 1)  # Gris claro
 ACCENT_COLOR = (0.9, 0.3, 0.3, 1)  # Rojo
 
+# Prioridades: las actividades guardan el código (posición en la tabla) y
+# la etiqueta y el color se leen de aquí, sin comparar cadenas
+PRIORITIES = (
+    ('Alta', ACCENT_COLOR),
+    ('Media', (0.2, 0.6, 0.2, 1)),
+    ('Baja', (0.6, 0.6, 0.2, 1)),
+)
+PRIORITY_LABELS = tuple(label for label, _ in PRIORITIES)
+PRIORITY_COLORS = tuple(color for _, color in PRIORITIES)
+PRIORITY_CODES = {label: code for code, label in enumerate(PRIORITY_LABELS)}
+PRIORITY_HIGH = PRIORITY_CODES['Alta']
+PRIORITY_DEFAULT = PRIORITY_CODES['Media']
+
+def priority_code(priority):
+    # Acepta también la etiqueta, como en los archivos guardados antes de los códigos
+    if isinstance(priority, int):
+        return priority if 0 <= priority < len(PRIORITIES) else PRIORITY_DEFAULT
+    return PRIORITY_CODES.get(priority, PRIORITY_DEFAULT)
+
+def priority_label(priority):
+    return PRIORITY_LABELS[priority_code(priority)]
+
+def priority_color(priority):
+    return PRIORITY_COLORS[priority_code(priority)]
+
+def today():
+    return datetime.now().strftime('%Y-%m-%d')
+
+# Mensajes bajo cada campo del formulario; el análisis es el de zenith_core
+ACTIVITY_INPUT_ERRORS = {
+    'title': 'El título es obligatorio',
+    'date': 'Fecha inválida. Usa AAAA-MM-DD',
+    'start_time': 'Hora de inicio inválida. Usa HH:MM',
+    'end_time': 'Hora de fin inválida. Usa HH:MM',
+    'order': 'La hora de fin debe ser posterior a la de inicio',
+}
+
+def validate_activity_input(title, date, start_time, end_time):
+    # (valores normalizados, errores): un mensaje por campo que no se puede
+    # guardar; sin fecha, hoy
+    return check_activity_input(title, date or today(), start_time, end_time, ACTIVITY_INPUT_ERRORS)
+
+def shift_date(day, days):
+    return (datetime.strptime(day, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+
+# Serialización de actividades. Cada archivo guarda {"v": versión,
+# "fields": nombres, "rows": [[valores], ...]}: los nombres van una vez por
+# archivo y no en cada actividad. Al leer, cada fila se valida contra
+# RECORD_FIELDS (tipo, obligatoria o valor por defecto) y las que no
+# encajan se descartan con un aviso en vez de romper la pantalla. También
+# se aceptan las listas de diccionarios del formato anterior (versión 0).
+RECORD_VERSION = 1
+REQUIRED = object()
+RECORD_FIELDS = (
+    ('id', int, REQUIRED),
+    ('uid', str, REQUIRED),
+    ('title', str, REQUIRED),
+    ('date', str, REQUIRED),
+    ('description', str, ''),
+    ('start_time', str, ''),
+    ('end_time', str, ''),
+    ('priority', int, PRIORITY_DEFAULT),
+    ('completed', bool, False),
+    ('updated_at', int, 0),
+    ('change_seq', int, 0),
+    ('deleted_at', int, None),
+)
+RECORD_FIELD_NAMES = tuple(name for name, _, _ in RECORD_FIELDS)
+
+def encode_records(records):
+    # records: actividades ya validadas (diccionarios)
+    return {
+        'v': RECORD_VERSION,
+        'fields': RECORD_FIELD_NAMES,
+        'rows': [[record.get(name) for name in RECORD_FIELD_NAMES] for record in records]
+    }
+
+def validate_values(values):
+    # values en el orden de RECORD_FIELDS; devuelve la actividad normalizada
+    # o lanza ValueError. Comparar type() primero deja en una sola
+    # comprobación el caso normal, el de un archivo que ya escribimos
+    activity = {}
+    for (name, kind, default), value in zip(RECORD_FIELDS, values):
+        if value is None:
+            if default is REQUIRED:
+                raise ValueError(f'falta {name}')
+            if default is not None:
+                activity[name] = default
+            continue
+        if name == 'priority':
+            value = priority_code(value)
+        elif type(value) is not kind:
+            if kind is bool and type(value) is int:
+                value = bool(value)
+            else:
+                raise ValueError(f'{name} debería ser {kind.__name__}: {value!r}')
+        activity[name] = value
+    return activity
+
+def validate_record(record):
+    return validate_values([record.get(name) for name in RECORD_FIELD_NAMES])
+
+def decode_records(data, source=''):
+    # Lo contrario de encode_records; las filas inválidas se descartan
+    if isinstance(data, list):
+        rows, fields = data, None
+    elif isinstance(data, dict) and data.get('v') == RECORD_VERSION:
+        rows, fields = data['rows'], tuple(data['fields'])
+    else:
+        Logger.warning(f'ActivityManager: formato desconocido en {source}')
+        return []
+    activities = []
+    for row in rows:
+        try:
+            if fields == RECORD_FIELD_NAMES and len(row) == len(fields):
+                activities.append(validate_values(row))
+            elif fields is None:
+                activities.append(validate_record(row))
+            else:
+                activities.append(validate_record(dict(zip(fields, row))))
+        except (ValueError, TypeError, AttributeError) as error:
+            Logger.warning(f'ActivityManager: actividad inválida en {source}: {error}')
+    return activities
+
+# Códecs para los archivos de actividades, elegidos con RECORD_CODEC. El
+# JSON es compacto y en UTF-8 ("Matemáticas" no se escapa); orjson y
+# msgpack son opcionales y, si no están instalados, se usa el JSON
+class JsonCodec:
+    name = 'json'
+    extension = '.json'
+    
+    @staticmethod
+    def dumps(data):
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    
+    @staticmethod
+    def loads(raw):
+        return json.loads(raw)
+
+class OrjsonCodec(JsonCodec):
+    # Mismos archivos que JsonCodec, con un codificador más rápido
+    name = 'orjson'
+    
+    def __init__(self):
+        import orjson
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+class MsgpackCodec:
+    name = 'msgpack'
+    extension = '.msgpack'
+    
+    def __init__(self):
+        import msgpack
+        self.dumps = functools.partial(msgpack.packb, use_bin_type=True)
+        self.loads = functools.partial(msgpack.unpackb, raw=False)
+
+CODECS = {codec.name: codec for codec in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+RECORD_CODEC = 'json'
+_codecs = {}
+
+def get_codec(name=None):
+    name = name or RECORD_CODEC
+    if name not in _codecs:
+        try:
+            _codecs[name] = CODECS[name]()
+        except ImportError:
+            Logger.warning(f'ActivityManager: {name} no está instalado, se usa json')
+            _codecs[name] = JsonCodec()
+    return _codecs[name]
+
+# Perfilado de rendimiento (ver Profiler en zenith_core)
+profiler = Profiler(
+    os.environ.get('ZENITH_PROFILE'),
+    os.environ.get('ZENITH_PROFILE_OUTPUT'),
+    os.environ.get('ZENITH_PROFILE_FORMAT')
+)
+
+# Diagnóstico de memoria (ver MemoryDiagnostics en zenith_core)
+memory_diagnostics = MemoryDiagnostics(
+    os.environ.get('ZENITH_MEMORY'),
+    os.environ.get('ZENITH_MEMORY_OUTPUT')
+)
+
+# Eventos de cambios en las actividades
+class ActivityEvents(EventDispatcher):
+    __events__ = ('on_activity_added', 'on_activity_updated', 'on_activity_deleted')
+
+    def on_activity_added(self, activity):
+        pass
+
+    def on_activity_updated(self, old, new):
+        pass
+
+    def on_activity_deleted(self, activity):
+        pass
+
+activity_events = ActivityEvents()
+
+class JournaledDict(dict):
+    # Diccionario que anota las claves que cambian (None si se quitan) para
+    # que el diario guarde solo eso
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.changes = {}
+    
+    def __setitem__(self, key, value):
+        if self.get(key) != value:
+            super().__setitem__(key, value)
+            self.changes[key] = value
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.changes[key] = None
+    
+    def pop(self, key, *default):
+        if key in self:
+            self.changes[key] = None
+        return super().pop(key, *default)
+
 # Clase para manejar actividades
 class ActivityManager:
+    # Cada día se guarda en su propio archivo, days/AAAA-MM-DD.json (o la
+    # extensión de RECORD_CODEC) con encode_records, y las
+    # pantallas leen solo el del día que muestran, así que cargar no depende
+    # del historial. index.json guarda el siguiente id y un resumen por día
+    # (total, completadas, change_seq máximo, borradas) con el que las
+    # estadísticas, la sincronización y la purga saben qué días abrir;
+    # locator.json dice en qué día está cada id y cada uid, y solo se lee al
+    # escribir. Los borrados solo marcan deleted_at (epoch ms) para poder
+    # deshacerlos: load_day devuelve las vivas y load_day_all también las
+    # borradas, que purge_deleted elimina más tarde.
+    # Índice y localizador crecen con el historial, así que no se reescriben
+    # en cada cambio: se leen una vez y quedan en memoria, y save_index y
+    # save_locator añaden a journal.jsonl una línea con las entradas que
+    # cambiaron. Al cargar se reaplica el diario; cada JOURNAL_LIMIT líneas
+    # (y con flush, al cerrar la app) se guardan enteros y se vacía
+    _cache_dir = None
+    _index = None
+    _locator = None
+    _journal_lines = 0
+    _journal_scalars = None
+    
+    @staticmethod
+    def days_dir():
+        return os.path.join(os.path.dirname(ACTIVITIES_FILE), 'days')
+    
+    @staticmethod
+    def day_file(day, codec=None):
+        extension = (codec or get_codec()).extension
+        return os.path.join(ActivityManager.days_dir(), f'{day}{extension}')
+    
+    @staticmethod
+    def index_file():
+        return os.path.join(os.path.dirname(ACTIVITIES_FILE), 'index.json')
+    
+    @staticmethod
+    def locator_file():
+        return os.path.join(os.path.dirname(ACTIVITIES_FILE), 'locator.json')
+    
+    @staticmethod
+    def journal_file():
+        return os.path.join(os.path.dirname(ACTIVITIES_FILE), 'journal.jsonl')
+    
+    @staticmethod
+    def _read(path, default):
+        if not os.path.exists(path):
+            return default
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return default
+    
+    @staticmethod
+    def _write(path, data):
+        with open(path, 'wb') as f:
+            f.write(JsonCodec.dumps(data))
+    
+    @staticmethod
+    def _load_cache():
+        if ActivityManager._cache_dir == os.path.dirname(ACTIVITIES_FILE):
+            return
+        index = ActivityManager._read(ActivityManager.index_file(), None)
+        if index is None:
+            # migrate() guarda y deja en memoria el índice nuevo
+            ActivityManager.migrate()
+            return
+        locator = ActivityManager._read(ActivityManager.locator_file(), {'ids': {}, 'uids': {}})
+        lines = 0
+        if os.path.exists(ActivityManager.journal_file()):
+            with open(ActivityManager.journal_file(), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Última línea a medio escribir
+                        break
+                    ActivityManager._replay(index, locator, entry)
+                    lines += 1
+        ActivityManager._cache(index, locator, lines)
+    
+    @staticmethod
+    def _replay(index, locator, entry):
+        # Las entradas guardan valores, no diferencias: reaplicar una línea
+        # ya incluida en index.json no cambia nada
+        for key in ('next_id', 'archived', 'archive_seq'):
+            index[key] = entry[key]
+        for target, changes in ((index['days'], entry['days']), (locator['ids'], entry['ids']),
+                                (locator['uids'], entry['uids'])):
+            for key, value in changes.items():
+                if value is None:
+                    target.pop(key, None)
+                else:
+                    target[key] = value
+    
+    @staticmethod
+    def _cache(index, locator, lines=0):
+        index['days'] = JournaledDict(index['days'])
+        locator['ids'] = JournaledDict(locator['ids'])
+        locator['uids'] = JournaledDict(locator['uids'])
+        ActivityManager._cache_dir = os.path.dirname(ACTIVITIES_FILE)
+        ActivityManager._index = index
+        ActivityManager._locator = locator
+        ActivityManager._journal_lines = lines
+        ActivityManager._journal_scalars = ActivityManager._scalars(index)
+    
+    @staticmethod
+    def _scalars(index):
+        return {key: index.get(key, 0) for key in ('next_id', 'archived', 'archive_seq')}
+    
+    @staticmethod
+    def load_index():
+        ActivityManager._load_cache()
+        return ActivityManager._index
+    
+    @staticmethod
+    def load_locator():
+        ActivityManager._load_cache()
+        return ActivityManager._locator
+    
+    @staticmethod
+    def save_index(index):
+        ActivityManager._journal()
+    
+    @staticmethod
+    def save_locator(locator):
+        ActivityManager._journal()
+    
+    @staticmethod
+    def _journal():
+        # Índice y localizador van en la misma línea del diario, así que
+        # guardar uno guarda los dos y el segundo no escribe nada
+        index, locator = ActivityManager._index, ActivityManager._locator
+        scalars = ActivityManager._scalars(index)
+        changes = (index['days'].changes, locator['ids'].changes, locator['uids'].changes)
+        if scalars == ActivityManager._journal_scalars and not any(changes):
+            return
+        entry = dict(scalars, days=changes[0], ids=changes[1], uids=changes[2])
+        with open(ActivityManager.journal_file(), 'ab') as f:
+            f.write(JsonCodec.dumps(entry) + b'\n')
+        for changed in changes:
+            changed.clear()
+        ActivityManager._journal_scalars = scalars
+        ActivityManager._journal_lines += 1
+        if ActivityManager._journal_lines >= JOURNAL_LIMIT:
+            ActivityManager.flush()
+    
+    @staticmethod
+    def _snapshot(index, locator):
+        # Se escriben enteros y después se vacía el diario; si algo falla a
+        # medias, el diario se vuelve a aplicar sin efecto
+        ActivityManager._write(ActivityManager.index_file(), index)
+        ActivityManager._write(ActivityManager.locator_file(), locator)
+        if os.path.exists(ActivityManager.journal_file()):
+            os.remove(ActivityManager.journal_file())
+        ActivityManager._cache(index, locator)
+    
+    @staticmethod
+    def flush():
+        if ActivityManager._cache_dir == os.path.dirname(ACTIVITIES_FILE) and ActivityManager._journal_lines:
+            ActivityManager._snapshot(ActivityManager._index, ActivityManager._locator)
+    
+    @staticmethod
+    def migrate():
+        # Reparte activities.json (formato anterior, sin fechas) en archivos
+        # por día. Lo que no tiene fecha va al día de su último cambio, o a
+        # hoy; el archivo original se deja como copia
+        def date_of(activity):
+            if not activity.get('date'):
+                changed = activity.get('updated_at')
+                activity['date'] = (datetime.fromtimestamp(changed / 1000) if changed else datetime.now()).strftime('%Y-%m-%d')
+            return activity['date']
+        
+        os.makedirs(ActivityManager.days_dir(), exist_ok=True)
+        archive = ActivityManager._read_archive()
+        if isinstance(archive, list):
+            # Archivo del formato anterior: se reescribe con fechas
+            for activity in archive:
+                if isinstance(activity, dict):
+                    date_of(activity)
+            archive = decode_records(archive, ActivityManager.archive_file())
+            if archive:
+                ActivityManager.save_archive(archive)
+        else:
+            archive = decode_records(archive, ActivityManager.archive_file())
+        index = {'next_id': 1, 'days': {}, 'archived': len(archive),
+                 'archive_seq': max([0] + [a['change_seq'] for a in archive])}
+        locator = {'ids': {}, 'uids': {}}
+        records = ActivityManager._read(ACTIVITIES_FILE, [])
+        if records:
+            state = ActivityManager.get_sync_state()
+            by_day = {}
+            valid = []
+            for activity in records:
+                if isinstance(activity, dict) and 'uid' not in activity:
+                    ActivityManager._track(activity, state)
+                try:
+                    activity = validate_record(dict(activity, date=date_of(activity)))
+                except (ValueError, TypeError, AttributeError) as error:
+                    Logger.warning(f'ActivityManager: actividad inválida en {ACTIVITIES_FILE}: {error}')
+                    continue
+                valid.append(activity)
+                by_day.setdefault(activity['date'], []).append(activity)
+            records = valid
+            for day, day_records in by_day.items():
+                ActivityManager.save_day(day, day_records, index, locator)
+            index['next_id'] = max([0] + [a['id'] for a in records + archive]) + 1
+            ActivityManager.save_sync_state(state)
+        ActivityManager._snapshot(index, locator)
+        return index
+    
+    @staticmethod
+    def load_day_all(day):
+        codec = get_codec()
+        path = ActivityManager.day_file(day, codec)
+        if not os.path.exists(path):
+            # Quizá se escribió con otro códec
+            codec = next((c for c in map(get_codec, CODECS)
+                          if os.path.exists(ActivityManager.day_file(day, c))), None)
+            if codec is None:
+                return []
+            path = ActivityManager.day_file(day, codec)
+        try:
+            with open(path, 'rb') as f:
+                data = codec.loads(f.read())
+        except (ValueError, TypeError) as error:
+            Logger.warning(f'ActivityManager: no se pudo leer {path}: {error}')
+            return []
+        return decode_records(data, path)
+    
+    @staticmethod
+    def load_day(day=None):
+        # Actividades vivas de un día (AAAA-MM-DD, hoy por defecto). Solo
+        # se mira el índice para migrar la primera vez; ya está en memoria
+        ActivityManager._load_cache()
+        return [a for a in ActivityManager.load_day_all(day or today()) if not a.get('deleted_at')]
+    
+    @staticmethod
+    def save_day(day, activities, index, locator=None):
+        # Escribe el día y actualiza su resumen en el índice (y el
+        # localizador, si se pasa); el llamador guarda índice y localizador
+        codec = get_codec()
+        for other in {get_codec(name).extension for name in CODECS} - {codec.extension}:
+            stale = os.path.join(ActivityManager.days_dir(), f'{day}{other}')
+            if os.path.exists(stale):
+                os.remove(stale)
+        if activities:
+            with open(ActivityManager.day_file(day, codec), 'wb') as f:
+                f.write(codec.dumps(encode_records(activities)))
+            live = [a for a in activities if not a.get('deleted_at')]
+            index['days'][day] = [
+                len(live),
+                sum(1 for a in live if a.get('completed')),
+                max(a.get('change_seq', 0) for a in activities),
+                len(activities) - len(live)
+            ]
+        else:
+            if os.path.exists(ActivityManager.day_file(day)):
+                os.remove(ActivityManager.day_file(day))
+            index['days'].pop(day, None)
+        if locator is not None:
+            for activity in activities:
+                locator['ids'][str(activity['id'])] = day
+                locator['uids'][activity['uid']] = day
+    
     @staticmethod
     def load_activities():
-        if os.path.exists(ACTIVITIES_FILE):
+        # Todo el historial vivo, día por día (búsquedas y exportaciones;
+        # las pantallas usan load_day)
+        return [a for a in ActivityManager.load_all() if not a.get('deleted_at')]
+    
+    @staticmethod
+    def load_all():
+        index = ActivityManager.load_index()
+        activities = []
+        for day in sorted(index['days']):
+            activities += ActivityManager.load_day_all(day)
+        return activities
+    
+    @staticmethod
+    def _find(activity_id, locator=None):
+        # (día, lista del día, actividad) para un id, o None
+        locator = locator or ActivityManager.load_locator()
+        day = locator['ids'].get(str(activity_id))
+        if day is None:
+            return None
+        activities = ActivityManager.load_day_all(day)
+        activity = next((a for a in activities if a['id'] == activity_id), None)
+        return None if activity is None else (day, activities, activity)
+    
+    # Seguimiento de cambios para la sincronización: cada actividad lleva
+    # uid, updated_at (epoch ms) y change_seq; los borrados dejan una lápida
+    # en sync.json, junto a los archivos de actividades
+    @staticmethod
+    def sync_file():
+        return os.path.join(os.path.dirname(ACTIVITIES_FILE), 'sync.json')
+    
+    @staticmethod
+    def get_sync_state():
+        state = {'client_id': None, 'local_seq': 0, 'pushed_seq': 0, 'pull_cursor': 0, 'tombstones': {}}
+        if os.path.exists(ActivityManager.sync_file()):
             try:
-                with open(ACTIVITIES_FILE, 'r') as f:
-                    return json.load(f)
+                with open(ActivityManager.sync_file(), 'r') as f:
+                    state.update(json.load(f))
             except json.JSONDecodeError:
-                return []
-        return []
+                pass
+        if state['client_id'] is None:
+            state['client_id'] = uuid.uuid4().hex
+            ActivityManager.save_sync_state(state)
+        return state
     
     @staticmethod
-    def save_activities(activities):
-        with open(ACTIVITIES_FILE, 'w') as f:
-            json.dump(activities, f)
+    def save_sync_state(state):
+        with open(ActivityManager.sync_file(), 'w') as f:
+            json.dump(state, f)
     
     @staticmethod
-    def add_activity(title, description, start_time, end_time, priority):
-        activities = ActivityManager.load_activities()
+    def set_sync_state(**values):
+        state = ActivityManager.get_sync_state()
+        state.update(values)
+        ActivityManager.save_sync_state(state)
+    
+    @staticmethod
+    def _track(activity, state):
+        state['local_seq'] += 1
+        activity.setdefault('uid', uuid.uuid4().hex)
+        activity['updated_at'] = int(time.time() * 1000)
+        activity['change_seq'] = state['local_seq']
+    
+    @staticmethod
+    def add_activity(title, description, start_time, end_time, priority, date=None):
+        day = date or today()
+        index = ActivityManager.load_index()
+        locator = ActivityManager.load_locator()
+        activities = ActivityManager.load_day_all(day)
         activity = {
-            'id': len(activities) + 1,
+            'id': index['next_id'],
             'title': title,
             'description': description,
+            'date': day,
             'start_time': start_time,
             'end_time': end_time,
-            'priority': priority,
+            'priority': priority_code(priority),
             'completed': False
         }
+        index['next_id'] += 1
+        state = ActivityManager.get_sync_state()
+        ActivityManager._track(activity, state)
         activities.append(activity)
-        ActivityManager.save_activities(activities)
+        ActivityManager.save_day(day, activities, index, locator)
+        ActivityManager.save_locator(locator)
+        ActivityManager.save_index(index)
+        ActivityManager.save_sync_state(state)
+        activity_events.dispatch('on_activity_added', activity)
         return activity
     
     @staticmethod
     def update_activity(activity_id, **kwargs):
-        activities = ActivityManager.load_activities()
-        for activity in activities:
-            if activity['id'] == activity_id:
-                for key, value in kwargs.items():
-                    activity[key] = value
-                break
-        ActivityManager.save_activities(activities)
+        # Cambiar 'date' mueve la actividad al archivo de su nuevo día
+        if 'priority' in kwargs:
+            kwargs['priority'] = priority_code(kwargs['priority'])
+        locator = ActivityManager.load_locator()
+        found = ActivityManager._find(activity_id, locator)
+        if found is None or found[2].get('deleted_at'):
+            return
+        day, activities, activity = found
+        old = dict(activity)
+        state = ActivityManager.get_sync_state()
+        activity.update(kwargs)
+        ActivityManager._track(activity, state)
+        index = ActivityManager.load_index()
+        new_day = activity.get('date') or day
+        if new_day != day:
+            activities.remove(activity)
+            moved = ActivityManager.load_day_all(new_day) + [activity]
+            ActivityManager.save_day(new_day, moved, index, locator)
+            ActivityManager.save_locator(locator)
+        ActivityManager.save_day(day, activities, index)
+        ActivityManager.save_index(index)
+        ActivityManager.save_sync_state(state)
+        activity_events.dispatch('on_activity_updated', old, activity)
     
     @staticmethod
     def delete_activity(activity_id):
-        activities = ActivityManager.load_activities()
-        activities = [a for a in activities if a['id'] != activity_id]
-        ActivityManager.save_activities(activities)
+        found = ActivityManager._find(activity_id)
+        if found is None or found[2].get('deleted_at'):
+            return
+        day, activities, activity = found
+        old = dict(activity)
+        state = ActivityManager.get_sync_state()
+        ActivityManager._track(activity, state)
+        activity['deleted_at'] = activity['updated_at']
+        index = ActivityManager.load_index()
+        ActivityManager.save_day(day, activities, index)
+        ActivityManager.save_index(index)
+        ActivityManager.save_sync_state(state)
+        activity_events.dispatch('on_activity_deleted', old)
+    
+    @staticmethod
+    def restore_activity(activity_id):
+        found = ActivityManager._find(activity_id)
+        if found is None or not found[2].get('deleted_at'):
+            return
+        day, activities, activity = found
+        state = ActivityManager.get_sync_state()
+        del activity['deleted_at']
+        ActivityManager._track(activity, state)
+        index = ActivityManager.load_index()
+        ActivityManager.save_day(day, activities, index)
+        ActivityManager.save_index(index)
+        ActivityManager.save_sync_state(state)
+        activity_events.dispatch('on_activity_added', activity)
     
     @staticmethod
-    def get_recommendations():
+    def reschedule_activities(changes):
+        # changes: tuplas (id, start_time, end_time). Cada día afectado se
+        # lee y se escribe una sola vez para todos los bloques movidos
+        changes = {activity_id: (start, end) for activity_id, start, end in changes}
+        locator = ActivityManager.load_locator()
+        days = {locator['ids'][str(i)] for i in changes if str(i) in locator['ids']}
+        index = ActivityManager.load_index()
+        state = ActivityManager.get_sync_state()
+        updated = []
+        for day in sorted(days):
+            activities = ActivityManager.load_day_all(day)
+            changed = False
+            for activity in activities:
+                change = changes.get(activity['id'])
+                if change is None or activity.get('deleted_at') or change == (activity['start_time'], activity['end_time']):
+                    continue
+                old = dict(activity)
+                activity['start_time'], activity['end_time'] = change
+                ActivityManager._track(activity, state)
+                updated.append((old, activity))
+                changed = True
+            if changed:
+                ActivityManager.save_day(day, activities, index)
+        if not updated:
+            return []
+        ActivityManager.save_index(index)
+        ActivityManager.save_sync_state(state)
+        for old, activity in updated:
+            activity_events.dispatch('on_activity_updated', old, activity)
+        return [activity for old, activity in updated]
+    
+    @staticmethod
+    def purge_deleted(batch_size=200, older_than=None):
+        # Elimina hasta batch_size actividades borradas antes de older_than
+        # (epoch ms), abriendo solo los días que el índice marca con
+        # borradas. Si su borrado aún no está en el servidor dejan una
+        # lápida; las lápidas ya subidas (o todas, si nunca se sincronizó)
+        # se descartan. Devuelve cuántas entradas se eliminaron.
+        if older_than is None:
+            older_than = int(time.time() * 1000) - PURGE_AFTER * 1000
+        index = ActivityManager.load_index()
+        state = ActivityManager.get_sync_state()
+        synced = state['pushed_seq'] or state['pull_cursor']
+        tombstones = state['tombstones']
+        stale = [uid for uid, tombstone in tombstones.items()
+                 if not synced or tombstone['change_seq'] <= state['pushed_seq']][:batch_size]
+        for uid in stale:
+            del tombstones[uid]
+        locator = None
+        purged = 0
+        for day in sorted(day for day, summary in index['days'].items() if summary[3]):
+            if purged >= batch_size:
+                break
+            activities = ActivityManager.load_day_all(day)
+            expired = [a for a in activities
+                       if a.get('deleted_at') and a['deleted_at'] < older_than][:batch_size - purged]
+            if not expired:
+                continue
+            locator = locator or ActivityManager.load_locator()
+            for activity in expired:
+                if synced and activity['change_seq'] > state['pushed_seq']:
+                    tombstones[activity['uid']] = {
+                        'updated_at': activity['updated_at'],
+                        'change_seq': activity['change_seq']
+                    }
+                locator['ids'].pop(str(activity['id']), None)
+                locator['uids'].pop(activity['uid'], None)
+            expired_ids = {a['id'] for a in expired}
+            ActivityManager.save_day(day, [a for a in activities if a['id'] not in expired_ids], index)
+            purged += len(expired)
+        if not purged and not stale:
+            return 0
+        if locator is not None:
+            ActivityManager.save_locator(locator)
+        ActivityManager.save_index(index)
+        ActivityManager.save_sync_state(state)
+        return purged + len(stale)
+    
+    @staticmethod
+    def archive_file():
+        name = 'archive.json.gz' if ARCHIVE_COMPRESS else 'archive.json'
+        return os.path.join(os.path.dirname(ACTIVITIES_FILE), name)
+    
+    @staticmethod
+    def _read_archive():
+        path = ActivityManager.archive_file()
+        if not os.path.exists(path):
+            return []
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return []
+    
+    @staticmethod
+    def load_archive():
+        return decode_records(ActivityManager._read_archive(), ActivityManager.archive_file())
+    
+    @staticmethod
+    def save_archive(records):
+        # Siempre en JSON: se lee poco y gzip ya lo comprime
+        path = ActivityManager.archive_file()
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'wb') as f:
+            f.write(JsonCodec.dumps(encode_records(records)))
+    
+    @staticmethod
+    def archive_activities(batch_size=200, before=None):
+        # Mueve al archivo hasta batch_size actividades completadas de días
+        # anteriores a before (AAAA-MM-DD, por defecto hace
+        # ARCHIVE_AFTER_DAYS días). Siguen siendo actividades, así que no se
+        # emiten eventos. Devuelve cuántas movió.
+        if before is None:
+            before = (datetime.now() - timedelta(days=ARCHIVE_AFTER_DAYS)).strftime('%Y-%m-%d')
+        index = ActivityManager.load_index()
+        days = sorted(day for day, summary in index['days'].items() if day < before and summary[1])
+        moved = []
+        locator = None
+        for day in days:
+            if len(moved) >= batch_size:
+                break
+            activities = ActivityManager.load_day_all(day)
+            old = [a for a in activities if a.get('completed') and not a.get('deleted_at')][:batch_size - len(moved)]
+            if not old:
+                continue
+            locator = locator or ActivityManager.load_locator()
+            for activity in old:
+                locator['ids'].pop(str(activity['id']), None)
+                locator['uids'].pop(activity['uid'], None)
+            old_ids = {a['id'] for a in old}
+            ActivityManager.save_day(day, [a for a in activities if a['id'] not in old_ids], index)
+            moved += old
+        if not moved:
+            return 0
+        ActivityManager.save_archive(ActivityManager.load_archive() + moved)
+        index['archived'] = index.get('archived', 0) + len(moved)
+        index['archive_seq'] = max([index.get('archive_seq', 0)] + [a['change_seq'] for a in moved])
+        ActivityManager.save_locator(locator)
+        ActivityManager.save_index(index)
+        return len(moved)
+    
+    @staticmethod
+    def search(text, include_archive=True):
+        # Busca sin distinguir mayúsculas en título y descripción
+        text = text.lower()
         activities = ActivityManager.load_activities()
+        if include_archive:
+            activities += ActivityManager.load_archive()
+        return [a for a in activities
+                if text in a['title'].lower() or text in a.get('description', '').lower()]
+    
+    @staticmethod
+    def get_local_changes(since, limit):
+        # Cambios posteriores a la marca, en el formato de SyncEngine; solo
+        # se abren los días cuyo change_seq máximo la supera. Las borradas
+        # salen como borrados.
+        index = ActivityManager.load_index()
+        state = ActivityManager.get_sync_state()
+        activities = []
+        for day in sorted(day for day, summary in index['days'].items() if summary[2] > since):
+            activities += ActivityManager.load_day_all(day)
+        if index.get('archive_seq', 0) > since:
+            activities += ActivityManager.load_archive()
+        changes = []
+        for activity in activities:
+            if activity['change_seq'] > since and activity.get('deleted_at'):
+                changes.append((activity['change_seq'], {
+                    'uid': activity['uid'],
+                    'updated_at': activity['updated_at'],
+                    'deleted': True
+                }))
+            elif activity['change_seq'] > since:
+                changes.append((activity['change_seq'], {
+                    'uid': activity['uid'],
+                    'updated_at': activity['updated_at'],
+                    'deleted': False,
+                    'title': activity['title'],
+                    'description': activity['description'],
+                    'priority': priority_label(activity['priority']),
+                    'date': activity['date'],
+                    'start_time': activity['start_time'],
+                    'end_time': activity['end_time'],
+                    'completed': bool(activity['completed']),
+                }))
+        for uid, tombstone in state['tombstones'].items():
+            if tombstone['change_seq'] > since:
+                changes.append((tombstone['change_seq'], {
+                    'uid': uid,
+                    'updated_at': tombstone['updated_at'],
+                    'deleted': True
+                }))
+        changes.sort(key=lambda change: change[0])
+        return changes[:limit]
+    
+    @staticmethod
+    def apply_remote_changes(changes, notify=True):
+        # Gana la última escritura según updated_at; lo que aún no se ha
+        # subido se queda como está. Lo aplicado lleva change_seq 0 para no
+        # volver a subirlo. Los campos que esta app no guarda se ignoran; sin
+        # fecha, una actividad nueva va a hoy.
+        index = ActivityManager.load_index()
+        locator = ActivityManager.load_locator()
+        state = ActivityManager.get_sync_state()
+        days = {}
+        
+        def day_records(day):
+            if day not in days:
+                days[day] = ActivityManager.load_day_all(day)
+            return days[day]
+        
+        def find(uid):
+            day = locator['uids'].get(uid)
+            if day is None:
+                return None
+            return next((a for a in day_records(day) if a['uid'] == uid), None)
+        
+        archive = None
+        unarchived = False
+        events = []
+        for change in changes:
+            uid = change['uid']
+            old = find(uid)
+            if old is None and uid not in state['tombstones']:
+                # Lo archivado vuelve a su día antes de cambiarlo
+                if archive is None:
+                    archive = ActivityManager.load_archive()
+                record = next((a for a in archive if a['uid'] == uid), None)
+                if record is not None:
+                    archive.remove(record)
+                    index['archived'] = max(index.get('archived', 0) - 1, 0)
+                    unarchived = True
+                    day_records(record['date']).append(record)
+                    locator['uids'][uid] = record['date']
+                    old = record
+            local = old or state['tombstones'].get(uid)
+            if local is not None and local_wins(local['updated_at'], local['change_seq'], state['pushed_seq'],
+                                                change['updated_at']):
+                continue
+            if change['deleted']:
+                if old is not None:
+                    activity = dict(old, updated_at=change['updated_at'], change_seq=0)
+                    activity.setdefault('deleted_at', change['updated_at'])
+                    records = day_records(old['date'])
+                    records[records.index(old)] = activity
+                    if not old.get('deleted_at'):
+                        events.append(('on_activity_deleted', old))
+                else:
+                    state['tombstones'][uid] = {'updated_at': change['updated_at'], 'change_seq': 0}
+                continue
+            state['tombstones'].pop(uid, None)
+            if old is not None:
+                activity = dict(old)
+            else:
+                activity = {'id': index['next_id'], 'uid': uid, 'description': '', 'start_time': '',
+                            'end_time': '', 'date': today()}
+                index['next_id'] += 1
+            for key in ('title', 'description', 'date', 'start_time', 'end_time'):
+                if change.get(key) is not None:
+                    activity[key] = change[key]
+            activity['priority'] = priority_code(change.get('priority', activity.get('priority')))
+            activity['completed'] = bool(change.get('completed'))
+            activity['updated_at'] = change['updated_at']
+            activity['change_seq'] = 0
+            activity.pop('deleted_at', None)
+            if old is not None:
+                records = day_records(old['date'])
+                records.remove(old)
+            day_records(activity['date']).append(activity)
+            locator['ids'][str(activity['id'])] = activity['date']
+            locator['uids'][uid] = activity['date']
+            if old is not None and old.get('deleted_at'):
+                events.append(('on_activity_added', activity))
+            elif old is not None:
+                events.append(('on_activity_updated', old, activity))
+            else:
+                events.append(('on_activity_added', activity))
+        for day, records in days.items():
+            ActivityManager.save_day(day, records, index)
+        ActivityManager.save_locator(locator)
+        ActivityManager.save_index(index)
+        ActivityManager.save_sync_state(state)
+        if unarchived:
+            ActivityManager.save_archive(archive)
+        if notify:
+            for event in events:
+                activity_events.dispatch(*event)
+        return len(events)
+    
+    @staticmethod
+    def get_recommendations(day=None):
+        activities = ActivityManager.load_day(day)
         # Lógica simple de recomendación basada en prioridades
-        high_priority = [a for a in activities if a['priority'] == 'Alta' and not a['completed']]
+        high_priority = [a for a in activities if a['priority'] == PRIORITY_HIGH and not a['completed']]
         if high_priority:
             return "Recomendación: Enfócate primero en tus actividades de alta prioridad."
         return "¡Buen trabajo! Estás al día con tus actividades prioritarias."
 
+# Servidor de sincronización, p. ej. http://127.0.0.1:8765 con sync_server.py;
+# SyncEngine (zenith_core) habla el mismo protocolo que la app KivyMD
+SYNC_URL = os.environ.get('ZENITH_SYNC_URL')
+SYNC_INTERVAL = 30.0
+
+# Estadísticas que se actualizan con cada cambio, sin recorrer la lista
+class ActivityStats(EventDispatcher):
+    total = NumericProperty(0)
+    completed = NumericProperty(0)
+
+    def __init__(self, **kwargs):
+        super(ActivityStats, self).__init__(**kwargs)
+        self.loaded = False
+        activity_events.bind(
+            on_activity_added=self._on_added,
+            on_activity_updated=self._on_updated,
+            on_activity_deleted=self._on_deleted
+        )
+
+    def load(self):
+        # Del resumen por día del índice, sin abrir ningún día. Lo archivado
+        # cuenta: son actividades completadas
+        index = ActivityManager.load_index()
+        archived = index.get('archived', 0)
+        self.total = sum(summary[0] for summary in index['days'].values()) + archived
+        self.completed = sum(summary[1] for summary in index['days'].values()) + archived
+        self.loaded = True
+
+    def _apply(self, activity, sign):
+        self.total += sign
+        if activity.get('completed', False):
+            self.completed += sign
+
+    def _on_added(self, dispatcher, activity):
+        if self.loaded:
+            self._apply(activity, 1)
+
+    def _on_updated(self, dispatcher, old, new):
+        if self.loaded:
+            self._apply(old, -1)
+            self._apply(new, 1)
+
+    def _on_deleted(self, dispatcher, activity):
+        if self.loaded:
+            self._apply(activity, -1)
+
+activity_stats = ActivityStats()
+
+def get_activity_stats():
+    if not activity_stats.loaded:
+        activity_stats.load()
+    return activity_stats
+
+# Añade las tarjetas de una lista por tandas: la primera pantalla al
+# momento y el resto en los frames siguientes, sin pasar de frame_budget
+# segundos por frame. Empezar otra lista o cancel() abandona la anterior
+class ProgressiveRenderer:
+    frame_budget = 0.012
+    
+    def __init__(self):
+        self.items = None
+        self.add = None
+        self.event = None
+    
+    def start(self, items, add, first=0):
+        # add(item) crea y añade la tarjeta de un elemento
+        self.cancel()
+        self.items = iter(items)
+        self.add = add
+        for item in itertools.islice(self.items, first):
+            add(item)
+        self.event = Clock.schedule_interval(self._step, 0)
+    
+    def _step(self, dt):
+        deadline = time.perf_counter() + self.frame_budget
+        for item in self.items:
+            self.add(item)
+            if time.perf_counter() >= deadline:
+                return
+        self.cancel()
+        return False
+    
+    def cancel(self):
+        if self.event is not None:
+            self.event.cancel()
+        self.items = self.add = self.event = None
+    
+    def flush(self):
+        # Añade todo lo pendiente sin mirar el presupuesto
+        if self.items is not None:
+            for item in self.items:
+                self.add(item)
+        self.cancel()
+
+# Un Color por cada color de fondo, compartido por todas las tarjetas
+_card_colors = {}
+
+def card_color(rgba):
+    rgba = tuple(rgba)
+    if rgba not in _card_colors:
+        _card_colors[rgba] = Color(*rgba)
+    return _card_colors[rgba]
+
+# BoxLayout con fondo redondeado. El rectángulo se recoloca en do_layout, que
+# BoxLayout ya ejecuta una vez por frame cuando cambian pos o size, así que
+# pos y size no llevan callbacks propios. El color y el radio sí: las reglas
+# de zenith.kv los asignan después de construir la tarjeta
+class CardLayout(BoxLayout):
+    background_color = ListProperty(SECONDARY_COLOR)
+    radius = NumericProperty(dp(10))
+    
+    def __init__(self, **kwargs):
+        super(CardLayout, self).__init__(**kwargs)
+        self.background = RoundedRectangle(pos=self.pos, size=self.size, radius=[self.radius])
+        self.fill_color = card_color(self.background_color)
+        self.canvas.before.add(self.fill_color)
+        self.canvas.before.add(self.background)
+        self.fbind('background_color', self.update_background_color)
+        self.fbind('radius', self.update_radius)
+    
+    def update_background_color(self, *args):
+        # Los Color se comparten entre tarjetas: se cambia cuál se usa, no
+        # el valor del compartido
+        color = card_color(self.background_color)
+        if color is not self.fill_color:
+            self.canvas.before.insert(self.canvas.before.indexof(self.fill_color), color)
+            self.canvas.before.remove(self.fill_color)
+            self.fill_color = color
+    
+    def update_radius(self, *args):
+        self.background.radius = [self.radius]
+    
+    def do_layout(self, *largs):
+        self.background.pos = self.pos
+        self.background.size = self.size
+        super(CardLayout, self).do_layout(*largs)
+
+# Tarjeta de actividad de la pantalla de inicio (estructura en zenith.kv)
+class HomeActivityCard(CardLayout):
+    def __init__(self, **kwargs):
+        super(HomeActivityCard, self).__init__(**kwargs)
+        self.owner = None
+        self.activity_id = None
+    
+    def set_activity(self, activity, owner):
+        ids = self.ids
+        self.owner = owner
+        self.activity_id = activity['id']
+        ids.title_label.text = activity['title']
+        ids.priority_label.text = priority_label(activity['priority'])
+        ids.priority_label.color = priority_color(activity['priority'])
+        ids.time_label.text = f"{activity['start_time']} - {activity['end_time']}"
+    
+    def on_edit(self, instance):
+        if self.owner is not None:
+            self.owner.edit_activity(self.activity_id)
+    
+    def on_delete(self, instance):
+        if self.owner is not None:
+            self.owner.delete_activity(self.activity_id)
+
+# Franja del horario (estructura en zenith.kv)
+class ScheduleSlot(BoxLayout):
+    def set_activity(self, activity, owner):
+        ids = self.ids
+        ids.time_label.text = f"{activity['start_time']}\n{activity['end_time']}"
+        ids.title_label.text = activity['title']
+        ids.priority_label.text = f"Prioridad: {priority_label(activity['priority'])}"
+        ids.priority_label.color = priority_color(activity['priority'])
+
+# Separador entre franjas del horario
+class ScheduleSeparator(CardLayout):
+    pass
+
+# Cuadrícula horaria de un día (ver TimeGrid en zenith_core); on_reschedule
+# recibe (id, inicio, fin) por cada bloque soltado, lo que espera
+# ActivityManager.reschedule_activities
+class TimeGrid(zenith_core.TimeGrid):
+    # Las actividades ya son diccionarios con las claves que lee la
+    # cuadrícula; solo el color depende de la prioridad
+    def activity_color(self, activity):
+        return card_color(priority_color(activity['priority']))
+
 # Pantalla de inicio
 class HomeScreen(Screen):
     def __init__(self, **kwargs):
         super(HomeScreen, self).__init__(**kwargs)
-        self.layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
-        
-        # Encabezado
-        header = BoxLayout(size_hint=(1, 0.15))
-        title = Label(text='Zenith', font_size=dp(24), bold=True, color=(0.2, 0.2, 0.2, 1))
-        header.add_widget(title)
-        self.layout.add_widget(header)
-        
-        # Recomendaciones
-        self.recommendation_label = Label(
-            text="Cargando recomendaciones...", 
-            size_hint=(1, 0.1),
-            color=(0.2, 0.2, 0.2, 1),
-            halign='left',
-            valign='middle'
-        )
-        self.recommendation_label.bind(size=self.recommendation_label.setter('text_size'))
-        self.layout.add_widget(self.recommendation_label)
-        
-        # Lista de actividades
-        self.activities_container = GridLayout(cols=1, spacing=dp(10), size_hint_y=None)
-        self.activities_container.bind(minimum_height=self.activities_container.setter('height'))
-        
-        scroll_view = ScrollView(size_hint=(1, 0.65))
-        scroll_view.add_widget(self.activities_container)
-        self.layout.add_widget(scroll_view)
-        
-        # Botones de navegación
-        nav_buttons = BoxLayout(size_hint=(1, 0.1), spacing=dp(10))
-        
-        add_button = Button(
-            text="+", 
-            font_size=dp(20),
-            background_color=PRIMARY_COLOR,
-            size_hint=(0.2, 1)
+        self.card_pool = WidgetPool()
+        self.empty_label = Label(
+            text="No hay actividades. ¡Añade una!",
+            size_hint_y=None,
+            height=dp(50),
+            color=(0.5, 0.5, 0.5, 1)
         )
-        add_button.bind(on_release=self.go_to_add_activity)
-        
-        profile_button = Button(
-            text="Perfil", 
-            background_color=PRIMARY_COLOR,
-            size_hint=(0.4, 1)
-        )
-        profile_button.bind(on_release=self.go_to_profile)
-        
-        schedule_button = Button(
-            text="Horario", 
-            background_color=PRIMARY_COLOR,
-            size_hint=(0.4, 1)
-        )
-        schedule_button.bind(on_release=self.go_to_schedule)
-        
-        nav_buttons.add_widget(add_button)
-        nav_buttons.add_widget(schedule_button)
-        nav_buttons.add_widget(profile_button)
-        
-        self.layout.add_widget(nav_buttons)
-        self.add_widget(self.layout)
+        self.undo_bar = None
+        # Un único evento para ocultar la barra; cada borrado lo reprograma
+        # en lugar de crear otro evento con su propia closure
+        self.undo_event = Clock.create_trigger(self.hide_undo, UNDO_DURATION)
+        self.undo_id = None
+        self.renderer = ProgressiveRenderer()
     
     def on_enter(self):
         self.update_activities()
         self.update_recommendations()
     
+    def on_leave(self):
+        self.renderer.cancel()
+    
     def update_activities(self):
-        self.activities_container.clear_widgets()
-        activities = ActivityManager.load_activities()
+        container = self.ids.activities_container
+        self.renderer.cancel()
+        self.card_pool.release_all(container)
+        # Solo el archivo de hoy, no todo el historial
+        activities = ActivityManager.load_day()
         
         if not activities:
-            label = Label(
-                text="No hay actividades. ¡Añade una!",
-                size_hint_y=None,
-                height=dp(50),
-                color=(0.5, 0.5, 0.5, 1)
-            )
-            self.activities_container.add_widget(label)
+            container.add_widget(self.empty_label)
             return
         
-        for activity in activities:
-            activity_card = BoxLayout(
-                orientation='vertical',
-                size_hint_y=None,
-                height=dp(100),
-                padding=dp(10),
-                spacing=dp(5)
-            )
-            activity_card.canvas.before.add(Color(*SECONDARY_COLOR))
-            activity_card.canvas.before.add(RoundedRectangle(pos=activity_card.pos, size=activity_card.size, radius=[dp(10)]))
-            
-            title_row = BoxLayout(size_hint=(1, 0.4))
-            title_label = Label(
-                text=activity['title'],
-                color=(0.2, 0.2, 0.2, 1),
-                bold=True,
-                halign='left',
-                valign='middle',
-                size_hint=(0.7, 1)
-            )
-            title_label.bind(size=title_label.setter('text_size'))
-            
-            priority_color = ACCENT_COLOR if activity['priority'] == 'Alta' else (0.2, 0.6, 0.2, 1) if activity['priority'] == 'Media' else (0.6, 0.6, 0.2, 1)
-            priority_label = Label(
-                text=activity['priority'],
-                color=priority_color,
-                size_hint=(0.3, 1)
-            )
-            
-            title_row.add_widget(title_label)
-            title_row.add_widget(priority_label)
-            
-            time_label = Label(
-                text=f"{activity['start_time']} - {activity['end_time']}",
-                color=(0.4, 0.4, 0.4, 1),
-                halign='left',
-                valign='middle',
-                size_hint=(1, 0.3)
-            )
-            time_label.bind(size=time_label.setter('text_size'))
-            
-            buttons_row = BoxLayout(size_hint=(1, 0.3), spacing=dp(5))
-            
-            edit_button = Button(
-                text="Editar",
-                size_hint=(0.5, 1),
-                background_color=PRIMARY_COLOR
-            )
-            edit_button.bind(on_release=lambda btn, id=activity['id']: self.edit_activity(id))
-            
-            delete_button = Button(
-                text="Eliminar",
-                size_hint=(0.5, 1),
-                background_color=ACCENT_COLOR
-            )
-            delete_button.bind(on_release=lambda btn, id=activity['id']: self.delete_activity(id))
-            
-            buttons_row.add_widget(edit_button)
-            buttons_row.add_widget(delete_button)
-            
-            activity_card.add_widget(title_row)
-            activity_card.add_widget(time_label)
-            activity_card.add_widget(buttons_row)
-            
-            self.activities_container.add_widget(activity_card)
+        activities.sort(key=lambda x: x['start_time'])
+        # Tarjeta de dp(100) más dp(10) de separación
+        self.renderer.start(activities, self.add_card, first=screenful(dp(110)))
+    
+    def add_card(self, activity):
+        activity_card = self.card_pool.acquire(HomeActivityCard)
+        activity_card.set_activity(activity, self)
+        self.ids.activities_container.add_widget(activity_card)
     
     def update_recommendations(self):
         recommendation = ActivityManager.get_recommendations()
-        self.recommendation_label.text = recommendation
+        self.ids.recommendation_label.text = recommendation
     
-    def go_to_add_activity(self, instance):
+    def go_to_add_activity(self, instance=None):
         self.manager.current = 'add_activity'
     
-    def go_to_profile(self, instance):
+    def go_to_profile(self, instance=None):
         self.manager.current = 'profile'
     
-    def go_to_schedule(self, instance):
+    def go_to_schedule(self, instance=None):
         self.manager.current = 'schedule'
     
     def edit_activity(self, activity_id):
-        activities = ActivityManager.load_activities()
+        activities = ActivityManager.load_day()
         activity = next((a for a in activities if a['id'] == activity_id), None)
         if activity:
             self.manager.get_screen('add_activity').load_activity(activity)
             self.manager.current = 'add_activity'
     
     def delete_activity(self, activity_id):
-        def confirm_delete(instance):
-            ActivityManager.delete_activity(activity_id)
+        # Se borra al momento y se ofrece deshacer, en vez de confirmar antes
+        ActivityManager.delete_activity(activity_id)
+        self.update_activities()
+        self.update_recommendations()
+        self.show_undo(activity_id)
+    
+    def show_undo(self, activity_id):
+        if self.undo_bar is None:
+            self.undo_bar = Factory.UndoBar()
+            self.undo_bar.ids.undo_button.bind(on_release=self.undo_delete)
+        self.undo_id = activity_id
+        if self.undo_bar.parent is None:
+            self.ids.layout.add_widget(self.undo_bar)
+        self.undo_event.cancel()
+        self.undo_event()
+    
+    def hide_undo(self, dt=None):
+        self.undo_event.cancel()
+        if self.undo_bar is not None and self.undo_bar.parent is not None:
+            self.ids.layout.remove_widget(self.undo_bar)
+        self.undo_id = None
+    
+    def undo_delete(self, instance=None):
+        if self.undo_id is not None:
+            ActivityManager.restore_activity(self.undo_id)
             self.update_activities()
             self.update_recommendations()
-            popup.dismiss()
-        
-        content = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
-        content.add_widget(Label(text='¿Estás seguro de que quieres eliminar esta actividad?'))
-        
-        buttons = BoxLayout(size_hint=(1, 0.4), spacing=dp(10))
-        cancel_button = Button(text='Cancelar')
-        cancel_button.bind(on_release=lambda x: popup.dismiss())
-        
-        confirm_button = Button(text='Eliminar', background_color=ACCENT_COLOR)
-        confirm_button.bind(on_release=confirm_delete)
-        
-        buttons.add_widget(cancel_button)
-        buttons.add_widget(confirm_button)
-        content.add_widget(buttons)
-        
-        popup = Popup(title='Confirmar eliminación', content=content, size_hint=(0.8, 0.4))
-        popup.open()
+        self.hide_undo()
 
 # Pantalla para añadir/editar actividad
 class AddActivityScreen(Screen):
     def __init__(self, **kwargs):
         super(AddActivityScreen, self).__init__(**kwargs)
-        self.layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
         self.editing_id = None
-        
-        # Título de la pantalla
-        self.screen_title = Label(
-            text='Añadir Actividad',
-            font_size=dp(20),
-            bold=True,
-            size_hint=(1, 0.1),
-            color=(0.2, 0.2, 0.2, 1)
-        )
-        self.layout.add_widget(self.screen_title)
-        
-        # Formulario
-        form = GridLayout(cols=1, spacing=dp(15), size_hint=(1, 0.8))
-        
-        # Título
-        form.add_widget(Label(text='Título', halign='left', size_hint=(1, 0.1), color=(0.2, 0.2, 0.2, 1)))
-        self.title_input = TextInput(multiline=False, size_hint=(1, 0.1))
-        form.add_widget(self.title_input)
-        
-        # Descripción
-        form.add_widget(Label(text='Descripción', halign='left', size_hint=(1, 0.1), color=(0.2, 0.2, 0.2, 1)))
-        self.description_input = TextInput(multiline=True, size_hint=(1, 0.2))
-        form.add_widget(self.description_input)
-        
-        # Hora de inicio
-        form.add_widget(Label(text='Hora de inicio', halign='left', size_hint=(1, 0.1), color=(0.2, 0.2, 0.2, 1)))
-        self.start_time_input = TextInput(multiline=False, size_hint=(1, 0.1), hint_text='HH:MM')
-        form.add_widget(self.start_time_input)
-        
-        # Hora de fin
-        form.add_widget(Label(text='Hora de fin', halign='left', size_hint=(1, 0.1), color=(0.2, 0.2, 0.2, 1)))
-        self.end_time_input = TextInput(multiline=False, size_hint=(1, 0.1), hint_text='HH:MM')
-        form.add_widget(self.end_time_input)
-        
-        # Prioridad
-        form.add_widget(Label(text='Prioridad', halign='left', size_hint=(1, 0.1), color=(0.2, 0.2, 0.2, 1)))
-        self.priority_spinner = Spinner(
-            text='Media',
-            values=('Alta', 'Media', 'Baja'),
-            size_hint=(1, 0.1),
-            background_color=PRIMARY_COLOR
-        )
-        form.add_widget(self.priority_spinner)
-        
-        self.layout.add_widget(form)
-        
-        # Botones
-        buttons = BoxLayout(size_hint=(1, 0.1), spacing=dp(10))
-        
-        cancel_button = Button(
-            text='Cancelar',
-            size_hint=(0.5, 1),
-            background_color=(0.7, 0.7, 0.7, 1)
-        )
-        cancel_button.bind(on_release=self.cancel)
-        
-        self.save_button = Button(
-            text='Guardar',
-            size_hint=(0.5, 1),
-            background_color=PRIMARY_COLOR
-        )
-        self.save_button.bind(on_release=self.save_activity)
-        
-        buttons.add_widget(cancel_button)
-        buttons.add_widget(self.save_button)
-        
-        self.layout.add_widget(buttons)
-        self.add_widget(self.layout)
+        self.ids.priority_spinner.values = PRIORITY_LABELS
+        self.ids.priority_spinner.text = PRIORITY_LABELS[PRIORITY_DEFAULT]
+        self.ids.date_input.text = today()
+        # Se valida al dejar de escribir, no en cada tecla; parse_time y
+        # parse_date recuerdan sus resultados, así que cada pasada solo
+        # analiza el campo que cambió
+        self._validate_trigger = Clock.create_trigger(self.validate, 0.15)
+        for key, field in self.validated_fields().items():
+            field.bind(text=self.on_field_text)
+            if key != 'title':
+                field.bind(focus=functools.partial(self.on_field_focus, key))
+    
+    def validated_fields(self):
+        ids = self.ids
+        return {
+            'title': ids.title_input,
+            'date': ids.date_input,
+            'start_time': ids.start_time_input,
+            'end_time': ids.end_time_input,
+        }
+    
+    def parse(self):
+        fields = self.validated_fields()
+        return validate_activity_input(*(fields[key].text for key in ('title', 'date', 'start_time', 'end_time')))
+    
+    def validate(self, dt=None):
+        # Mientras se escribe, el título vacío no se marca hasta guardar
+        values, errors = self.parse()
+        if dt is not None:
+            errors.pop('title', None)
+        for key, field in self.validated_fields().items():
+            field.foreground_color = ACCENT_COLOR if key in errors else (0, 0, 0, 1)
+        self.ids.form_error.text = next(iter(errors.values()), '')
+        return values, errors
+    
+    def on_field_text(self, field, text):
+        self._validate_trigger()
+    
+    def on_field_focus(self, key, field, focused):
+        # "9am" pasa a "09:00" al salir del campo
+        if not focused:
+            value = self.parse()[0][key]
+            if value is not None and value != field.text:
+                field.text = value
     
     def load_activity(self, activity):
+        ids = self.ids
         self.editing_id = activity['id']
-        self.screen_title.text = 'Editar Actividad'
-        self.title_input.text = activity['title']
-        self.description_input.text = activity['description']
-        self.start_time_input.text = activity['start_time']
-        self.end_time_input.text = activity['end_time']
-        self.priority_spinner.text = activity['priority']
-        self.save_button.text = 'Actualizar'
+        ids.screen_title.text = 'Editar Actividad'
+        ids.title_input.text = activity['title']
+        ids.description_input.text = activity['description']
+        ids.date_input.text = activity['date']
+        ids.start_time_input.text = activity['start_time']
+        ids.end_time_input.text = activity['end_time']
+        ids.priority_spinner.text = priority_label(activity['priority'])
+        ids.save_button.text = 'Actualizar'
     
     def clear_form(self):
+        ids = self.ids
         self.editing_id = None
-        self.screen_title.text = 'Añadir Actividad'
-        self.title_input.text = ''
-        self.description_input.text = ''
-        self.start_time_input.text = ''
-        self.end_time_input.text = ''
-        self.priority_spinner.text = 'Media'
-        self.save_button.text = 'Guardar'
-    
-    def cancel(self, instance):
+        ids.screen_title.text = 'Añadir Actividad'
+        ids.title_input.text = ''
+        ids.description_input.text = ''
+        ids.date_input.text = today()
+        ids.start_time_input.text = ''
+        ids.end_time_input.text = ''
+        ids.priority_spinner.text = PRIORITY_LABELS[PRIORITY_DEFAULT]
+        ids.save_button.text = 'Guardar'
+        self._validate_trigger.cancel()
+        self.validate(0)
+    
+    def cancel(self, instance=None):
         self.clear_form()
         self.manager.current = 'home'
     
-    def save_activity(self, instance):
-        title = self.title_input.text.strip()
-        description = self.description_input.text.strip()
-        start_time = self.start_time_input.text.strip()
-        end_time = self.end_time_input.text.strip()
-        priority = self.priority_spinner.text
-        
-        if not title or not start_time or not end_time:
-            self.show_error('Por favor completa todos los campos obligatorios')
-            return
-        
-        try:
-            # Validación simple de formato de hora
-            datetime.strptime(start_time, '%H:%M')
-            datetime.strptime(end_time, '%H:%M')
-        except ValueError:
-            self.show_error('Formato de hora inválido. Usa HH:MM')
+    def save_activity(self, instance=None):
+        ids = self.ids
+        self._validate_trigger.cancel()
+        values, errors = self.validate()
+        if errors:
+            self.show_error(next(iter(errors.values())))
             return
+        title = values['title']
+        description = ids.description_input.text.strip()
+        date = values['date']
+        start_time = values['start_time']
+        end_time = values['end_time']
+        priority = priority_code(ids.priority_spinner.text)
         
         if self.editing_id:
             ActivityManager.update_activity(
                 self.editing_id,
                 title=title,
                 description=description,
+                date=date,
                 start_time=start_time,
                 end_time=end_time,
                 priority=priority
@@ -423,6 +1390,7 @@ class AddActivityScreen(Screen):
             ActivityManager.add_activity(
                 title=title,
                 description=description,
+                date=date,
                 start_time=start_time,
                 end_time=end_time,
                 priority=priority
@@ -443,48 +1411,48 @@ class AddActivityScreen(Screen):
 class ScheduleScreen(Screen):
     def __init__(self, **kwargs):
         super(ScheduleScreen, self).__init__(**kwargs)
-        self.layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
-        
-        # Título
-        header = BoxLayout(size_hint=(1, 0.1))
-        title = Label(text='Tu Horario', font_size=dp(20), bold=True, color=(0.2, 0.2, 0.2, 1))
-        header.add_widget(title)
-        self.layout.add_widget(header)
-        
-        # Horario
-        self.schedule_container = GridLayout(cols=1, spacing=dp(5), size_hint_y=None)
-        self.schedule_container.bind(minimum_height=self.schedule_container.setter('height'))
-        
-        scroll_view = ScrollView(size_hint=(1, 0.8))
-        scroll_view.add_widget(self.schedule_container)
-        self.layout.add_widget(scroll_view)
-        
-        # Botón de regreso
-        back_button = Button(
-            text='Volver',
-            size_hint=(1, 0.1),
-            background_color=PRIMARY_COLOR
+        self.card_pool = WidgetPool()
+        self.empty_label = Label(
+            text="No hay actividades programadas",
+            size_hint_y=None,
+            height=dp(50),
+            color=(0.5, 0.5, 0.5, 1)
         )
-        back_button.bind(on_release=self.go_back)
-        self.layout.add_widget(back_button)
-        
-        self.add_widget(self.layout)
+        self.time_grid = None
+        self.show_grid = False
+        self.current_day = today()
     
     def on_enter(self):
         self.update_schedule()
     
+    def shift_day(self, days):
+        self.current_day = shift_date(self.current_day, days)
+        self.update_schedule()
+    
+    def go_to_today(self, instance=None):
+        self.current_day = today()
+        self.update_schedule()
+    
+    def toggle_view(self, instance=None):
+        self.show_grid = not self.show_grid
+        self.ids.view_button.text = 'Lista' if self.show_grid else 'Cuadrícula'
+        self.update_schedule()
+    
     def update_schedule(self):
-        self.schedule_container.clear_widgets()
-        activities = ActivityManager.load_activities()
+        scroll = self.ids.schedule_scroll
+        container = self.ids.schedule_container
+        self.ids.day_label.text = self.current_day
+        if self.show_grid:
+            self.update_grid()
+            return
+        if self.time_grid is not None and self.time_grid.parent is not None:
+            scroll.clear_widgets()
+            scroll.add_widget(container.__self__)
+        self.card_pool.release_all(container)
+        activities = ActivityManager.load_day(self.current_day)
         
         if not activities:
-            label = Label(
-                text="No hay actividades programadas",
-                size_hint_y=None,
-                height=dp(50),
-                color=(0.5, 0.5, 0.5, 1)
-            )
-            self.schedule_container.add_widget(label)
+            container.add_widget(self.empty_label)
             return
         
         # Ordenar actividades por hora de inicio
@@ -492,163 +1460,53 @@ class ScheduleScreen(Screen):
         
         # Crear horario visual
         for i, activity in enumerate(activities):
-            time_slot = BoxLayout(
-                orientation='horizontal',
-                size_hint_y=None,
-                height=dp(60),
-                padding=dp(5)
-            )
-            
-            # Indicador de tiempo
-            time_label = Label(
-                text=f"{activity['start_time']}\n{activity['end_time']}",
-                size_hint=(0.2, 1),
-                color=(0.4, 0.4, 0.4, 1)
-            )
-            
-            # Contenido de la actividad
-            activity_content = BoxLayout(
-                orientation='vertical',
-                size_hint=(0.8, 1),
-                padding=dp(10)
-            )
-            activity_content.canvas.before.add(Color(*SECONDARY_COLOR))
-            activity_content.canvas.before.add(RoundedRectangle(pos=activity_content.pos, size=activity_content.size, radius=[dp(5)]))
-            
-            title_label = Label(
-                text=activity['title'],
-                color=(0.2, 0.2, 0.2, 1),
-                bold=True,
-                halign='left',
-                valign='middle',
-                size_hint=(1, 0.6)
-            )
-            title_label.bind(size=title_label.setter('text_size'))
-            
-            priority_color = ACCENT_COLOR if activity['priority'] == 'Alta' else (0.2, 0.6, 0.2, 1) if activity['priority'] == 'Media' else (0.6, 0.6, 0.2, 1)
-            priority_label = Label(
-                text=f"Prioridad: {activity['priority']}",
-                color=priority_color,
-                halign='left',
-                valign='middle',
-                size_hint=(1, 0.4)
-            )
-            priority_label.bind(size=priority_label.setter('text_size'))
-            
-            activity_content.add_widget(title_label)
-            activity_content.add_widget(priority_label)
-            
-            time_slot.add_widget(time_label)
-            time_slot.add_widget(activity_content)
-            
-            self.schedule_container.add_widget(time_slot)
+            time_slot = self.card_pool.acquire(ScheduleSlot)
+            time_slot.set_activity(activity, self)
+            container.add_widget(time_slot)
             
             # Añadir separador si no es el último elemento
             if i < len(activities) - 1:
-                separator = BoxLayout(size_hint_y=None, height=dp(1))
-                separator.canvas.before.add(Color(0.8, 0.8, 0.8, 1))
-                separator.canvas.before.add(Rectangle(pos=separator.pos, size=separator.size))
-                self.schedule_container.add_widget(separator)
+                container.add_widget(self.card_pool.acquire(ScheduleSeparator))
     
-    def go_back(self, instance):
+    def update_grid(self):
+        scroll = self.ids.schedule_scroll
+        if self.time_grid is None:
+            # Los bloques se arrastran tras mantener pulsado: un deslizamiento
+            # rápido lo sigue recibiendo el ScrollView
+            self.time_grid = TimeGrid(on_reschedule=self.on_reschedule)
+        if self.time_grid.parent is None:
+            # clear_widgets y no remove_widget: ids guarda proxies débiles y
+            # ScrollView compara su hijo por identidad
+            scroll.clear_widgets()
+            scroll.add_widget(self.time_grid)
+        self.time_grid.set_days([self.current_day], [ActivityManager.load_day(self.current_day)])
+        # Empezar hacia las 07:00 en vez de a medianoche
+        overflow = self.time_grid.height - scroll.height
+        if overflow > 0:
+            scroll.scroll_y = max(0, 1 - 7 * self.time_grid.hour_height / overflow)
+    
+    def on_reschedule(self, grid, changes):
+        ActivityManager.reschedule_activities(changes)
+    
+    def go_back(self, instance=None):
         self.manager.current = 'home'
 
 # Pantalla de perfil
 class ProfileScreen(Screen):
     def __init__(self, **kwargs):
         super(ProfileScreen, self).__init__(**kwargs)
-        self.layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
-        
-        # Título
-        header = BoxLayout(size_hint=(1, 0.1))
-        title = Label(text='Tu Perfil', font_size=dp(20), bold=True, color=(0.2, 0.2, 0.2, 1))
-        header.add_widget(title)
-        self.layout.add_widget(header)
-        
-        # Contenido del perfil
-        profile_content = BoxLayout(orientation='vertical', size_hint=(1, 0.8), spacing=dp(15))
-        
-        # Avatar (usando un widget en lugar de una imagen)
-        avatar_container = BoxLayout(size_hint=(1, 0.3), padding=dp(10))
-        
-        # Widget personalizado para el avatar
-        avatar = Widget(size_hint=(None, None), size=(dp(100), dp(100)), pos_hint={'center_x': 0.5, 'center_y': 0.5})
-        
-        with avatar.canvas:
-            # Color azul para el avatar
-            Color(0.29, 0.56, 0.89, 1)  # RGB para #4a90e2
-            
-            # Círculo para la cabeza
-            Ellipse(pos=(avatar.center_x - dp(25), avatar.center_y + dp(10)), size=(dp(50), dp(50)))
-            
-            # Rectángulo para el cuerpo
-            Rectangle(pos=(avatar.center_x - dp(40), avatar.center_y - dp(50)), size=(dp(80), dp(60)))
-        
-        avatar_container.add_widget(avatar)
-        profile_content.add_widget(avatar_container)
-        
-        # Información del usuario
-        user_info = GridLayout(cols=2, spacing=dp(10), size_hint=(1, 0.5))
-        
-        user_info.add_widget(Label(text='Nombre:', halign='right', color=(0.2, 0.2, 0.2, 1)))
-        self.name_input = TextInput(text='Usuario', multiline=False)
-        user_info.add_widget(self.name_input)
-        
-        user_info.add_widget(Label(text='Email:', halign='right', color=(0.2, 0.2, 0.2, 1)))
-        self.email_input = TextInput(text='usuario@ejemplo.com', multiline=False)
-        user_info.add_widget(self.email_input)
-        
-        user_info.add_widget(Label(text='Preferencias:', halign='right', color=(0.2, 0.2, 0.2, 1)))
-        self.preferences_input = TextInput(text='Tema claro', multiline=False)
-        user_info.add_widget(self.preferences_input)
-        
-        profile_content.add_widget(user_info)
-        
-        # Estadísticas
-        stats = BoxLayout(orientation='vertical', size_hint=(1, 0.2), spacing=dp(5))
-        stats.add_widget(Label(text='Estadísticas', font_size=dp(18), bold=True, color=(0.2, 0.2, 0.2, 1)))
-        
-        activities = ActivityManager.load_activities()
-        total_activities = len(activities)
-        completed_activities = len([a for a in activities if a.get('completed', False)])
-        
-        stats.add_widget(Label(
-            text=f'Actividades totales: {total_activities}',
-            color=(0.2, 0.2, 0.2, 1)
-        ))
-        stats.add_widget(Label(
-            text=f'Actividades completadas: {completed_activities}',
-            color=(0.2, 0.2, 0.2, 1)
-        ))
-        
-        profile_content.add_widget(stats)
-        
-        self.layout.add_widget(profile_content)
-        
-        # Botones
-        buttons = BoxLayout(size_hint=(1, 0.1), spacing=dp(10))
-        
-        save_button = Button(
-            text='Guardar',
-            size_hint=(0.5, 1),
-            background_color=PRIMARY_COLOR
-        )
-        save_button.bind(on_release=self.save_profile)
-        
-        back_button = Button(
-            text='Volver',
-            size_hint=(0.5, 1),
-            background_color=(0.7, 0.7, 0.7, 1)
-        )
-        back_button.bind(on_release=self.go_back)
-        
-        buttons.add_widget(save_button)
-        buttons.add_widget(back_button)
-        
-        self.layout.add_widget(buttons)
-        self.add_widget(self.layout)
+        activity_stats = get_activity_stats()
+        self.update_total(activity_stats, activity_stats.total)
+        self.update_completed(activity_stats, activity_stats.completed)
+        activity_stats.bind(total=self.update_total, completed=self.update_completed)
+    
+    def update_total(self, stats, value):
+        self.ids.total_activities_label.text = f'Actividades totales: {value}'
     
-    def save_profile(self, instance):
+    def update_completed(self, stats, value):
+        self.ids.completed_activities_label.text = f'Actividades completadas: {value}'
+    
+    def save_profile(self, instance=None):
         # Aquí se implementaría la lógica para guardar el perfil
         popup = Popup(
             title='Perfil',
@@ -657,11 +1515,20 @@ class ProfileScreen(Screen):
         )
         popup.open()
     
-    def go_back(self, instance):
+    def go_back(self, instance=None):
         self.manager.current = 'home'
 
+profiler.instrument(ActivityManager, 'data')
+for screen_class in (HomeScreen, AddActivityScreen, ScheduleScreen, ProfileScreen):
+    profiler.instrument(screen_class, 'screen', prefixes=('load_', 'update_'))
+
 # Aplicación principal
 class ZenithApp(App):
+    def load_kv(self, filename=None):
+        # zenith.kv ya está cargado; App.run lo cargaría otra vez por el
+        # nombre de la clase y cada pantalla tendría la interfaz duplicada
+        return True
+    
     def build(self):
         # Crear el administrador de pantallas
         sm = ScreenManager()
@@ -673,6 +1540,91 @@ class ZenithApp(App):
         sm.add_widget(ProfileScreen(name='profile'))
         
         return sm
+    
+    def on_start(self):
+        profiler.start(self.root)
+        memory_diagnostics.start(self.root)
+        self.root.bind(current=self.on_screen_changed)
+        # Purga de borrados y archivado: un lote por ejecución para no
+        # bloquear el frame, y solo con el usuario inactivo
+        self.last_input = time.monotonic()
+        Window.bind(on_touch_down=self.on_user_input, on_key_down=self.on_user_input)
+        self.maintenance_retry = Clock.create_trigger(self.run_maintenance, IDLE_AFTER)
+        self.maintenance_event = Clock.schedule_interval(self.run_maintenance, PURGE_INTERVAL)
+        self.syncing = False
+        if SYNC_URL:
+            self.sync_engine = SyncEngine(ActivityManager, SYNC_URL)
+            self.run_sync()
+            Clock.schedule_interval(self.run_sync, SYNC_INTERVAL)
+    
+    def run_sync(self, dt=None):
+        # La petición HTTP va en un hilo aparte, así que sin red la interfaz
+        # no se congela esperando el timeout. Los archivos JSON solo se leen
+        # y escriben aquí, en el hilo principal, que es también el de las
+        # pantallas, y así los eventos actualizan la UI
+        if self.syncing:
+            return
+        self.syncing = True
+        self.sync_counts = [0, 0]
+        self.sync_round()
+    
+    def sync_round(self):
+        try:
+            batch, cursor = self.sync_engine.prepare()
+        except (OSError, ValueError) as error:
+            self.sync_failed(error)
+            return
+        threading.Thread(target=self.sync_exchange, args=(batch, cursor), daemon=True).start()
+    
+    def sync_exchange(self, batch, cursor):
+        # Hilo de sincronización: solo red
+        try:
+            result = self.sync_engine.exchange(batch, cursor)
+        except (OSError, ValueError) as error:
+            Clock.schedule_once(functools.partial(self.sync_failed, error))
+            return
+        Clock.schedule_once(functools.partial(self.sync_apply, batch, result))
+    
+    def sync_apply(self, batch, result, dt=None):
+        try:
+            pushed, pulled, more = self.sync_engine.apply(batch, result)
+        except (OSError, ValueError) as error:
+            self.sync_failed(error)
+            return
+        self.sync_counts[0] += pushed
+        self.sync_counts[1] += pulled
+        if more:
+            self.sync_round()
+            return
+        self.syncing = False
+        Logger.info(f'SyncEngine: subidos {self.sync_counts[0]}, bajados {self.sync_counts[1]}')
+    
+    def sync_failed(self, error, dt=None):
+        self.syncing = False
+        Logger.warning(f'SyncEngine: error al sincronizar: {error}')
+    
+    def on_user_input(self, *args):
+        # Sin devolver True: el toque o la tecla siguen su camino
+        self.last_input = time.monotonic()
+    
+    def run_maintenance(self, dt=None):
+        if time.monotonic() - self.last_input < IDLE_AFTER:
+            # En uso: se vuelve a intentar cuando lleve un rato quieto
+            self.maintenance_retry()
+            return
+        if not ActivityManager.purge_deleted(PURGE_BATCH):
+            ActivityManager.archive_activities(PURGE_BATCH)
+    
+    def on_screen_changed(self, manager, name):
+        memory_diagnostics.sample(f"pantalla {name}")
+    
+    def on_stop(self):
+        self.maintenance_event.cancel()
+        self.maintenance_retry.cancel()
+        Window.unbind(on_touch_down=self.on_user_input, on_key_down=self.on_user_input)
+        ActivityManager.flush()
+        profiler.stop()
+        memory_diagnostics.stop()
 
 if __name__ == '__main__':
     ZenithApp().run()
\ No newline at end of file
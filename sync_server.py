@@ -0,0 +1,141 @@
+"""Local stand-in for the Zenith sync server.
+
+Keeps the latest version of every activity in memory and speaks the
+protocol zenith_core.SyncEngine uses in both apps:
+
+    POST /push   {"client": id, "changes": [...]}
+                 -> {"accepted": n, "rejected": [winning versions], "cursor": seq}
+    GET  /pull?since=seq&limit=n&client=id
+                 -> {"changes": [...], "cursor": seq, "more": bool}
+
+A change is {"uid", "updated_at", "deleted", ...activity fields}. Conflicts
+are last-writer-wins on updated_at, ties going to the higher client id.
+Bodies are JSON, gzip'd when the client sends Content-Encoding or
+Accept-Encoding gzip.
+
+    python sync_server.py --port 8765
+"""
+import argparse
+import bisect
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class SyncStore:
+    """Latest version per uid plus an append-only log ordered by server seq."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = {}
+        self.log_seqs = []
+        self.log_uids = []
+        self.seq = 0
+
+    def push(self, client, changes):
+        accepted = 0
+        rejected = []
+        with self.lock:
+            for change in changes:
+                current = self.records.get(change["uid"])
+                if current is not None and (current["updated_at"], current["client"]) > (change["updated_at"], client):
+                    rejected.append(self._public(current))
+                    continue
+                self.seq += 1
+                self.records[change["uid"]] = dict(change, client=client, seq=self.seq)
+                self.log_seqs.append(self.seq)
+                self.log_uids.append(change["uid"])
+                accepted += 1
+            return {"accepted": accepted, "rejected": rejected, "cursor": self.seq}
+
+    def pull(self, since, limit, client):
+        # Walk the log from the cursor, skipping entries a later change to
+        # the same uid superseded and the client's own changes
+        changes = []
+        with self.lock:
+            position = bisect.bisect_right(self.log_seqs, since)
+            cursor = since
+            while position < len(self.log_seqs) and len(changes) < limit:
+                seq, uid = self.log_seqs[position], self.log_uids[position]
+                record = self.records[uid]
+                if record["seq"] == seq and record["client"] != client:
+                    changes.append(self._public(record))
+                cursor = seq
+                position += 1
+            return {"changes": changes, "cursor": cursor, "more": position < len(self.log_seqs)}
+
+    @staticmethod
+    def _public(record):
+        return {key: value for key, value in record.items() if key not in ("client", "seq")}
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    store = None
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/push":
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        self._reply(self.store.push(payload["client"], payload["changes"]))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/pull":
+            self.send_error(404)
+            return
+        query = parse_qs(url.query)
+        self._reply(self.store.pull(
+            int(query.get("since", ["0"])[0]),
+            int(query.get("limit", ["500"])[0]),
+            query.get("client", [""])[0],
+        ))
+
+    def _reply(self, result):
+        body = json.dumps(result, separators=(",", ":")).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=0, store=None):
+    """Create a server (port 0 picks a free one); call serve_forever() on it."""
+    handler = type("Handler", (SyncHandler,), {"store": store or SyncStore()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_in_thread(host="127.0.0.1", port=0):
+    """Start a server on a daemon thread and return it with its base URL."""
+    server = make_server(host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    server = make_server(args.host, args.port)
+    print(f"Zenith sync server on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Shared fixtures for the headless test suite.
+
+benchmarks.common configures Kivy for a headless run (SDL offscreen window,
+no command line parsing), so it is imported before either app.
+"""
+import os
+
+import pytest
+
+from benchmarks import common
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the test in an empty directory; the main app opens its database relative to it."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def zenith(workdir):
+    return common.load_zenith()
+
+
+@pytest.fixture
+def proando(workdir):
+    return common.load_proando(os.path.join(workdir, "activities.json"))
+
+
+@pytest.fixture
+def pump():
+    from kivy.clock import Clock
+
+    def pump(frames=3):
+        for _ in range(frames):
+            Clock.tick()
+    return pump
@@ -0,0 +1,40 @@
+"""proando's CardLayout: the rounded background follows the card."""
+from benchmarks import bench_card_background
+
+
+def fill(card):
+    return card.fill_color.rgba
+
+
+def corners(card):
+    return set(card.background.radius)
+
+
+def test_background_follows_layout(proando, pump):
+    result = bench_card_background.measure("CardLayout", proando.HomeActivityCard, 20, proando, pump)
+    assert result["stale_backgrounds_per_pass"] == [0, 0, 0, 0]
+
+
+def test_color_and_radius_set_after_construction(proando):
+    card = proando.CardLayout()
+    card.background_color = (0.2, 0.2, 0.2, 1)
+    card.radius = 0
+    assert fill(card) == [0.2, 0.2, 0.2, 1]
+    assert card.fill_color in card.canvas.before.children
+    assert corners(card) == {(0, 0)}
+
+
+def test_shared_colors_are_not_changed(proando):
+    first, second = proando.CardLayout(), proando.CardLayout()
+    first.background_color = (0.9, 0.3, 0.3, 1)
+    assert fill(second) == list(proando.SECONDARY_COLOR)
+    assert len(first.canvas.before.children) == len(second.canvas.before.children)
+
+
+def test_kv_rules_reach_the_canvas(proando):
+    # UndoBar and ScheduleSeparator set their colour and radius from zenith.kv
+    bar = proando.Factory.UndoBar()
+    separator = proando.ScheduleSeparator()
+    assert fill(bar) == [0.2, 0.2, 0.2, 1]
+    assert fill(separator) == [0.8, 0.8, 0.8, 1]
+    assert corners(bar) == {(0, 0)}
@@ -0,0 +1,16 @@
+"""Refreshing the screens of both apps over and over does not grow memory."""
+import argparse
+
+from benchmarks import bench_memory
+
+
+def test_refresh_cycles_keep_no_memory():
+    # In a fresh interpreter: objects other tests leave behind would make
+    # every sample's gc.collect() slow and the counts noisy
+    results = bench_memory.run_isolated(argparse.Namespace(sizes=list(bench_memory.QUICK_SIZES), cycles=6))
+    assert results.failures == []
+    assert {row["benchmark"] for row in results.rows} == {"zenith refresh cycle", "proando refresh cycle"}
+    for row in results.rows:
+        assert row["bytes_per_cycle"] <= bench_memory.MAX_BYTES_PER_CYCLE
+        assert row["live_widget_growth"] <= 0
+        assert row["tree_widget_growth"] <= 0
@@ -0,0 +1,62 @@
+"""AutoScheduler on seeded random months and on small hand-built cases."""
+from datetime import date, timedelta
+
+import pytest
+
+from benchmarks import bench_scheduler
+
+SEEDS = (1, 7, 42)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("local_search", (False, True))
+def test_schedule_is_valid(zenith, seed, local_search):
+    # No overlaps with fixed blocks or other tasks, working hours on the
+    # grid, every task by its deadline, none lost
+    first_day, fixed, tasks = bench_scheduler.make_month(zenith, 200, seed)
+    scheduler, placed, unscheduled = bench_scheduler.solve(zenith, first_day, fixed, tasks, local_search)
+    assert bench_scheduler.problems(scheduler, fixed, placed, unscheduled, tasks) == []
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_local_search_never_raises_the_cost(zenith, seed):
+    first_day, fixed, tasks = bench_scheduler.make_month(zenith, 200, seed)
+    greedy = bench_scheduler.solve(zenith, first_day, fixed, tasks, local_search=False)[0].cost()
+    searched = bench_scheduler.solve(zenith, first_day, fixed, tasks, local_search=True)[0].cost()
+    assert searched <= greedy
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_schedule_is_deterministic(zenith, seed):
+    first_day, fixed, tasks = bench_scheduler.make_month(zenith, 200, seed)
+    first = bench_scheduler.solve(zenith, first_day, fixed, tasks)
+    second = bench_scheduler.solve(zenith, first_day, fixed, tasks)
+    assert first[0].as_changes(first[1]) == second[0].as_changes(second[1])
+
+
+def test_fixed_slots_are_left_free(zenith):
+    first_day = date(2024, 1, 1)
+    scheduler = zenith.AutoScheduler(first_day, 1, day_start=8 * 60, day_end=12 * 60)
+    scheduler.block(first_day, 8 * 60, 9 * 60)
+    scheduler.block(first_day, 10 * 60, 11 * 60)
+    tasks = [zenith.ScheduleTask(i, f"Tarea {i}", 60, 2) for i in range(3)]
+    placed, unscheduled = scheduler.schedule(tasks)
+    assert sorted(task.start for task in placed) == [9 * 60, 11 * 60]
+    assert len(unscheduled) == 1
+
+
+def test_deadlines_are_respected(zenith):
+    first_day = date(2024, 1, 1)
+    scheduler = zenith.AutoScheduler(first_day, 3, day_start=8 * 60, day_end=10 * 60)
+    scheduler.block(first_day, 8 * 60, 10 * 60)
+    due_today = zenith.ScheduleTask("today", "Hoy", 60, 3, first_day)
+    overdue = zenith.ScheduleTask("overdue", "Atrasada", 60, 3, first_day - timedelta(days=1))
+    due_later = zenith.ScheduleTask("later", "Mañana", 60, 1, first_day + timedelta(days=1))
+    placed, unscheduled = scheduler.schedule([due_today, overdue, due_later])
+    assert [(task.key, task.day) for task in placed] == [("later", 1)]
+    assert {task.key for task in unscheduled} == {"today", "overdue"}
+
+
+def test_hand_built_cases(zenith):
+    # Eviction, swap, and a custom priority not outranking Alta
+    assert bench_scheduler.hand_built_cases(zenith) == []
@@ -0,0 +1,747 @@
+"""Code shared by the KivyMD app (main.py) and proando (proando/main.py).
+
+Both apps import from here rather than keeping their own copies. Nothing in
+this module imports KivyMD or knows how an app stores its activities: the
+storage side is passed in (a store object for SyncEngine, overridable hooks
+for TimeGrid), so each app keeps its own data model and UI language.
+"""
+import functools
+import gc
+import gzip
+import heapq
+import inspect
+import json
+import re
+import time
+import tracemalloc
+import urllib.request
+from datetime import date
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, InstructionGroup, PopMatrix, PushMatrix, Rectangle, Translate
+from kivy.logger import Logger
+from kivy.metrics import dp
+from kivy.properties import NumericProperty
+from kivy.uix.widget import Widget
+
+
+class Profiler:
+    # Frame-time and hot-path recorder, off unless ZENITH_PROFILE is set:
+    #   ZENITH_PROFILE=log      record and log slow calls
+    #   ZENITH_PROFILE=overlay  same, plus an on-screen frame/widget overlay
+    # On exit the recording is written to ZENITH_PROFILE_OUTPUT (default
+    # zenith_profile.json); a path ending in .trace.json, or
+    # ZENITH_PROFILE_FORMAT=chrome, writes Chrome trace format instead.
+    # extras maps names to callables whose results are added to the JSON
+    # export (main.py adds its query cache statistics).
+    slow_call_ms = 16.0
+    widget_sample_frames = 30
+
+    def __init__(self, mode=None, output=None, fmt=None):
+        self.mode = (mode or "").lower()
+        self.enabled = self.mode not in ("", "0", "false", "off")
+        self.output = output or "zenith_profile.json"
+        if fmt is None:
+            fmt = "chrome" if self.output.endswith(".trace.json") else "json"
+        self.format = fmt
+        self.origin = time.perf_counter()
+        self.calls = []
+        self.frames = []
+        self.widget_count = 0
+        self.root = None
+        self.overlay = None
+        self.extras = {}
+        self._frame_event = None
+
+    def record(self, name, category, start, duration):
+        self.calls.append((name, category, start - self.origin, duration))
+        if duration * 1000 >= self.slow_call_ms:
+            Logger.info(f"Profiler: {name} took {duration * 1000:.1f} ms")
+
+    def wrap(self, func, name, category):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.record(name, category, start, time.perf_counter() - start)
+            if inspect.isgenerator(result):
+                return self._timed_generator(result, name, category)
+            return result
+        return timed
+
+    def _timed_generator(self, generator, name, category):
+        # Each resumed slice is recorded separately, matching how the
+        # LoadScheduler spreads the work over frames
+        while True:
+            start = time.perf_counter()
+            try:
+                value = next(generator)
+            except StopIteration:
+                self.record(name, category, start, time.perf_counter() - start)
+                return
+            self.record(name, category, start, time.perf_counter() - start)
+            yield value
+
+    def instrument(self, cls, category, prefixes=None):
+        if not self.enabled:
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_"):
+                continue
+            if prefixes and not attr.startswith(prefixes):
+                continue
+            name = f"{cls.__name__}.{attr}"
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(self.wrap(value.__func__, name, category)))
+            elif inspect.isfunction(value):
+                setattr(cls, attr, self.wrap(value, name, category))
+        return cls
+
+    def start(self, root):
+        if not self.enabled:
+            return
+        self.root = root
+        self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+        if self.mode == "overlay":
+            from kivy.uix.label import Label
+            self.overlay = Label(
+                size_hint=(None, None),
+                size=(dp(220), dp(24)),
+                pos=(dp(4), Window.height - dp(28)),
+                color=(1, 0, 0, 1),
+                font_size=dp(12)
+            )
+            Window.add_widget(self.overlay)
+
+    def _on_frame(self, dt):
+        if len(self.frames) % self.widget_sample_frames == 0:
+            self.widget_count = sum(1 for _ in self.root.walk(restrict=True))
+        self.frames.append((time.perf_counter() - self.origin, dt, self.widget_count))
+        if self.overlay is not None and len(self.frames) % 10 == 0:
+            fps = 1 / dt if dt else 0
+            self.overlay.text = f"{dt * 1000:.1f} ms | {fps:.0f} fps | {self.widget_count} widgets"
+
+    def summary(self):
+        totals = {}
+        for name, category, start, duration in self.calls:
+            entry = totals.setdefault(name, {"category": category, "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += duration * 1000
+            entry["max_ms"] = max(entry["max_ms"], duration * 1000)
+        return totals
+
+    def to_json(self):
+        return {
+            "frames": [
+                {"t": t, "frame_ms": dt * 1000, "widgets": widgets}
+                for t, dt, widgets in self.frames
+            ],
+            "calls": [
+                {"name": name, "category": category, "start": start, "duration_ms": duration * 1000}
+                for name, category, start, duration in self.calls
+            ],
+            "summary": self.summary(),
+            **{name: stats() for name, stats in self.extras.items()},
+        }
+
+    def to_chrome_trace(self):
+        events = [
+            {"name": name, "cat": category, "ph": "X", "pid": 1, "tid": 1,
+             "ts": start * 1e6, "dur": duration * 1e6}
+            for name, category, start, duration in self.calls
+        ]
+        for t, dt, widgets in self.frames:
+            events.append({"name": "frame", "ph": "C", "pid": 1, "ts": t * 1e6,
+                           "args": {"frame_ms": dt * 1000, "widgets": widgets}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path=None):
+        path = path or self.output
+        data = self.to_chrome_trace() if self.format == "chrome" else self.to_json()
+        with open(path, "w") as f:
+            json.dump(data, f)
+        return path
+
+    def stop(self):
+        if not self.enabled:
+            return
+        if self._frame_event is not None:
+            self._frame_event.cancel()
+        for name, entry in sorted(self.summary().items(), key=lambda item: -item[1]["total_ms"]):
+            Logger.info(f"Profiler: {name} x{entry['count']} total {entry['total_ms']:.1f} ms max {entry['max_ms']:.1f} ms")
+        Logger.info(f"Profiler: wrote {self.export()}")
+
+
+class MemoryDiagnostics:
+    # Memory tracking for long sessions, off unless ZENITH_MEMORY is set.
+    # Python allocations come from tracemalloc. Widgets are counted twice:
+    # in the tree under the root, and as live Widget objects. A widget
+    # that left the tree but is still referenced (by a closure bound to
+    # on_release, say) only shows up in the second count. A sample is taken
+    # at every tab change. On exit the samples and the allocation sites that
+    # grew most since start go to ZENITH_MEMORY_OUTPUT (default
+    # zenith_memory.json).
+    trace_frames = 10
+    top_sites = 15
+
+    def __init__(self, mode=None, output=None):
+        self.enabled = (mode or "").lower() not in ("", "0", "false", "off")
+        self.output = output or "zenith_memory.json"
+        self.samples = []
+        self.root = None
+        self.baseline = None
+
+    @staticmethod
+    def live_widgets():
+        # type() rather than isinstance: weak proxies in gc.get_objects()
+        # raise ReferenceError once their widget is gone
+        gc.collect()
+        return sum(1 for obj in gc.get_objects() if issubclass(type(obj), Widget))
+
+    def take(self, label, root=None):
+        root = root or self.root
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {
+            "label": label,
+            "t": time.perf_counter(),
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "tree_widgets": sum(1 for _ in root.walk(restrict=True)) if root is not None else 0,
+            "live_widgets": self.live_widgets(),
+        }
+
+    def measure(self, refresh, cycles, root=None, warmup=2):
+        # Runs refresh() warmup + cycles times and reports the growth. Bytes
+        # per cycle are taken over the second half so that caches filling
+        # up during the first cycles do not count as a leak.
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        for _ in range(warmup):
+            refresh()
+        samples = [self.take("cycle 0", root)]
+        for cycle in range(1, cycles + 1):
+            refresh()
+            samples.append(self.take(f"cycle {cycle}", root))
+        if not tracing:
+            tracemalloc.stop()
+        middle = len(samples) // 2
+        return {
+            "cycles": cycles,
+            "bytes_per_cycle": (samples[-1]["traced_bytes"] - samples[middle]["traced_bytes"])
+                               / max(len(samples) - 1 - middle, 1),
+            "live_widget_growth": samples[-1]["live_widgets"] - samples[0]["live_widgets"],
+            "tree_widget_growth": samples[-1]["tree_widgets"] - samples[0]["tree_widgets"],
+            "samples": samples,
+        }
+
+    def start(self, root):
+        if not self.enabled:
+            return
+        self.root = root
+        tracemalloc.start(self.trace_frames)
+        self.baseline = tracemalloc.take_snapshot()
+        self.sample("start")
+
+    def sample(self, label):
+        if not self.enabled or self.root is None:
+            return
+        sample = self.take(label)
+        self.samples.append(sample)
+        Logger.info(f"MemoryDiagnostics: {label}: {sample['traced_bytes'] / 1024:.0f} KiB traced, "
+                    f"{sample['tree_widgets']} widgets in tree, {sample['live_widgets']} alive")
+
+    def top_growth(self):
+        stats = tracemalloc.take_snapshot().compare_to(self.baseline, "lineno")
+        return [
+            {"site": str(stat.traceback), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+            for stat in stats[:self.top_sites]
+        ]
+
+    def stop(self):
+        if not self.enabled or self.root is None:
+            return
+        self.sample("stop")
+        report = {"samples": self.samples, "top_growth": self.top_growth()}
+        tracemalloc.stop()
+        with open(self.output, "w") as f:
+            json.dump(report, f, indent=2)
+        Logger.info(f"MemoryDiagnostics: wrote {self.output}")
+
+
+# Form input parsing. Times are stored as zero-padded "HH:MM" and dates as
+# "YYYY-MM-DD" so that ORDER BY start_time and date range queries compare
+# correctly as text; these turn what people type into that form, or None.
+TIME_PATTERN = re.compile(r"^(\d{1,2})(?:\s*[:.h]\s*(\d{1,2})?)?\s*(?:([ap])\.?\s*m?\.?)?$")
+COMPACT_TIME_PATTERN = re.compile(r"^(\d{1,2})(\d{2})$")
+DATE_PATTERNS = (
+    (re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$"), (1, 2, 3)),
+    (re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$"), (3, 2, 1)),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def parse_time(text):
+    # "9", "9h", "9:5", "0930", "9.30", "9am", "9:30 p.m." -> "HH:MM"
+    text = text.strip().lower()
+    match = TIME_PATTERN.match(text) or COMPACT_TIME_PATTERN.match(text)
+    if match is None:
+        return None
+    hours, minutes = int(match.group(1)), int(match.group(2) or 0)
+    meridiem = match.group(3) if match.re is TIME_PATTERN else None
+    if meridiem is not None:
+        if not 1 <= hours <= 12:
+            return None
+        hours = hours % 12 + (12 if meridiem == "p" else 0)
+    if hours > 23 or minutes > 59:
+        return None
+    return f"{hours:02d}:{minutes:02d}"
+
+
+@functools.lru_cache(maxsize=64)
+def parse_date(text):
+    # "2024-1-5" or "5/1/2024" (day first) -> "2024-01-05"
+    text = text.strip()
+    for pattern, order in DATE_PATTERNS:
+        match = pattern.match(text)
+        if match is not None:
+            year, month, day = (int(match.group(i)) for i in order)
+            try:
+                return date(year, month, day).isoformat()
+            except ValueError:
+                return None
+    return None
+
+
+def check_activity_input(title, day, start_time, end_time, messages):
+    # Returns (values, errors): canonical text per field, and for each field
+    # that cannot be saved the app's message for it. messages has one entry
+    # per field plus "order", shown under the end time when it is not after
+    # the start.
+    values = {
+        "title": title.strip(),
+        "date": parse_date(day),
+        "start_time": parse_time(start_time),
+        "end_time": parse_time(end_time),
+    }
+    errors = {}
+    if not values["title"]:
+        errors["title"] = messages["title"]
+    if values["date"] is None:
+        errors["date"] = messages["date"]
+    for key in ("start_time", "end_time"):
+        if values[key] is None:
+            errors[key] = messages[key]
+    if "start_time" not in errors and "end_time" not in errors and values["end_time"] <= values["start_time"]:
+        errors["end_time"] = messages["order"]
+    return values, errors
+
+
+def local_wins(local_updated, local_seq, pushed_seq, remote_updated):
+    # Client half of last-writer-wins: a local version that has not been
+    # pushed yet (the server settles it on the next push) or that is newer
+    # than the remote one is kept. local_updated is None when the uid was
+    # never seen here.
+    return local_seq > pushed_seq or (local_updated is not None and local_updated > remote_updated)
+
+
+class SyncEngine:
+    # Offline-first sync with a Zenith sync server (sync_server.py is a local
+    # stand-in). Pushes the local changes after the pushed_seq watermark,
+    # then pulls the remote ones after pull_cursor, both as gzip'd JSON
+    # batches, so a sync costs in proportion to what changed. The server
+    # resolves conflicts last-writer-wins on updated_at (ties go to the
+    # higher client id) and sends back the winner for every change it
+    # rejects.
+    #
+    # The store provides get_sync_state(), set_sync_state(**values),
+    # get_local_changes(since, limit) and apply_remote_changes(changes,
+    # notify) and applies remote changes with local_wins().
+    def __init__(self, store, url, batch_size=500, notify=True, timeout=10.0):
+        self.store = store
+        self.url = url.rstrip("/")
+        self.batch_size = batch_size
+        self.notify = notify
+        self.timeout = timeout
+        self.client_id = store.get_sync_state()["client_id"]
+
+    def _request(self, path, payload=None):
+        headers = {"Accept-Encoding": "gzip"}
+        data = None
+        if payload is not None:
+            data = gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+            headers.update({"Content-Type": "application/json", "Content-Encoding": "gzip"})
+        request = urllib.request.Request(self.url + path, data=data, headers=headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+        return json.loads(body)
+
+    # A round is split in three so the network part can run on another
+    # thread: prepare() and apply() read and write the store, exchange()
+    # only talks to the server. While local changes remain a round pushes
+    # one batch; after that it pulls one page.
+    def prepare(self):
+        state = self.store.get_sync_state()
+        return self.store.get_local_changes(state["pushed_seq"], self.batch_size), state["pull_cursor"]
+
+    def exchange(self, batch, cursor):
+        if batch:
+            return self._request("/push", {
+                "client": self.client_id,
+                "changes": [change for _, change in batch],
+            })
+        return self._request(f"/pull?since={cursor}&limit={self.batch_size}&client={self.client_id}")
+
+    def apply(self, batch, result):
+        # Returns (pushed, pulled, whether another round is needed)
+        if batch:
+            self.store.set_sync_state(pushed_seq=batch[-1][0])
+            if result["rejected"]:
+                self.store.apply_remote_changes(result["rejected"], notify=self.notify)
+            return len(batch), 0, True
+        if result["changes"]:
+            self.store.apply_remote_changes(result["changes"], notify=self.notify)
+        self.store.set_sync_state(pull_cursor=result["cursor"])
+        return 0, len(result["changes"]), result["more"]
+
+    def push(self):
+        pushed = 0
+        while True:
+            batch, cursor = self.prepare()
+            if not batch:
+                return pushed
+            pushed += self.apply(batch, self.exchange(batch, cursor))[0]
+
+    def pull(self):
+        pulled = 0
+        more = True
+        while more:
+            cursor = self.store.get_sync_state()["pull_cursor"]
+            _, count, more = self.apply([], self.exchange([], cursor))
+            pulled += count
+        return pulled
+
+    def sync(self):
+        # Everything in the calling thread. Push first so the server
+        # settles conflicts before we pull
+        return self.push(), self.pull()
+
+
+class WidgetPool:
+    # Keeps detached card widgets keyed by card class so list refreshes can
+    # rebind existing widget trees instead of building new ones each time.
+    def __init__(self, max_free=200):
+        self.max_free = max_free
+        self.free = {}
+
+    def acquire(self, card_type):
+        free = self.free.setdefault(card_type, [])
+        if free:
+            return free.pop()
+        return card_type()
+
+    def release(self, card):
+        if card.parent is not None:
+            card.parent.remove_widget(card)
+        self._stash(card)
+
+    def release_all(self, container):
+        # Detach everything at once, then keep the cards we know how to rebind
+        children = list(container.children)
+        container.clear_widgets()
+        for card in children:
+            self._stash(card)
+
+    def _stash(self, card):
+        free = self.free.get(type(card))
+        if free is not None and len(free) < self.max_free:
+            free.append(card)
+
+
+def screenful(item_height):
+    # How many list items fill the window, plus one partly visible
+    return int(Window.height // item_height) + 1
+
+
+def pack_columns(blocks):
+    # Side-by-side layout for overlapping blocks: each block takes the lowest
+    # column free at its start (a heap of column end times) and every block
+    # of an overlap cluster gets the cluster's column count. O(n log n).
+    ordered = sorted(blocks, key=lambda block: (block.start, -block.end))
+    cluster = []
+    busy = []
+    free = []
+    cluster_end = -1
+    for block in ordered:
+        if cluster and block.start >= cluster_end:
+            for member in cluster:
+                member.columns = len(free) + len(busy)
+            cluster, busy, free = [], [], []
+        while busy and busy[0][0] <= block.start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        block.column = heapq.heappop(free) if free else len(busy)
+        heapq.heappush(busy, (block.end, block.column))
+        cluster.append(block)
+        cluster_end = max(cluster_end, block.end)
+    for member in cluster:
+        member.columns = len(free) + len(busy)
+    return blocks
+
+
+class TimeBlock:
+    # One activity on a TimeGrid: minutes since midnight plus the packed
+    # column, and the canvas instructions that draw it
+    __slots__ = ("activity", "day", "start", "end", "column", "columns", "rect", "label")
+
+    def __init__(self, activity, day, start, end):
+        self.activity = activity
+        self.day = day
+        self.start = start
+        self.end = end
+        self.column = 0
+        self.columns = 1
+        self.rect = None
+        self.label = None
+
+
+class TimeGrid(Widget):
+    # Day or week time grid. Blocks are canvas instructions on this single
+    # widget rather than widgets, positioned by start/end minute and packed
+    # into columns where they overlap. Blocks are drawn in local coordinates
+    # under a Translate, so scrolling only moves the origin. Touches are
+    # resolved through buckets of (day, hour) so hit-testing only looks at
+    # the few blocks in that hour. Dragging a block moves it (across days
+    # when more than one is shown), dragging its bottom edge resizes it;
+    # drops are collected and dispatched together as one
+    # on_reschedule(changes) on the next frame.
+    #
+    # How an activity is read goes through four hooks: activity_times(),
+    # activity_title(), activity_color() and reschedule_change(), which
+    # builds the change tuple for a dropped block. The defaults read activity
+    # dicts with "id", "title", "start_time" and "end_time" ("HH:MM") keys;
+    # apps storing activities differently override them.
+    __events__ = ("on_reschedule",)
+    hour_height = NumericProperty(dp(48))
+    gutter = NumericProperty(dp(40))
+    snap_minutes = 15
+    _textures = {}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.size_hint_y = None
+        self.height = 24 * self.hour_height
+        self.days = []
+        self.blocks = []
+        self.buckets = {}
+        self.pending = {}
+        self._text_color = Color(1, 1, 1, 1)
+        self._block_color = Color(0.13, 0.59, 0.95, 0.85)
+        self._translate = Translate()
+        self._grid = InstructionGroup()
+        self._blocks = InstructionGroup()
+        self.canvas.add(PushMatrix())
+        self.canvas.add(self._translate)
+        self.canvas.add(self._grid)
+        self.canvas.add(self._blocks)
+        self.canvas.add(PopMatrix())
+        self._trigger_redraw = Clock.create_trigger(self.redraw)
+        self._trigger_flush = Clock.create_trigger(self.flush)
+        self.fbind("pos", self._move)
+        self.fbind("size", self._trigger_redraw)
+
+    @staticmethod
+    def minutes(value):
+        # "HH:MM" -> minutes since midnight, -1 if it is not a time
+        value = value or ""
+        if len(value) >= 5 and value[2] == ":" and value[:2].isdigit() and value[3:5].isdigit():
+            return int(value[:2]) * 60 + int(value[3:5])
+        return -1
+
+    @staticmethod
+    def clock(minutes):
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+    def activity_times(self, activity):
+        # (start, end) in minutes since midnight, start -1 if it has no time
+        return self.minutes(activity.get("start_time")), self.minutes(activity.get("end_time"))
+
+    def activity_title(self, activity):
+        return activity.get("title", "")
+
+    def activity_color(self, activity):
+        # A Color instruction; share them, a grid can hold many blocks
+        return self._block_color
+
+    def reschedule_change(self, block):
+        # Change tuple for a dropped block, the activity's id first
+        return block.activity["id"], self.clock(block.start), self.clock(block.end)
+
+    def set_days(self, days, activities_by_day):
+        # days: what each column shows, left to right; activities_by_day:
+        # the activities of each
+        self.days = list(days)
+        self.blocks = []
+        for day_index, activities in enumerate(activities_by_day):
+            for activity in activities:
+                start, end = self.activity_times(activity)
+                if start < 0:
+                    continue
+                if end <= start:
+                    end = min(start + 30, 24 * 60)
+                self.blocks.append(TimeBlock(activity, day_index, start, end))
+        self.repack()
+
+    def repack(self):
+        by_day = {}
+        for block in self.blocks:
+            by_day.setdefault(block.day, []).append(block)
+        for day_blocks in by_day.values():
+            pack_columns(day_blocks)
+        self.buckets = {}
+        for block in self.blocks:
+            self._index(block)
+        self.redraw()
+
+    def _index(self, block):
+        for hour in range(block.start // 60, (block.end - 1) // 60 + 1):
+            self.buckets.setdefault((block.day, hour), []).append(block)
+
+    def day_width(self):
+        return (self.width - self.gutter) / max(len(self.days), 1)
+
+    def block_rect(self, block, full_width=False):
+        day_width = self.day_width()
+        columns = 1 if full_width else block.columns
+        column = 0 if full_width else block.column
+        x = self.gutter + block.day * day_width + column * day_width / columns
+        top = self.height - block.start / 60 * self.hour_height
+        height = max((block.end - block.start) / 60 * self.hour_height, dp(4))
+        return x + dp(1), top - height, day_width / columns - dp(2), height
+
+    def _move(self, *args):
+        self._translate.xy = self.pos
+
+    def _fresh(self, group):
+        # InstructionGroup.clear() removes children one by one, quadratic in
+        # the block count; swapping in an empty group is linear
+        fresh = InstructionGroup()
+        self.canvas.insert(self.canvas.indexof(group), fresh)
+        self.canvas.remove(group)
+        return fresh
+
+    def redraw(self, *args):
+        self._grid = self._fresh(self._grid)
+        self._grid.add(Color(0.88, 0.88, 0.88, 1))
+        for hour in range(24):
+            y = self.height - hour * self.hour_height
+            self._grid.add(Rectangle(pos=(self.gutter, y), size=(self.width - self.gutter, 1)))
+            texture = self._texture(f"{hour:02d}:00", dp(10))
+            self._grid.add(Color(0.5, 0.5, 0.5, 1))
+            self._grid.add(Rectangle(texture=texture, size=texture.size, pos=(dp(2), y - texture.height)))
+            self._grid.add(Color(0.88, 0.88, 0.88, 1))
+        for day_index in range(1, len(self.days)):
+            x = self.gutter + day_index * self.day_width()
+            self._grid.add(Rectangle(pos=(x, 0), size=(1, self.height)))
+        self._blocks = self._fresh(self._blocks)
+        for block in self.blocks:
+            self._draw_block(block)
+
+    def _draw_block(self, block):
+        self._blocks.add(self.activity_color(block.activity))
+        block.rect = Rectangle()
+        self._blocks.add(block.rect)
+        self._blocks.add(self._text_color)
+        block.label = Rectangle()
+        self._blocks.add(block.label)
+        self._place(block)
+
+    def _place(self, block, full_width=False):
+        x, y, width, height = self.block_rect(block, full_width)
+        block.rect.pos, block.rect.size = (x, y), (width, height)
+        texture = self._texture(self.activity_title(block.activity), dp(11))
+        region = texture.get_region(0, 0, min(texture.width, max(width - dp(4), 1)),
+                                    min(texture.height, max(height - dp(2), 1)))
+        block.label.texture = region
+        block.label.size = region.size
+        block.label.pos = (x + dp(2), y + height - region.height - dp(1))
+
+    @classmethod
+    def _texture(cls, text, font_size):
+        # Rendered text is cached; the same titles repeat across weeks
+        key = (text, font_size)
+        texture = cls._textures.get(key)
+        if texture is None:
+            from kivy.core.text import Label as CoreLabel
+            if len(cls._textures) > 5000:
+                cls._textures.clear()
+            label = CoreLabel(text=text, font_size=font_size)
+            label.refresh()
+            texture = cls._textures[key] = label.texture
+        return texture
+
+    def block_at(self, x, y):
+        # x, y in parent coordinates, like touch positions
+        if not self.days or not self.collide_point(x, y) or x < self.x + self.gutter:
+            return None
+        x, y = x - self.x, y - self.y
+        day = min(int((x - self.gutter) / self.day_width()), len(self.days) - 1)
+        minute = (self.height - y) / self.hour_height * 60
+        for block in reversed(self.buckets.get((day, int(minute // 60)), ())):
+            bx, by, width, height = self.block_rect(block)
+            if bx <= x <= bx + width and by <= y <= by + height:
+                return block
+        return None
+
+    def minute_at(self, y):
+        minute = (self.top - y) / self.hour_height * 60
+        return int(round(minute / self.snap_minutes)) * self.snap_minutes
+
+    def on_touch_down(self, touch):
+        block = self.block_at(*touch.pos)
+        if block is None:
+            return super().on_touch_down(touch)
+        bottom = self.y + self.block_rect(block)[1]
+        mode = "resize" if touch.y - bottom < dp(10) else "move"
+        touch.grab(self)
+        touch.ud["time_grid"] = (block, mode, self.minute_at(touch.y) - block.start, block.day, block.start, block.end)
+        return True
+
+    def on_touch_move(self, touch):
+        if touch.grab_current is not self:
+            return super().on_touch_move(touch)
+        block, mode, offset = touch.ud["time_grid"][:3]
+        if mode == "resize":
+            block.end = min(max(self.minute_at(touch.y), block.start + self.snap_minutes), 24 * 60)
+        else:
+            duration = block.end - block.start
+            block.start = min(max(self.minute_at(touch.y) - offset, 0), 24 * 60 - duration)
+            block.end = block.start + duration
+            if len(self.days) > 1:
+                day = int((touch.x - self.x - self.gutter) / self.day_width())
+                block.day = min(max(day, 0), len(self.days) - 1)
+        self._place(block, full_width=True)
+        return True
+
+    def on_touch_up(self, touch):
+        if touch.grab_current is not self:
+            return super().on_touch_up(touch)
+        touch.ungrab(self)
+        block, _, _, day, start, end = touch.ud["time_grid"]
+        if (block.day, block.start, block.end) != (day, start, end):
+            change = self.reschedule_change(block)
+            self.pending[change[0]] = change[1:]
+            self._trigger_flush()
+        self.repack()
+        return True
+
+    def flush(self, *args):
+        if self.pending:
+            changes = [(activity_id,) + change for activity_id, change in self.pending.items()]
+            self.pending = {}
+            self.dispatch("on_reschedule", changes)
+
+    def on_reschedule(self, changes):
+        pass